@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Run partialspoof_metrics.benchmark from a checkout without installing the package"""
+
+from partialspoof_metrics.benchmark import main
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Run partialspoof_metrics.calculate_localization from a checkout without installing the package"""
+
+from partialspoof_metrics.calculate_localization import main
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,16 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Utterance-based, frame-based and millisecond EER for partial spoof tasks
+
+The metrics subpackage holds the counting and EER code, utils the label, score
+and result files, and every command line tool is a module with a main function
+run by the partialspoof-metrics entry point.
+"""
+
+from .cli import main
+
+__version__ = "1.1.0"
@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Run the partialspoof-metrics entry point with python -m partialspoof_metrics"""
+
+from .cli import main
+
+if __name__ == "__main__":
+  main()
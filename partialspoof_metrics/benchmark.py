@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Benchmark every stage of the metrics pipeline on synthetic PartialSpoof data
+
+Generates a label file, a frame score file and an utterance score file, times
+label parsing, rasterization, score loading, zooming, label/score validation,
+EER and Millisecond EER counting, DET/EER extraction and combining, and
+compares the timings with a stored baseline, e.g.
+
+  python benchmark.py --utterances 20000 --save_baseline baseline.json
+  python benchmark.py --utterances 20000 --baseline baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import warnings
+import tempfile
+import tracemalloc
+import numpy as np
+
+from .metrics.eer import _count_samples, _counter_eer, validate_samples
+from .metrics.mseer import _count_samples as _count_segments, validate_segments
+from .utils.label import _parse_partialspoof, _parse_partialspoof_file, load_partialspoof_labels, load_partialspoof_timestamp
+from .utils.score import load_score_table, zoom_scores
+from .utils.result import result_info, save_result
+from .combine_eer_results import combine
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+
+
+def _segments(rng, dur, density):
+  """Return the alternating bonafide/spoof segments of an utterance with density boundaries per second"""
+  bounds = np.unique(np.round(rng.uniform(0, dur, rng.poisson(density*dur)), 2))
+  bounds = np.concatenate([[0.0], bounds[(bounds > 0) & (bounds < dur)], [dur]])
+  first  = rng.integers(2)
+  return [(bounds[i], bounds[i+1], ["bonafide", "spoof"][(first+i) % 2]) for i in range(bounds.shape[0]-1)]
+
+def generate_labels(labpath, utterances=1000, duration=4.0, density=0.5, unit=0.02, seed=0):
+  """Write a PartialSpoof label file whose utterances last 0.5 to 1.5 times duration seconds rounded to whole units"""
+  rng  = np.random.default_rng(seed)
+  durs = np.round(np.maximum(np.round(rng.uniform(0.5, 1.5, utterances)*duration/unit), 1)*unit, 2)
+  with open(labpath, "w") as f:
+    for i, dur in enumerate(durs):
+      segs = _segments(rng, dur, density)
+      tag  = "spoof" if any(seg[2] == "spoof" for seg in segs) else "bonafide"
+      f.write(f"U{i:07d} {dur:.2f} {tag} " + " ".join(f"{start:.2f}-{end:.2f}-{label}" for start, end, label in segs) + "\n")
+
+def generate_scores(labpath, frmpath, uttpath, unit=0.02, seed=0):
+  """Write frame and utterance score files whose spoof scores are higher on average"""
+  rng  = np.random.default_rng(seed)
+  labs = load_partialspoof_labels(labpath, unit=unit)
+  sco  = np.clip(rng.normal(0.2 + 0.6*labs.labels, 0.3), -1.9, 1.9)
+  tags = np.array(["bonafide", "spoof"])[labs.labels]
+  pos  = np.arange(labs.labels.shape[0]) - np.repeat(labs.offsets[:-1], np.diff(labs.offsets))
+  with open(frmpath, "w") as f:
+    names = np.repeat(labs.names, np.diff(labs.offsets))
+    for start in range(0, sco.shape[0], 1<<20):
+      end = start + (1<<20)
+      f.writelines(f"{name} {p} {tag} {s:.6f}\n" for name, p, tag, s in zip(names[start:end], pos[start:end], tags[start:end], sco[start:end]))
+  uttlabs = load_partialspoof_labels(labpath, unit=0.0)
+  uttsco  = np.clip(rng.normal(0.2 + 0.6*uttlabs.labels, 0.3), -1.9, 1.9)
+  with open(uttpath, "w") as f:
+    f.writelines(f"{name} {['bonafide', 'spoof'][lab]} {s:.6f}\n" for name, lab, s in zip(uttlabs.names, uttlabs.labels, uttsco))
+
+def generate(datadir, args):
+  """Generate the synthetic data once per configuration, returns the label, frame score and utterance score paths"""
+  tag  = f"n{args.utterances}_d{args.duration}_u{args.unit}_s{args.density}_r{args.seed}"
+  labpath, frmpath, uttpath = [os.path.join(datadir, f"{tag}_{name}") for name in ["label.txt", "frame.score", "utt.score"]]
+  if not all(os.path.exists(path) for path in [labpath, frmpath, uttpath]):
+    start = time.time()
+    generate_labels(labpath, utterances=args.utterances, duration=args.duration, density=args.density, unit=args.unit, seed=args.seed)
+    generate_scores(labpath, frmpath, uttpath, unit=args.unit, seed=args.seed)
+    logger.info(f"INFO: Generated {tag} in {time.time()-start:.2f} seconds")
+  return labpath, frmpath, uttpath
+
+def measure(stage, repeat=3):
+  """Return the best time of repeat runs of stage and its peak traced memory in MB"""
+  seconds = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    stage()
+    seconds.append(time.perf_counter() - start)
+  tracemalloc.start()
+  stage()
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+  return min(seconds), peak / (1<<20)
+
+def run_stages(labpath, frmpath, uttpath, args, workdir):
+  """Time every stage, returns a list of stage results and the EER values to check against the baseline"""
+  def parse():
+    _parse_partialspoof_file.cache_clear()
+    return _parse_partialspoof(labpath)
+  data   = parse()
+  hours  = float(np.sum(data["durs"])) / 3600
+  labs   = load_partialspoof_labels(labpath, unit=args.unit)
+  scos   = load_score_table(frmpath, scoreindex=3, unit=args.unit)
+  msscos = load_score_table(frmpath, scoreindex=3, frameindex=1, unit=args.unit)
+  segs   = load_partialspoof_timestamp(labpath)
+  uttlabs, uttscos = load_partialspoof_labels(labpath, unit=0.0), load_score_table(uttpath, scoreindex=2)
+  frames = labs.labels.shape[0]
+  counter   = _count_samples(labs, scos, resolution=args.resolution)
+  mscounter = _count_segments(segs, msscos, resolution=args.resolution)
+
+  shards = []
+  fpr, fnr = _counter_eer(counter)[3:5]
+  for i in range(args.shards):
+    shards.append(os.path.join(workdir, f"shard{i}"))
+    save_result(shards[-1], fpr, fnr, counter, result_info(0.0, 0.0, 0.0, counter, {
+      "unit_input": args.unit, "unit_cal": args.unit, "minscore": scos.minscore, "maxscore": scos.maxscore,
+      "minval": -2.0, "maxval": 2.0, "negative_class": False, "resolution": args.resolution, "scoreindex": 3,
+      "labpath": labpath, "scopath": frmpath, "savepath": shards[-1], "utterances": len(labs)}), compact=args.compact)
+
+  stages = [
+    ("parse_labels",     parse, len(labs), "utterances/s"),
+    ("rasterize_labels", lambda: load_partialspoof_labels(labpath, unit=args.unit), frames, "frames/s"),
+    ("load_scores",      lambda: load_score_table(frmpath, scoreindex=3, unit=args.unit), os.path.getsize(frmpath)/(1<<20), "MB/s"),
+    ("zoom",             lambda: zoom_scores(scos, 0), frames, "frames/s"),
+    ("validate_eer",     lambda: validate_samples(labs, scos), len(labs), "utterances/s"),
+    ("validate_mseer",   lambda: validate_segments(segs, msscos), len(labs), "utterances/s"),
+    ("count_utt_eer",    lambda: _count_samples(uttlabs, uttscos, resolution=args.resolution), len(uttlabs), "utterances/s"),
+    ("count_eer",        lambda: _count_samples(labs, scos, resolution=args.resolution), frames, "frames/s"),
+    ("count_mseer",      lambda: _count_segments(segs, msscos, resolution=args.resolution), hours, "audio-hours/s"),
+    ("det_eer",          lambda: _counter_eer(counter), args.resolution+1, "buckets/s"),
+    ("combine",          lambda: combine(shards, None), args.shards, "shards/s"),
+  ]
+  results = []
+  for name, stage, amount, unit in stages:
+    seconds, peak = measure(stage, repeat=args.repeat)
+    results.append({"stage": name, "seconds": seconds, "throughput": amount/seconds, "unit": unit, "peak_mb": peak})
+    logger.info(f"INFO: {name} took {seconds:.4f} seconds")
+  return results, {"eer": float(_counter_eer(counter)[0]), "mseer": float(_counter_eer(mscounter)[0]),
+                   "frames": frames, "hours": hours}
+
+def compare(results, checks, baseline, tolerance=0.2):
+  """Return the lines reporting stages slower than the baseline by more than tolerance and changed EER values"""
+  lines = []
+  before = {result["stage"]: result for result in baseline["stages"]}
+  for result in results:
+    if result["stage"] in before and result["seconds"] > before[result["stage"]]["seconds"] * (1+tolerance):
+      lines.append(f"REGRESSION {result['stage']}: {result['seconds']:.4f}s vs baseline {before[result['stage']]['seconds']:.4f}s")
+  for key in ["eer", "mseer"]:
+    if key in baseline["checks"] and abs(baseline["checks"][key] - checks[key]) > 1e-9:
+      lines.append(f"MISMATCH {key}: {checks[key]} vs baseline {baseline['checks'][key]}")
+  return lines
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Benchmark every stage of the metrics pipeline on synthetic data")
+  parser.add_argument('--utterances', type=int, default=2000, help="Number of synthetic utterances.")
+  parser.add_argument('--duration', type=float, default=4.0, help="Average utterance duration in seconds.")
+  parser.add_argument('--unit', type=float, default=0.02, help="Frame duration of the score file.")
+  parser.add_argument('--density', type=float, default=0.5, help="Average number of spoof/bonafide boundaries per second.")
+  parser.add_argument('--resolution', type=int, default=10000, help="Threshold resolution.")
+  parser.add_argument('--shards', type=int, default=16, help="Number of result shards to combine.")
+  parser.add_argument('--compact', action="store_true", help="Combine compact result shards.")
+  parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs of every stage, the best is reported.")
+  parser.add_argument('--seed', type=int, default=0, help="Random seed of the synthetic data.")
+  parser.add_argument('--datadir', type=str, default=None, help="Directory to keep the synthetic data between runs.")
+  parser.add_argument('--output', type=str, default=None, help="Path to save the results as JSON.")
+  parser.add_argument('--baseline', type=str, default=None, help="Path to a baseline JSON to compare the results with.")
+  parser.add_argument('--save_baseline', type=str, default=None, help="Path to save the results as the new baseline.")
+  parser.add_argument('--tolerance', type=float, default=0.2, help="Relative slowdown of a stage reported as a regression.")
+  args = parser.parse_args(argv)
+
+  with tempfile.TemporaryDirectory() as tmpdir:
+    datadir = args.datadir or tmpdir
+    os.makedirs(datadir, exist_ok=True)
+    labpath, frmpath, uttpath = generate(datadir, args)
+    results, checks = run_stages(labpath, frmpath, uttpath, args, tmpdir)
+
+  print(f"utterances={args.utterances} frames={checks['frames']} hours={checks['hours']:.2f} eer={checks['eer']*100:.2f}% mseer={checks['mseer']*100:.2f}%")
+  for result in results:
+    print(f"{result['stage']:<18}{result['seconds']:>10.4f}s {result['throughput']:>14.1f} {result['unit']:<14} peak={result['peak_mb']:.1f}MB")
+
+  report = {"config": {key: value for key, value in vars(args).items() if key in ["utterances", "duration", "unit", "density", "resolution", "shards", "compact", "seed"]},
+            "stages": results, "checks": checks}
+  for path in [args.output, args.save_baseline]:
+    if path is not None:
+      with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+
+  if args.baseline is not None:
+    with open(args.baseline, "r") as f:
+      baseline = json.load(f)
+    if baseline["config"] != report["config"]:
+      warnings.warn(f"WARNING: the baseline was run with {baseline['config']}")
+    lines = compare(results, checks, baseline, tolerance=args.tolerance)
+    print("\n".join(lines) if len(lines) > 0 else "No regression against the baseline")
+    sys.exit(1 if len(lines) > 0 else 0)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2024 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Calculate Accuracy Precision Recall and F1 from EER results"""
+
+import sys
+import json
+import os.path
+import argparse
+import numpy as np
+import time
+import math
+import logging
+import warnings
+
+from .utils.result import load_info, load_thresholds, load_counter
+from .metrics.accuracy import operating_points
+
+
+def format_accuracy(threshold, index, accuracy, precision, recall, f1):
+  return f"threshold={threshold:.04f} index={index} accuracy={accuracy*100:.02f}% precision={precision*100:.02f}% recall={recall*100:.02f}% f1={f1*100:.02f}%"
+
+FIELDS = ["loadpath", "query", "target", "threshold", "index", "accuracy", "precision", "recall", "f1", "fpr", "fnr"]
+
+def format_points(rows, fmt="text"):
+  """Format the operating points of one or many result directories as text, tsv or json"""
+  if fmt == "json":
+    return json.dumps([{key: (None if isinstance(value, float) and math.isnan(value) else value) for key, value in row.items()} for row in rows], indent=1)
+  if fmt == "tsv":
+    return "\n".join(["\t".join(FIELDS)] + ["\t".join(str(row[key]) for key in FIELDS) for row in rows])
+  prefix = lambda row: (f"loadpath={row['loadpath']} " if len(set(row["loadpath"] for row in rows)) > 1 else "") + (f"{row['query']}={row['target']:g} " if len(rows) > 1 else "")
+  return "\n".join(prefix(row) + format_accuracy(*[row[key] for key in FIELDS[3:9]]) for row in rows)
+
+def load_accuracy_result(loadpath):
+  """Load the counter and the resolution, minval, maxval, thresholds and EER threshold of an EER result directory"""
+  info = {key.lower(): value for key, value in load_info(loadpath).items()}
+  params = {"minval":     float(info.get("minval", -2.0)),
+            "maxval":     float(info.get("maxval", 2.0)),
+            "resolution": int(info.get("resolution", 8000)),
+            "thresholds": load_thresholds(loadpath)}
+  eer_threshold = float(info["threshold"]) if "threshold" in info else None
+  return load_counter(loadpath), params, eer_threshold
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Calculate Accuracy Precision Recall and F1 from the EER result")
+  parser.add_argument('--loadpath', type=str, nargs='+', required=True, help="Paths to the EER result directories.")
+  parser.add_argument('--threshold', type=float, nargs='*', default=[], help="Thresholds to calculate accuracy, 0.5 if no operating point is given")
+  parser.add_argument('--eer_threshold', action="store_true", help="Using EER threshold for calculation")
+  parser.add_argument('--eer', action="store_true", help="Calculate at the point of the counter where FPR is closest to FNR")
+  parser.add_argument('--recall', type=float, nargs='*', default=[], help="Calculate at specific recall values")
+  parser.add_argument('--precision', type=float, nargs='*', default=[], help="Calculate at specific precision values")
+  parser.add_argument('--fpr', type=float, nargs='*', default=[], help="Calculate at the lowest thresholds with FPR at most these values")
+  parser.add_argument('--fnr', type=float, nargs='*', default=[], help="Calculate at the highest thresholds with FNR at most these values")
+  parser.add_argument('--format', type=str, default="text", choices=["text", "tsv", "json"], help="Output format.")
+  parser.add_argument('--output', type=str, default=None, help="Path to write the output instead of stdout.")
+
+
+  args    = parser.parse_args(argv)
+  queries = [(kind, value) for kind in ["threshold", "recall", "precision", "fpr", "fnr"] for value in getattr(args, kind) if not (kind in ["recall", "precision"] and value <= 0)]
+  queries += [("eer", 0.0)] if args.eer else []
+
+  rows = []
+  for loadpath in args.loadpath:
+    counter, params, eer_threshold = load_accuracy_result(loadpath)
+    points = ([("threshold", eer_threshold)] if args.eer_threshold and eer_threshold is not None else []) + queries
+    for row in operating_points(counter, points or [("threshold", 0.5)], **params):
+      rows.append(dict({"loadpath": loadpath}, **{key: (value.item() if hasattr(value, "item") else value) for key, value in row.items()}))
+
+  output = format_points(rows, args.format)
+  if args.output is None:
+    print(output)
+  else:
+    with open(args.output, "w") as f:
+      f.write(output + "\n")
+
+if __name__ == "__main__":
+  main()
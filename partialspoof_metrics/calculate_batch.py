@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Calculate utterance-based, frame-based, upscaled utterance-based and millisecond EER
+of many score files in one process sharing the parsed labels and scores"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import logging
+import warnings
+
+from .metrics.eer import compute_eer, compute_adaptive_eer
+from .metrics.mseer import compute_mseer, compute_adaptive_mseer
+from .utils.label import load_partialspoof_labels, load_partialspoof_timestamp
+from .utils.score import load_score_table, zoom_scores
+from .utils.result import result_info, save_result
+from .metrics.accuracy import operating_points
+from .calculate_accuracy import format_accuracy
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+#warnings.filterwarnings("ignore")
+
+
+def check_range(scos, minval, maxval, adaptive=False):
+  assert adaptive or scos.minscore > minval and scos.maxscore < maxval, f"ERROR: score ({scos.minscore},{scos.maxscore}) is outside calculating boundary ({minval},{maxval})"
+
+def eer_variant(labs, scos, savepath, unit, unit_cal, args, scopath, scoreindex):
+  minval, maxval = args.minval, args.maxval
+  if args.adaptive:
+    eer, threshold, margin, fpr, fnr, counter, minval, maxval = compute_adaptive_eer(labs, scos, resolution=args.resolution, minval=minval, maxval=maxval, workers=args.workers)
+  else:
+    eer, threshold, margin, fpr, fnr, counter = compute_eer(labs, scos, resolution=args.resolution, minval=minval, maxval=maxval, workers=args.workers)
+  print(f"{os.path.basename(savepath)}: eer={eer*100:.2f}% margin={margin*100:.2f}% threshold={threshold:.4f} negative={args.negative_class}")
+  save_result(savepath, fpr, fnr, counter, result_info(eer, threshold, margin, counter, {
+    "unit_input": unit, "unit_cal": unit_cal, "minscore": scos.minscore, "maxscore": scos.maxscore,
+    "minval": minval, "maxval": maxval, "negative_class": args.negative_class,
+    "resolution": args.resolution, "scoreindex": scoreindex, "labpath": args.labpath,
+    "scopath": scopath, "savepath": savepath, "utterances": len(labs)}))
+  return eer, threshold, counter, {"resolution": args.resolution, "minval": minval, "maxval": maxval}
+
+def mseer_variant(labs, scos, savepath, unit, args, scopath):
+  minval, maxval = args.minval, args.maxval
+  if args.adaptive:
+    eer, threshold, margin, fpr, fnr, counter, minval, maxval = compute_adaptive_mseer(labs, scos, resolution=args.ms_resolution, minval=minval, maxval=maxval, workers=args.workers)
+  else:
+    eer, threshold, margin, fpr, fnr, counter = compute_mseer(labs, scos, resolution=args.ms_resolution, minval=minval, maxval=maxval, workers=args.workers)
+  print(f"{os.path.basename(savepath)}: mseer={eer*100:.2f}% margin={margin*100:.2f}% threshold={threshold:.4f} minscore={scos.minscore:.3f} maxscore={scos.maxscore:.3f} negative={args.negative_class}")
+  save_result(savepath, fpr, fnr, counter, result_info(eer, threshold, margin, counter, {
+    "unit_input": unit, "unit_cal": "millisecond", "minscore": scos.minscore, "maxscore": scos.maxscore,
+    "minval": minval, "maxval": maxval, "nagative_class": args.negative_class,
+    "resolution": args.ms_resolution, "scoreindex": args.scoreindex, "labpath": args.labpath,
+    "scopath": scopath, "savepath": savepath, "utterances": len(labs)}, classfmt=".04f"))
+  return eer
+
+def print_table(title, units, eers):
+  print()
+  print(title)
+  print("".join(f"{unit}s\t" for unit in units))
+  print("".join(f"{eer*100:.2f}\t" for eer in eers))
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Calculate all EER variants of many score files in one process")
+  parser.add_argument('--labpath', type=str, required=True, help="Path to Llama Partial Spoof label file.")
+  parser.add_argument('--uttscopath', type=str, default=None, help="Path to utterance-based score file.")
+  parser.add_argument('--uttscoreindex', type=int, default=2, help="Index of the score column of the utterance-based score file.")
+  parser.add_argument('--scopath', type=str, nargs='*', default=[], help="Paths to frame-level score files.")
+  parser.add_argument('--unit', type=str, nargs='*', default=[], help="Frame duration of each frame-level score file.")
+  parser.add_argument('--scoreindex', type=int, default=3, help="Index of the score column of the frame-level score files.")
+  parser.add_argument('--savedir', type=str, default="results", help="Directory to save the result directories.")
+  parser.add_argument('--name', type=str, required=True, help="Prefix of the result directories.")
+  parser.add_argument('--resolution', type=int, default=10000, help="Threshold resolution of utterance and frame-based EER.")
+  parser.add_argument('--ms_resolution', type=int, default=100000, help="Threshold resolution of millisecond EER.")
+  parser.add_argument('--negative_class', action="store_true", help="Using score of the negative class")
+  parser.add_argument('--minval', type=float, default=-2.0, help="Score lower bound.")
+  parser.add_argument('--maxval', type=float, default=2.0, help="Score higher bound.")
+  parser.add_argument('--sensitivity', type=float, default=0.0, help="Sensitivity to extract real/fake label.")
+  parser.add_argument('--cachedir', type=str, default=None, help="Directory to cache the parsed labels.")
+  parser.add_argument('--workers', type=int, default=1, help="Number of processes counting the samples.")
+  parser.add_argument('--adaptive', action="store_true", help="Grow the threshold range from minval and maxval to cover every score.")
+
+  args = parser.parse_args(argv)
+  assert len(args.scopath) == len(args.unit), "ERROR: every score file needs a unit"
+
+  start = time.time()
+
+  uttlabs    = load_partialspoof_labels(args.labpath, unit=0.0, cachedir=args.cachedir)
+  timestamps = load_partialspoof_timestamp(args.labpath, cachedir=args.cachedir) if len(args.scopath) > 0 else None
+
+  uttresult = None
+  if args.uttscopath is not None:
+    scos = load_score_table(args.uttscopath, scoreindex=args.uttscoreindex, negative_class=args.negative_class)
+    check_range(scos, args.minval, args.maxval, args.adaptive)
+    savepath  = f"{args.savedir}/{args.name}_utt"
+    uttresult = eer_variant(uttlabs, scos, savepath, 0.0, 0.0, args, args.uttscopath, args.uttscoreindex)
+
+  frame_eers, upscaled_eers, ms_eers = [], [], []
+  for unitstr, scopath in zip(args.unit, args.scopath):
+    unit = float(unitstr)
+    scos = load_score_table(scopath, scoreindex=args.scoreindex, frameindex=1, unit=unit, negative_class=args.negative_class)
+    check_range(scos, args.minval, args.maxval, args.adaptive)
+
+    labs = load_partialspoof_labels(args.labpath, unit=unit, sensitivity=args.sensitivity, cachedir=args.cachedir)
+    eer, _, _, _ = eer_variant(labs, scos, f"{args.savedir}/{args.name}_{unitstr}", unit, unit, args, scopath, args.scoreindex)
+    frame_eers.append(eer)
+
+    eer, _, _, _ = eer_variant(uttlabs, zoom_scores(scos, 0), f"{args.savedir}/{args.name}_utt{unitstr}", unit, 0.0, args, scopath, args.scoreindex)
+    upscaled_eers.append(eer)
+
+    ms_eers.append(mseer_variant(timestamps, scos, f"{args.savedir}/{args.name}_ms{unitstr}", unit, args, scopath))
+
+  end     = time.time()
+  elapsed = (end-start)/60
+  logger.info(f"INFO: Calculate all EER variants took {elapsed:.2f} minutes")
+
+  print("==== Result Summary ====")
+  if uttresult is not None:
+    eer, threshold, counter, params = uttresult
+    print()
+    print(f"Utterance EER: {eer*100:.2f}%")
+    points = operating_points(counter, [("threshold", threshold), ("recall", 0.95), ("precision", 0.95)], **params)
+    for title, point in zip(["Utterance EER Threshold", "95% Recall Threshold", "95% Precision Threshold"], points):
+      print(f"{title}: {format_accuracy(*[point[key] for key in ['threshold', 'index', 'accuracy', 'precision', 'recall', 'f1']])}")
+  if len(args.unit) > 0:
+    print_table("Frame-based EER", args.unit, frame_eers)
+    print_table("Upscaled Utterance-based EER", args.unit, upscaled_eers)
+    print_table("Millisecond EER", args.unit, ms_eers)
+
+if __name__ == "__main__":
+  main()
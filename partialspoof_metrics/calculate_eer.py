@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2024 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Calculate Utterance-base EER using LlamaPartialSpoof label and a score file"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import math
+import logging
+import warnings
+
+from .metrics.eer import compute_bootstrap_eer, compute_grouped_eer, grouped_counter_eers, _count_samples, _counter_eer
+from .metrics.eer import _gather_samples, _exact_counter, _exact_counter_eer, _grow_counter, _score_range, validate_samples
+from .metrics.align import warn_alignment
+from .utils.label import load_partialspoof_labels, load_groups
+from .utils.score import load_scores, iter_score_tables, zoom_scores, sweep_scores
+from .utils.pooling import POOLINGS
+from .utils.stream import count_stream
+from .utils.result import result_info, save_result, save_groups, cache_result, cached_result
+from .utils.cache import ResultCache
+from .utils.profile import Profiler
+from .metrics.bootstrap import bootstrap_fields
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+#warnings.filterwarnings("ignore")
+
+
+def zoom_unit(unit, zoom):
+  """Return the label unit to calculate EER on after zooming scores of the given unit"""
+  if zoom == 0:
+    return 0.0
+  elif zoom > 0:
+    return unit / zoom
+  else:
+    return unit * (-zoom)
+
+def zoom_labels(args, zoom, cache, profiler=None):
+  """Load the labels at the unit of the zoomed scores once per unit"""
+  unit_cal = zoom_unit(args.unit, zoom)
+  if unit_cal not in cache:
+    with (profiler or Profiler()).stage("label_load", unit="utterances", unit_cal=unit_cal) as record:
+      cache[unit_cal] = load_partialspoof_labels(args.labpath, unit=unit_cal, sensitivity=args.sensitivity, cachedir=args.cachedir)
+      record["items"] = len(cache[unit_cal])
+    logger.info(f"INFO: Loaded {len(cache[unit_cal])} labels from {args.labpath} with UNIT_INPUT={args.unit} and UNIT_CAL={unit_cal} (0 means utterance-based)")
+  return cache[unit_cal]
+
+def validate(labs, scos, unit_cal, profiler=None, **tags):
+  """Check that the labels and scores cover the same utterances with the same lengths, warns once and returns the names to evaluate
+
+  unit_cal is the label unit of zoom_unit, used to report the mismatches in seconds.
+  """
+  with (profiler or Profiler()).stage("validate", unit="utterances", **tags) as record:
+    names, report = validate_samples(labs, scos, unit=unit_cal)
+    record["items"] = len(names)
+  warn_alignment(report)
+  return names
+
+def evaluate(labs, scos, args, profiler=None, names=None, **tags):
+  """Compute EER with the counting mode of args as compute_eer, compute_exact_eer or compute_adaptive_eer,
+  returns the EER values, thresholds, minval, maxval and resolution
+
+  names are the utterances returned by validate(), every valid utterance by default.
+  """
+  profiler = profiler or Profiler()
+  minval, maxval, thresholds = args.minval, args.maxval, None
+  with profiler.stage("count", unit="frames", hot=True, **tags) as record:
+    if args.exact:
+      counter, thresholds = _exact_counter(*_gather_samples(labs, scos, names, validate=names is None))
+    else:
+      counter = np.zeros((2,args.resolution+1))
+      if args.adaptive:
+        counter, minval, maxval = _grow_counter(counter, minval, maxval, *_score_range(scos))
+      counter = _count_samples(labs, scos, resolution=args.resolution, counter=counter, minval=minval, maxval=maxval,
+                               workers=args.workers, names=names, validate=names is None)
+    record["items"] = np.sum(counter)
+  with profiler.stage("det", unit="thresholds", items=counter.shape[1], **tags):
+    if args.exact:
+      return _exact_counter_eer(counter, thresholds) + (thresholds, minval, maxval, counter.shape[1] - 1)
+    return _counter_eer(counter, minval=minval, maxval=maxval) + (None, minval, maxval, args.resolution)
+
+def evaluate_groups(labs, scos, groups, args, profiler=None, names=None, **tags):
+  """Compute the counter of every group in one pass, returns the evaluate() result of the pooled counter and the group names and counter"""
+  profiler = profiler or Profiler()
+  with profiler.stage("count", unit="frames", hot=True, **tags) as record:
+    groupnames, counters, minval, maxval = compute_grouped_eer(labs, scos, groups, resolution=args.resolution, minval=args.minval, maxval=args.maxval,
+                                                               adaptive=args.adaptive, names=names)
+    record["items"] = np.sum(counters)
+  with profiler.stage("det", unit="thresholds", items=counters.shape[-1], **tags):
+    _, pooled, _ = grouped_counter_eers(counters, minval=minval, maxval=maxval)
+  return pooled + (None, minval, maxval, args.resolution), (groupnames, counters)
+
+def print_groups(grouped, result, args, prefix=""):
+  """Print the EER of every group, and of the pooled counter without it if --exclude_groups"""
+  minval, maxval = result[7:9]
+  groups, _, excluded = grouped_counter_eers(grouped[1], minval=minval, maxval=maxval, exclude=args.exclude_groups)
+  for i, name in enumerate(grouped[0]):
+    eer, threshold, margin = groups[i]
+    line = f"{prefix}group={name} eer={eer*100:.2f}% margin={margin*100:.2f}% threshold={threshold:.4f}"
+    print(line + ("" if excluded is None else f" eer_excluded={excluded[i][0]*100:.2f}%"))
+
+def bootstrap(labs, scos, result, args):
+  """Return the bootstrap confidence interval fields of result.txt, or none if --bootstrap is 0"""
+  if args.bootstrap <= 0:
+    return {}
+  minval, maxval, resolution = result[7:]
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore") # the alignment was already reported by validate
+    eers, _ = compute_bootstrap_eer(labs, scos, nboot=args.bootstrap, resolution=resolution, minval=minval, maxval=maxval, seed=args.seed)
+  return bootstrap_fields(eers, confidence=args.confidence)
+
+def save(savepath, result, utterances, args, zoom, minscore, maxscore, extra=None):
+  eer, threshold, margin, fpr, fnr, counter, thresholds, minval, maxval, resolution = result
+  save_result(savepath, fpr, fnr, counter, result_info(eer, threshold, margin, counter, {
+    "unit_input": args.unit, "unit_cal": zoom_unit(args.unit, zoom), "minscore": minscore, "maxscore": maxscore,
+    "minval": minval, "maxval": maxval, "negative_class": args.negative_class,
+    "resolution": resolution, "scoreindex": args.scoreindex, "labpath": args.labpath,
+    "scopath": args.scopath, "savepath": savepath, "utterances": utterances, **(extra or {})}), thresholds=thresholds, compact=args.compact)
+
+def result_params(args, zoom, pooling):
+  """Return the parameters that change the counter of a zoom and pooling"""
+  return {"scoreindex": args.scoreindex, "unit": args.unit, "zoom": zoom, "pooling": pooling, "resolution": args.resolution,
+          "minval": args.minval, "maxval": args.maxval, "negative_class": args.negative_class,
+          "sensitivity": args.sensitivity, "exact": args.exact, "adaptive": args.adaptive,
+          "bootstrap": args.bootstrap, "confidence": args.confidence, "seed": args.seed, "groupindex": args.groupindex}
+
+def sweep_combinations(zooms, poolings):
+  """Return the (zoom, pooling) pairs that sweep_scores yields"""
+  return [(zoom, pooling if zoom < -1 or zoom == 0 else None) for zoom in zooms
+          for pooling in (poolings if zoom < -1 or zoom == 0 else poolings[:1])]
+
+def sweep_savepath(savepath, zoom, pooling, sweep):
+  if savepath is None or not sweep:
+    return savepath
+  return f"{savepath}/zoom{zoom}" if pooling is None else f"{savepath}/zoom{zoom}_{pooling}"
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Calculate Utterance-based EER for Llama Partial Spoof")
+  parser.add_argument('--labpath', type=str, required=True, help="Path to Llama Partial Spoof label file.")
+  parser.add_argument('--scopath', type=str, required=True, help="Path to score file.")
+  parser.add_argument('--savepath', type=str, default=None, help="Path to directory tp save computed data.")
+  parser.add_argument('--resolution', type=int, default=10000, help="Threshold resolution.")
+  parser.add_argument('--scoreindex', type=int, default=1, help="Index of the score column.")
+  parser.add_argument('--unit', type=float, default=0.0, help="Segment duration if unit>0.0 else utterance-based.")
+  parser.add_argument('--zoom', type=int, nargs='+', default=[1], help="Zoom in or out to get finer or coaster scores, many zooms are evaluated in one pass")
+  parser.add_argument('--pooling', type=str, nargs='+', default=["max"], help=f"Pooling of zoom<-1 and zoom=0: {POOLINGS}.")
+  parser.add_argument('--negative_class', action="store_true", help="Using score of the negative class")
+  parser.add_argument('--minval', type=float, default=-2.0, help="Score lower bound.")
+  parser.add_argument('--maxval', type=float, default=2.0, help="Score higher bound.")
+  parser.add_argument('--sensitivity', type=float, default=0.0, help="Sensitivity to extract real/fake label.")
+  parser.add_argument('--cachedir', type=str, default=None, help="Directory to cache the parsed labels.")
+  parser.add_argument('--workers', type=int, default=1, help="Number of processes counting the samples.")
+  parser.add_argument('--stream', action="store_true", help="Read the score file grouped by utterance in bounded-memory chunks.")
+  parser.add_argument('--chunksize', type=float, default=64, help="Chunk size in MB when streaming.")
+  parser.add_argument('--checkpoint', type=str, default=None, help="Path to save and resume the streaming counter.")
+  parser.add_argument('--checkpoint_interval', type=float, default=60.0, help="Seconds between streaming checkpoints.")
+  parser.add_argument('--exact', action="store_true", help="Evaluate at every unique score instead of resolution buckets.")
+  parser.add_argument('--adaptive', action="store_true", help="Grow the threshold range from minval and maxval to cover every score.")
+  parser.add_argument('--bootstrap', type=int, default=0, help="Number of bootstrap resamplings of the utterances for a confidence interval.")
+  parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level of the bootstrap interval.")
+  parser.add_argument('--seed', type=int, default=0, help="Random seed of the bootstrap.")
+  parser.add_argument('--groups', type=str, default=None, help="Metadata or label file mapping every utterance to a group (attack, subset...) to break EER down by.")
+  parser.add_argument('--groupindex', type=int, default=1, help="Index of the group column of the --groups file.")
+  parser.add_argument('--exclude_groups', action="store_true", help="Also calculate the pooled EER without each group.")
+  parser.add_argument('--compact', action="store_true", help="Save only the non-zero counter columns and the result fields in result.npz.")
+  parser.add_argument('--profile', action="store_true", help="Print the wall time, CPU time, peak RSS and throughput of every stage.")
+  parser.add_argument('--cprofile', type=str, default=None, help="Path to dump a cProfile of the counting stages.")
+  parser.add_argument('--result_cache', type=str, default=None, help="Directory to cache the results keyed by the content of the inputs.")
+  parser.add_argument('--result_cache_size', type=float, default=1024, help="Size limit of the result cache in MB.")
+
+
+  args = parser.parse_args(argv)
+  assert not (args.exact and args.stream), "ERROR: --exact needs all scores in memory and can not be used with --stream"
+  assert not (args.exact and args.adaptive), "ERROR: --exact and --adaptive can not be used together"
+  assert not (args.exact and args.bootstrap > 0), "ERROR: --bootstrap needs threshold buckets and can not be used with --exact"
+  assert not (args.stream and args.bootstrap > 0), "ERROR: --bootstrap needs all scores in memory and can not be used with --stream"
+  assert not (args.groups and (args.exact or args.stream)), "ERROR: --groups can not be used with --exact or --stream"
+
+  start = time.time()
+
+  resolution = args.resolution
+  tag = "Utterance-based" if args.unit == 0 else f"{args.unit}s Segment-based"
+  mode = "exact threshold" if args.exact else f"{resolution}-bucket threshold"
+  logger.info(f"INFO: Calculate {tag} EER using {mode} NAGATIVE_CLASS={args.negative_class}")
+
+  sweep = len(args.zoom) > 1 or len(args.pooling) > 1
+  assert not (sweep and args.stream), "ERROR: --stream evaluates a single zoom and pooling"
+  labcache = {}
+  profiler = Profiler(cprofile=args.cprofile)
+  groups   = load_groups(args.groups, index=args.groupindex) if args.groups is not None else None
+
+  combinations = sweep_combinations(args.zoom, args.pooling)
+  rcache  = ResultCache(args.result_cache, int(args.result_cache_size*(1<<20))) if args.result_cache is not None else None
+  keys    = {combination: rcache.key("eer", [args.labpath, args.scopath] + ([args.groups] if groups is not None else []), result_params(args, *combination)) for combination in combinations} if rcache is not None else {}
+  results = {}
+  for combination, key in keys.items():
+    cached = cached_result(rcache, key)
+    if cached is not None:
+      results[combination] = (cached[0], cached[1]["utterances"], cached[1]["minscore"], cached[1]["maxscore"], cached[1].get("bootstrap", {}), cached[1]["groups"])
+  pending = [combination for combination in combinations if combination not in results]
+  began   = time.time()
+
+  if len(pending) > 0 and args.stream:
+    (zoom, pooling), = pending
+    labs   = zoom_labels(args, zoom, labcache, profiler)
+    chunks = lambda start: iter_score_tables(args.scopath, scoreindex=args.scoreindex, negative_class=args.negative_class,
+                                             chunksize=int(args.chunksize*(1<<20)), start=start)
+    params = {"labpath": args.labpath, "scopath": args.scopath, "scoreindex": args.scoreindex, "unit": args.unit,
+              "zoom": zoom, "pooling": pooling, "negative_class": args.negative_class, "sensitivity": args.sensitivity}
+    with profiler.stage("stream_count", unit="frames", hot=True) as record:
+      counter, minscore, maxscore, minval, maxval = count_stream(_count_samples, labs, chunks, resolution=resolution, minval=args.minval, maxval=args.maxval,
+                                                                 transform=lambda scos: zoom_scores(scos, zoom, pooling or "max"), checkpoint=args.checkpoint,
+                                                                 interval=args.checkpoint_interval, params=params, adaptive=args.adaptive, workers=args.workers)
+      record["items"] = np.sum(counter)
+    with profiler.stage("det", unit="thresholds", items=counter.shape[1]):
+      result = _counter_eer(counter, minval=minval, maxval=maxval) + (None, minval, maxval, resolution)
+    results[(zoom, pooling)] = (result, len(labs), minscore, maxscore, {}, None)
+  elif len(pending) > 0:
+    with profiler.stage("score_load", unit="frames") as record:
+      scos, minscore, maxscore = load_scores(args.scopath, scoreindex=args.scoreindex, negative_class=args.negative_class)
+      record["items"] = len(scos.scores)
+    logger.info(f"INFO: Loaded {len(scos)} scores from {args.scopath} INDEX={args.scoreindex}")
+    assert args.exact or args.adaptive or (minscore > args.minval and maxscore < args.maxval), f"ERROR: score ({minscore},{maxscore}) is outside calculating boundary ({args.minval},{args.maxval})"
+
+    end     = time.time()
+    elapsed = (end-start)/60
+    logger.info(f"INFO: Loading data took {elapsed:.2f} minutes")
+    start   = end
+
+    for group in dict.fromkeys(zoom for zoom, _ in pending):
+      poolings = [pooling or "max" for zoom, pooling in pending if zoom == group]
+      with profiler.stage("zoom", unit="frames", items=len(scos.scores), zoom=group):
+        zoomed = list(sweep_scores(scos, [group], poolings))
+      for zoom, pooling, zoomed in zoomed:
+        tags = {"zoom": zoom, "pooling": pooling} if sweep else {}
+        labs  = zoom_labels(args, zoom, labcache, profiler)
+        names = validate(labs, zoomed, zoom_unit(args.unit, zoom), profiler, **tags)
+        result, grouped = evaluate_groups(labs, zoomed, groups, args, profiler, names, **tags) if groups is not None else (evaluate(labs, zoomed, args, profiler, names, **tags), None)
+        extra = {}
+        if args.bootstrap > 0:
+          with profiler.stage("bootstrap", unit="replicates", items=args.bootstrap, **tags):
+            extra = bootstrap(labs, zoomed, result, args)
+        results[(zoom, pooling)] = (result, len(labs), minscore, maxscore, extra, grouped)
+
+  if rcache is not None and len(pending) > 0:
+    seconds = (time.time() - began) / len(pending)
+    for combination in pending:
+      result, utterances, minscore, maxscore, extra, grouped = results[combination]
+      cache_result(rcache, keys[combination], result, seconds, groups=grouped, utterances=utterances, minscore=minscore, maxscore=maxscore, bootstrap=extra)
+
+  for zoom, pooling in combinations:
+    result, utterances, minscore, maxscore, extra, grouped = results[(zoom, pooling)]
+    eer, threshold, margin = result[:3]
+    prefix = (f"zoom={zoom} " + ("" if pooling is None else f"pooling={pooling} ")) if sweep else ""
+    print(f"{prefix}eer={eer*100:.2f}% margin={margin*100:.2f}% threshold={threshold:.4f} negative={args.negative_class}")
+    if extra:
+      print(f"{prefix}eer_ci={extra['confidence']*100:g}% [{extra['eer_ci_low']*100:.2f}%, {extra['eer_ci_high']*100:.2f}%] bootstrap={extra['bootstrap']}")
+    if grouped is not None:
+      print_groups(grouped, result, args, prefix=prefix)
+    sys.stdout.flush()
+
+    savepath = sweep_savepath(args.savepath, zoom, pooling, sweep)
+    if savepath is not None:
+      save(savepath, result, utterances, args, zoom, minscore, maxscore, extra)
+      if grouped is not None:
+        save_groups(savepath, *grouped, minval=result[7], maxval=result[8], exclude=args.exclude_groups)
+      logger.info(f"INFO: Saved computed data to {savepath}")
+  if rcache is not None:
+    print(rcache.report())
+  if args.savepath is not None:
+    profiler.save(args.savepath, script="calculate_eer", labpath=args.labpath, scopath=args.scopath, combinations=len(combinations), cached=len(combinations)-len(pending))
+  if args.profile:
+    print(profiler.report())
+  profiler.dump()
+
+  end     = time.time()
+  elapsed = (end-start)/60
+  logger.info(f"INFO: Calculate {tag} EER took {elapsed:.2f} minutes")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Calculate segment and boundary level localization metrics at every threshold
+
+The spoof segments of the PartialSpoof timestamps are rasterized to the score
+unit, every threshold bucket is evaluated from one pass over the frames, e.g.
+
+  python calculate_localization.py --labpath label.txt --scopath scores.txt --unit 0.02 --tolerance 1 --threshold 0.0
+"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import logging
+
+from .metrics.eer import validate_samples
+from .metrics.align import warn_alignment
+from .metrics.localization import compute_localization, localization_curves
+from .utils.label import load_partialspoof_labels
+from .utils.score import load_scores
+from .utils.result import save_localization
+from .utils.profile import Profiler
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+
+CURVES = ["segment_precision", "segment_recall", "segment_f1", "boundary_precision", "boundary_recall", "boundary_f1", "iou", "mean_iou"]
+
+
+def best_points(curves):
+  """Return the threshold index of the best segment F1, boundary F1 and mean IoU"""
+  points = {}
+  for key in ["segment_f1", "boundary_f1", "mean_iou"]:
+    if not np.all(np.isnan(curves[key])):
+      points[key] = int(np.nanargmax(curves[key]))
+  return points
+
+def threshold_index(curves, threshold):
+  """Return the index of the bucket of a threshold score"""
+  thresholds = curves["threshold"]
+  step = (thresholds[-1] - thresholds[0]) / (thresholds.shape[0] - 1)
+  return int(np.clip(np.floor((threshold - thresholds[0]) / step), 0, thresholds.shape[0] - 1))
+
+def format_point(curves, idx, prefix=""):
+  fields = " ".join(f"{key}={curves[key][idx]*100:.2f}%" for key in CURVES)
+  return f"{prefix}threshold={curves['threshold'][idx]:.4f} segments={curves['predicted_segments'][idx]:.0f} {fields}"
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Calculate segment and boundary level localization metrics for Partial Spoof")
+  parser.add_argument('--labpath', type=str, required=True, help="Path to Partial Spoof label file.")
+  parser.add_argument('--scopath', type=str, required=True, help="Path to frame score file.")
+  parser.add_argument('--savepath', type=str, default=None, help="Path to directory to save the curves.")
+  parser.add_argument('--resolution', type=int, default=10000, help="Threshold resolution.")
+  parser.add_argument('--scoreindex', type=int, default=1, help="Index of the score column.")
+  parser.add_argument('--unit', type=float, required=True, help="Frame duration of the scores in seconds.")
+  parser.add_argument('--tolerance', type=int, default=1, help="Frames between a predicted and a reference boundary that still match.")
+  parser.add_argument('--threshold', type=float, action='append', help="Also print the metrics at this threshold.")
+  parser.add_argument('--negative_class', action="store_true", help="Using score of the negative class")
+  parser.add_argument('--minval', type=float, default=-2.0, help="Score lower bound.")
+  parser.add_argument('--maxval', type=float, default=2.0, help="Score higher bound.")
+  parser.add_argument('--sensitivity', type=float, default=0.0, help="Sensitivity to extract real/fake label.")
+  parser.add_argument('--cachedir', type=str, default=None, help="Directory to cache the parsed labels.")
+  parser.add_argument('--profile', action="store_true", help="Print the wall time, CPU time, peak RSS and throughput of every stage.")
+
+  args = parser.parse_args(argv)
+  assert args.unit > 0, "ERROR: localization metrics need frame scores, --unit must be greater than 0"
+  assert args.tolerance >= 0, "ERROR: --tolerance must not be negative"
+  start    = time.time()
+  profiler = Profiler()
+
+  with profiler.stage("label_load", unit="utterances") as record:
+    labs = load_partialspoof_labels(args.labpath, unit=args.unit, sensitivity=args.sensitivity, cachedir=args.cachedir)
+    record["items"] = len(labs)
+  with profiler.stage("score_load", unit="frames") as record:
+    scos, minscore, maxscore = load_scores(args.scopath, scoreindex=args.scoreindex, negative_class=args.negative_class)
+    record["items"] = len(scos.scores)
+  logger.info(f"INFO: Loaded {len(labs)} labels and {len(scos)} scores UNIT={args.unit} INDEX={args.scoreindex}")
+  assert minscore > args.minval and maxscore < args.maxval, f"ERROR: score ({minscore},{maxscore}) is outside calculating boundary ({args.minval},{args.maxval})"
+
+  with profiler.stage("validate", unit="utterances") as record:
+    names, report = validate_samples(labs, scos, unit=args.unit)
+    record["items"] = len(names)
+  warn_alignment(report)
+  with profiler.stage("count", unit="utterances", items=len(names), hot=True):
+    counts = compute_localization(labs, scos, resolution=args.resolution, minval=args.minval, maxval=args.maxval, tolerance=args.tolerance, names=names)
+  with profiler.stage("curves", unit="thresholds", items=args.resolution+1):
+    curves = localization_curves(counts, minval=args.minval, maxval=args.maxval)
+
+  fields = {"segments": int(counts["segments"]), "boundaries": int(counts["boundaries"]), "utterances": len(names)}
+  print(f"segments={fields['segments']} boundaries={fields['boundaries']} utterances={fields['utterances']} tolerance={args.tolerance}")
+  for key, idx in best_points(curves).items():
+    print(format_point(curves, idx, prefix=f"best={key} "))
+    fields.update({f"best_{key}": curves[key][idx], f"best_{key}_threshold": curves["threshold"][idx]})
+  for threshold in (args.threshold or []):
+    print(format_point(curves, threshold_index(curves, threshold)))
+
+  if args.savepath is not None:
+    fields.update({"unit": args.unit, "tolerance": args.tolerance, "minscore": minscore, "maxscore": maxscore, "minval": args.minval,
+                   "maxval": args.maxval, "negative_class": args.negative_class, "resolution": args.resolution,
+                   "scoreindex": args.scoreindex, "labpath": args.labpath, "scopath": args.scopath})
+    save_localization(args.savepath, counts, curves, fields)
+    logger.info(f"INFO: Saved localization curves to {args.savepath}")
+  if args.profile:
+    print(profiler.report())
+  logger.info(f"INFO: Calculate localization metrics took {(time.time()-start)/60:.2f} minutes")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Calculate Millisecond EER using LlamaPartialSpoof label and a score file"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import math
+import logging
+import warnings
+
+from .metrics.eer import _counter_eer, grouped_counter_eers, _exact_counter, _exact_counter_eer, _grow_counter
+from .metrics.mseer import compute_bootstrap_mseer, compute_grouped_mseer, _count_samples, _gather_segments, _segment_range, validate_segments
+from .metrics.align import warn_alignment
+from .utils.label import load_partialspoof_timestamp, load_groups
+from .utils.score import load_scores, iter_score_tables
+from .utils.stream import count_stream
+from .utils.result import result_info, save_result, save_groups, cache_result, cached_result
+from .utils.cache import ResultCache
+from .utils.profile import Profiler
+from .metrics.bootstrap import bootstrap_fields
+
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+#warnings.filterwarnings("ignore")
+
+
+def validate(labs, scos, profiler=None):
+  """Check that the labels and scores cover the same utterances with the same durations, warns once and returns the names to evaluate"""
+  with (profiler or Profiler()).stage("validate", unit="utterances") as record:
+    names, report = validate_segments(labs, scos)
+    record["items"] = len(names)
+  warn_alignment(report)
+  return names
+
+def evaluate(labs, scos, args, profiler=None, names=None):
+  """Compute millisecond EER with the counting mode of args as compute_mseer, compute_exact_mseer or compute_adaptive_mseer,
+  returns the EER values, thresholds, minval, maxval and resolution
+
+  names are the utterances returned by validate(), every valid utterance by default.
+  """
+  profiler = profiler or Profiler()
+  minval, maxval, thresholds = args.minval, args.maxval, None
+  with profiler.stage("count", unit="milliseconds", hot=True) as record:
+    if args.exact:
+      lab, sco, dur = _gather_segments(labs, scos, names, validate=names is None)
+      counter, thresholds = _exact_counter(lab, sco, weight=dur)
+    else:
+      counter = np.zeros((2,args.resolution+1))
+      if args.adaptive:
+        counter, minval, maxval = _grow_counter(counter, minval, maxval, *_segment_range(scos))
+      counter = _count_samples(labs, scos, resolution=args.resolution, counter=counter, minval=minval, maxval=maxval,
+                               workers=args.workers, names=names, validate=names is None)
+    record["items"] = np.sum(counter) * 1000
+  with profiler.stage("det", unit="thresholds", items=counter.shape[1]):
+    if args.exact:
+      return _exact_counter_eer(counter, thresholds) + (thresholds, minval, maxval, counter.shape[1] - 1)
+    return _counter_eer(counter, minval=minval, maxval=maxval) + (None, minval, maxval, args.resolution)
+
+def evaluate_groups(labs, scos, groups, args, profiler=None, names=None):
+  """Compute the counter of every group in one pass, returns the evaluate() result of the pooled counter and the group names and counter"""
+  profiler = profiler or Profiler()
+  with profiler.stage("count", unit="milliseconds", hot=True) as record:
+    groupnames, counters, minval, maxval = compute_grouped_mseer(labs, scos, groups, resolution=args.resolution, minval=args.minval, maxval=args.maxval,
+                                                                 adaptive=args.adaptive, names=names)
+    record["items"] = np.sum(counters) * 1000
+  with profiler.stage("det", unit="thresholds", items=counters.shape[-1]):
+    _, pooled, _ = grouped_counter_eers(counters, minval=minval, maxval=maxval)
+  return pooled + (None, minval, maxval, args.resolution), (groupnames, counters)
+
+def bootstrap(labs, scos, result, args):
+  """Return the bootstrap confidence interval fields of result.txt, or none if --bootstrap is 0"""
+  if args.bootstrap <= 0:
+    return {}
+  minval, maxval, resolution = result[7:]
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore") # the alignment was already reported by validate
+    eers, _ = compute_bootstrap_mseer(labs, scos, nboot=args.bootstrap, resolution=resolution, minval=minval, maxval=maxval, seed=args.seed)
+  return bootstrap_fields(eers, confidence=args.confidence)
+
+def save(savepath, result, utterances, args, minscore, maxscore, extra=None):
+  eer, threshold, margin, fpr, fnr, counter, thresholds, minval, maxval, resolution = result
+  save_result(savepath, fpr, fnr, counter, result_info(eer, threshold, margin, counter, {
+    "unit_input": args.unit, "unit_cal": "millisecond", "minscore": minscore, "maxscore": maxscore,
+    "minval": minval, "maxval": maxval, "nagative_class": args.negative_class,
+    "resolution": resolution, "scoreindex": args.scoreindex, "labpath": args.labpath,
+    "scopath": args.scopath, "savepath": savepath, "utterances": utterances, **(extra or {})}, classfmt=".04f"), thresholds=thresholds, compact=args.compact)
+
+def result_params(args):
+  """Return the parameters that change the counter"""
+  return {"scoreindex": args.scoreindex, "unit": args.unit, "resolution": args.resolution, "minval": args.minval,
+          "maxval": args.maxval, "negative_class": args.negative_class, "exact": args.exact, "adaptive": args.adaptive,
+          "bootstrap": args.bootstrap, "confidence": args.confidence, "seed": args.seed, "groupindex": args.groupindex}
+
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description='Calculate Range EER')
+  parser.add_argument('--labpath', type=str, required=True, help="Path to Llama Partial Spoof label file.")
+  parser.add_argument('--scopath', type=str, required=True, help="Path to score file.")
+  parser.add_argument('--savepath', type=str, default=None, help="Path to directory tp save computed data.")
+  parser.add_argument('--resolution', type=int, default=100000, help="Threshold resolution")
+  parser.add_argument('--unit', type=float, default=0.0, help="Segment duration if unit>0.0 else utterance-based.")
+  parser.add_argument('--negative_class', action="store_true", help="Using score of the negative class")
+  parser.add_argument('--scoreindex', type=int, default=1, help="Index of the score column.")
+  parser.add_argument('--minval', type=float, default=-2.0, help="Score lower bound.")
+  parser.add_argument('--maxval', type=float, default=2.0, help="Score higher bound.")
+  parser.add_argument('--cachedir', type=str, default=None, help="Directory to cache the parsed labels.")
+  parser.add_argument('--workers', type=int, default=1, help="Number of processes counting the samples.")
+  parser.add_argument('--stream', action="store_true", help="Read the score file grouped by utterance in bounded-memory chunks.")
+  parser.add_argument('--chunksize', type=float, default=64, help="Chunk size in MB when streaming.")
+  parser.add_argument('--checkpoint', type=str, default=None, help="Path to save and resume the streaming counter.")
+  parser.add_argument('--checkpoint_interval', type=float, default=60.0, help="Seconds between streaming checkpoints.")
+  parser.add_argument('--exact', action="store_true", help="Evaluate at every unique score instead of resolution buckets.")
+  parser.add_argument('--adaptive', action="store_true", help="Grow the threshold range from minval and maxval to cover every score.")
+  parser.add_argument('--bootstrap', type=int, default=0, help="Number of bootstrap resamplings of the utterances for a confidence interval.")
+  parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level of the bootstrap interval.")
+  parser.add_argument('--seed', type=int, default=0, help="Random seed of the bootstrap.")
+  parser.add_argument('--groups', type=str, default=None, help="Metadata or label file mapping every utterance to a group (attack, subset...) to break EER down by.")
+  parser.add_argument('--groupindex', type=int, default=1, help="Index of the group column of the --groups file.")
+  parser.add_argument('--exclude_groups', action="store_true", help="Also calculate the pooled EER without each group.")
+  parser.add_argument('--compact', action="store_true", help="Save only the non-zero counter columns and the result fields in result.npz.")
+  parser.add_argument('--profile', action="store_true", help="Print the wall time, CPU time, peak RSS and throughput of every stage.")
+  parser.add_argument('--cprofile', type=str, default=None, help="Path to dump a cProfile of the counting stages.")
+  parser.add_argument('--result_cache', type=str, default=None, help="Directory to cache the results keyed by the content of the inputs.")
+  parser.add_argument('--result_cache_size', type=float, default=1024, help="Size limit of the result cache in MB.")
+
+
+  args = parser.parse_args(argv)
+  assert not (args.exact and args.stream), "ERROR: --exact needs all scores in memory and can not be used with --stream"
+  assert not (args.exact and args.adaptive), "ERROR: --exact and --adaptive can not be used together"
+  assert not (args.exact and args.bootstrap > 0), "ERROR: --bootstrap needs threshold buckets and can not be used with --exact"
+  assert not (args.stream and args.bootstrap > 0), "ERROR: --bootstrap needs all scores in memory and can not be used with --stream"
+  assert not (args.groups and (args.exact or args.stream)), "ERROR: --groups can not be used with --exact or --stream"
+
+  start = time.time()
+
+  profiler = Profiler(cprofile=args.cprofile)
+  groups = load_groups(args.groups, index=args.groupindex) if args.groups is not None else None
+  rcache = ResultCache(args.result_cache, int(args.result_cache_size*(1<<20))) if args.result_cache is not None else None
+  key    = rcache.key("mseer", [args.labpath, args.scopath] + ([args.groups] if groups is not None else []), result_params(args)) if rcache is not None else None
+  cached = cached_result(rcache, key) if rcache is not None else None
+  if cached is not None:
+    result, meta = cached
+    utterances, minscore, maxscore, extra, grouped = meta["utterances"], meta["minscore"], meta["maxscore"], meta.get("bootstrap", {}), meta["groups"]
+  elif args.stream:
+    with profiler.stage("label_load", unit="utterances") as record:
+      labs = load_partialspoof_timestamp(args.labpath, cachedir=args.cachedir)
+      record["items"] = len(labs)
+    chunks = lambda start: iter_score_tables(args.scopath, scoreindex=args.scoreindex, frameindex=1, unit=args.unit,
+                                             negative_class=args.negative_class, chunksize=int(args.chunksize*(1<<20)), start=start)
+    params = {"labpath": args.labpath, "scopath": args.scopath, "scoreindex": args.scoreindex, "unit": args.unit,
+              "negative_class": args.negative_class}
+    with profiler.stage("stream_count", unit="milliseconds", hot=True) as record:
+      counter, minscore, maxscore, minval, maxval = count_stream(_count_samples, labs, chunks, resolution=args.resolution, minval=args.minval, maxval=args.maxval,
+                                                                 checkpoint=args.checkpoint, interval=args.checkpoint_interval, params=params, adaptive=args.adaptive, workers=args.workers)
+      record["items"] = np.sum(counter) * 1000
+    with profiler.stage("det", unit="thresholds", items=counter.shape[1]):
+      result = _counter_eer(counter, minval=minval, maxval=maxval) + (None, minval, maxval, args.resolution)
+    extra, grouped = {}, None
+  else:
+    with profiler.stage("score_load", unit="frames") as record:
+      scos, minscore, maxscore = load_scores(args.scopath, scoreindex=args.scoreindex, frameindex=1, unit=args.unit, negative_class=args.negative_class)
+      record["items"] = len(scos.scores)
+
+    assert args.exact or args.adaptive or (minscore > args.minval and maxscore < args.maxval), f"ERROR: score ({minscore},{maxscore}) is outside calculating boundary ({args.minval},{args.maxval})"
+
+    with profiler.stage("label_load", unit="utterances") as record:
+      labs = load_partialspoof_timestamp(args.labpath, cachedir=args.cachedir)
+      record["items"] = len(labs)
+    names  = validate(labs, scos, profiler)
+    result, grouped = evaluate_groups(labs, scos, groups, args, profiler, names) if groups is not None else (evaluate(labs, scos, args, profiler, names), None)
+    extra  = {}
+    if args.bootstrap > 0:
+      with profiler.stage("bootstrap", unit="replicates", items=args.bootstrap):
+        extra = bootstrap(labs, scos, result, args)
+  if cached is None:
+    utterances = len(labs)
+    if rcache is not None:
+      cache_result(rcache, key, result, time.time()-start, groups=grouped, utterances=utterances, minscore=minscore, maxscore=maxscore, bootstrap=extra)
+  eer, threshold, margin, fpr, fnr, counter = result[:6]
+  print(f"mseer={eer*100:.2f}% margin={margin*100:.2f}% threshold={threshold:.4f} minscore={minscore:.3f} maxscore={maxscore:.3f} negative={args.negative_class}")
+  if extra:
+    print(f"mseer_ci={extra['confidence']*100:g}% [{extra['eer_ci_low']*100:.2f}%, {extra['eer_ci_high']*100:.2f}%] bootstrap={extra['bootstrap']}")
+  if grouped is not None:
+    groupeers, _, excluded = grouped_counter_eers(grouped[1], minval=result[7], maxval=result[8], exclude=args.exclude_groups)
+    for i, name in enumerate(grouped[0]):
+      line = f"group={name} mseer={groupeers[i][0]*100:.2f}% margin={groupeers[i][2]*100:.2f}% threshold={groupeers[i][1]:.4f}"
+      print(line + ("" if excluded is None else f" mseer_excluded={excluded[i][0]*100:.2f}%"))
+
+  totaldur = np.sum(counter) / 3600
+
+  end     = time.time()
+  elapsed = (end-start)/60
+  logger.info(f"INFO: Calculate 1-ms EER took {elapsed:.2f} minutes")
+
+
+  if args.savepath is not None:
+    save(args.savepath, result, utterances, args, minscore, maxscore, extra)
+    if grouped is not None:
+      save_groups(args.savepath, *grouped, minval=result[7], maxval=result[8], exclude=args.exclude_groups, classfmt=".04f")
+    logger.info(f"INFO: Saved computed data to {args.savepath}")
+  if rcache is not None:
+    print(rcache.report())
+  if args.savepath is not None:
+    profiler.save(args.savepath, script="calculate_mseer", labpath=args.labpath, scopath=args.scopath, cached=cached is not None)
+  if args.profile:
+    print(profiler.report())
+  profiler.dump()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Calculate the EER or millisecond EER of many systems or checkpoints against the same labels in one pass
+
+Every system gets a result directory under --savepath, with a ranked summary.txt
+and the paired bootstrap significance of every pair of systems in
+significance.txt, e.g.
+
+  python calculate_systems.py --labpath label.txt --scopath a.score b.score c.score --unit 0.02 --scoreindex 3 --metric mseer --savepath out
+"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import logging
+
+from .metrics.systems import shared_names, system_samples, system_segments, count_systems, system_eers, rank_systems
+from .metrics.bootstrap import paired_bootstrap_eer, paired_significance, bootstrap_fields
+from .utils.label import load_partialspoof_labels, load_partialspoof_timestamp
+from .utils.score import load_scores
+from .utils.result import result_info, save_result
+from .utils.profile import Profiler
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+
+
+def system_names(scopaths, names=None):
+  """Return the name of every system, the score file names without extension by default or their paths if those repeat"""
+  if names is not None:
+    assert len(names) == len(scopaths), "ERROR: --names needs one name per --scopath"
+    assert len(set(names)) == len(names), "ERROR: --names must be unique"
+    return list(names)
+  names = [os.path.splitext(os.path.basename(scopath))[0] for scopath in scopaths]
+  if len(set(names)) < len(names):
+    names = [scopath.strip("/").replace("/", "_") for scopath in scopaths]
+  assert len(set(names)) == len(names), "ERROR: the score files repeat, give --names"
+  return names
+
+def save_summary(savepath, sysnames, results, order, extras):
+  """Save summary.txt with one line of key=value fields per system, ranked by EER"""
+  with open(f"{savepath}/summary.txt", "w") as f:
+    for rank, i in enumerate(order, start=1):
+      fields = {"rank": rank, "system": sysnames[i], "eer": results[i][0], "threshold": results[i][1], "margin": results[i][2]}
+      fields.update({key: extras[i][key] for key in ["eer_ci_low", "eer_ci_high"] if key in extras[i]})
+      f.write(" ".join(f"{key}={value}" for key, value in fields.items()) + "\n")
+
+def save_significance(savepath, sysnames, pairs, confidence):
+  """Save significance.txt with one line of key=value fields per pair of systems"""
+  with open(f"{savepath}/significance.txt", "w") as f:
+    for i, j, diff, low, high, pvalue in pairs:
+      f.write(f"system_a={sysnames[i]} system_b={sysnames[j]} eer_diff={diff} confidence={confidence} diff_ci_low={low} diff_ci_high={high} p_value={pvalue}\n")
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Calculate EER or Millisecond EER of many systems against the same labels")
+  parser.add_argument('--labpath', type=str, required=True, help="Path to Partial Spoof label file.")
+  parser.add_argument('--scopath', type=str, nargs='+', required=True, help="Paths to the score files of every system, scoring the same utterances.")
+  parser.add_argument('--names', type=str, nargs='+', default=None, help="Name of every system, the score file names by default.")
+  parser.add_argument('--savepath', type=str, default=None, help="Path to directory to save one result directory per system and the summaries.")
+  parser.add_argument('--metric', type=str, default="eer", choices=["eer", "mseer"], help="Utterance or frame EER, or Millisecond EER.")
+  parser.add_argument('--resolution', type=int, default=None, help="Threshold resolution, 10000 for EER and 100000 for Millisecond EER by default.")
+  parser.add_argument('--scoreindex', type=int, default=1, help="Index of the score column.")
+  parser.add_argument('--unit', type=float, default=0.0, help="Frame duration of the scores, 0.0 for utterance-based EER.")
+  parser.add_argument('--negative_class', action="store_true", help="Using score of the negative class")
+  parser.add_argument('--minval', type=float, default=-2.0, help="Score lower bound.")
+  parser.add_argument('--maxval', type=float, default=2.0, help="Score higher bound.")
+  parser.add_argument('--adaptive', action="store_true", help="Grow the threshold range shared by the systems to cover every score.")
+  parser.add_argument('--sensitivity', type=float, default=0.0, help="Sensitivity to extract real/fake label.")
+  parser.add_argument('--cachedir', type=str, default=None, help="Directory to cache the parsed labels.")
+  parser.add_argument('--bootstrap', type=int, default=1000, help="Number of paired bootstrap resamplings of the utterances, 0 skips the significance tests.")
+  parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level of the bootstrap intervals.")
+  parser.add_argument('--seed', type=int, default=0, help="Random seed of the bootstrap.")
+  parser.add_argument('--compact', action="store_true", help="Save only the non-zero counter columns and the result fields in result.npz.")
+  parser.add_argument('--profile', action="store_true", help="Print the wall time, CPU time, peak RSS and throughput of every stage.")
+
+  args = parser.parse_args(argv)
+  segments = args.metric == "mseer"
+  assert not segments or args.unit > 0, "ERROR: Millisecond EER needs frame scores, --unit must be greater than 0"
+  sysnames = system_names(args.scopath, args.names)
+  args.resolution = args.resolution or (100000 if segments else 10000)
+  start    = time.time()
+  profiler = Profiler()
+
+  with profiler.stage("label_load", unit="utterances") as record:
+    if segments:
+      labs = load_partialspoof_timestamp(args.labpath, cachedir=args.cachedir)
+    else:
+      labs = load_partialspoof_labels(args.labpath, unit=args.unit, sensitivity=args.sensitivity, cachedir=args.cachedir)
+    record["items"] = len(labs)
+  systems, ranges = [], []
+  for scopath in args.scopath:
+    with profiler.stage("score_load", unit="frames", system=scopath) as record:
+      if segments:
+        scos, minscore, maxscore = load_scores(scopath, scoreindex=args.scoreindex, frameindex=1, unit=args.unit, negative_class=args.negative_class)
+      else:
+        scos, minscore, maxscore = load_scores(scopath, scoreindex=args.scoreindex, negative_class=args.negative_class)
+      record["items"] = len(scos.scores)
+    assert args.adaptive or (minscore > args.minval and maxscore < args.maxval), f"ERROR: score ({minscore},{maxscore}) of {scopath} is outside calculating boundary ({args.minval},{args.maxval})"
+    systems.append(scos)
+    ranges.append((minscore, maxscore))
+  logger.info(f"INFO: Loaded {len(labs)} labels and {len(systems)} score files METRIC={args.metric} UNIT={args.unit}")
+
+  with profiler.stage("validate", unit="utterances") as record:
+    names = shared_names(labs, systems, sysnames, segments=segments, unit=args.unit)
+    record["items"] = len(names)
+  with profiler.stage("layout", unit="utterances", items=len(names)):
+    if segments:
+      samples, nlayouts = system_segments(labs, systems, names)
+      logger.info(f"INFO: {len(systems)} systems share {nlayouts} merged boundary layouts")
+    else:
+      samples = system_samples(labs, systems, names)
+  with profiler.stage("count", unit="samples", items=sum(sample[1].shape[0] for sample in samples), hot=True):
+    counter, minval, maxval = count_systems(samples, resolution=args.resolution, minval=args.minval, maxval=args.maxval, adaptive=args.adaptive)
+  with profiler.stage("det", unit="thresholds", items=counter.shape[0]*counter.shape[2]):
+    results = system_eers(counter, minval=minval, maxval=maxval)
+  extras, pairs = [{} for _ in systems], []
+  if args.bootstrap > 0:
+    with profiler.stage("bootstrap", unit="replicates", items=args.bootstrap):
+      eers  = paired_bootstrap_eer(samples, len(names), nboot=args.bootstrap, resolution=args.resolution, minval=minval, maxval=maxval, seed=args.seed)
+      extras = [bootstrap_fields(eers[i], confidence=args.confidence) for i in range(len(systems))]
+      pairs  = paired_significance(eers, [result[0] for result in results], confidence=args.confidence)
+
+  order = rank_systems(results)
+  for rank, i in enumerate(order, start=1):
+    eer, threshold, margin = results[i][:3]
+    line = f"rank={rank} system={sysnames[i]} {args.metric}={eer*100:.2f}% margin={margin*100:.2f}% threshold={threshold:.4f}"
+    if args.bootstrap > 0:
+      line += f" ci=[{extras[i]['eer_ci_low']*100:.2f}%, {extras[i]['eer_ci_high']*100:.2f}%]"
+    print(line)
+  for i, j, diff, low, high, pvalue in pairs:
+    print(f"{sysnames[i]} vs {sysnames[j]}: diff={diff*100:+.2f}% ci=[{low*100:+.2f}%, {high*100:+.2f}%] p={pvalue:.4f}")
+  sys.stdout.flush()
+
+  if args.savepath is not None:
+    for i, (sysname, result) in enumerate(zip(sysnames, results)):
+      eer, threshold, margin, fpr, fnr, syscounter = result
+      savepath = f"{args.savepath}/{sysname}"
+      save_result(savepath, fpr, fnr, syscounter, result_info(eer, threshold, margin, syscounter, {
+        "unit_input": args.unit, "unit_cal": "millisecond" if segments else args.unit, "minscore": ranges[i][0], "maxscore": ranges[i][1],
+        "minval": minval, "maxval": maxval, "negative_class": args.negative_class, "resolution": args.resolution,
+        "scoreindex": args.scoreindex, "labpath": args.labpath, "scopath": args.scopath[i], "savepath": savepath,
+        "utterances": len(names), **extras[i]}, classfmt=".04f" if segments else ""), compact=args.compact)
+    save_summary(args.savepath, sysnames, results, order, extras)
+    if len(pairs) > 0:
+      save_significance(args.savepath, sysnames, pairs, args.confidence)
+    logger.info(f"INFO: Saved {len(systems)} results to {args.savepath}")
+  if args.profile:
+    print(profiler.report())
+  logger.info(f"INFO: Calculate {len(systems)} systems took {(time.time()-start)/60:.2f} minutes")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Single command line entry point with one subcommand per tool, e.g.
+
+  partialspoof-metrics eer --labpath label.txt --scopath scores.txt --unit 0.02
+  partialspoof-metrics run commands.txt
+  python -m partialspoof_metrics eer --labpath label.txt --scopath scores.txt
+
+Only the module of the requested subcommand is imported. The run subcommand
+executes one subcommand per line in this process, so the interpreter, numpy and
+the parsed labels are loaded once for many evaluations.
+"""
+
+import sys
+import shlex
+import importlib
+import traceback
+
+PROG = "partialspoof-metrics"
+
+COMMANDS = {
+  "eer":       ("calculate_eer",           "Calculate utterance-based or segment-based EER"),
+  "mseer":     ("calculate_mseer",         "Calculate Millisecond EER"),
+  "systems":   ("calculate_systems",       "Calculate and rank EER or Millisecond EER of many systems with significance tests"),
+  "localize":  ("calculate_localization",  "Calculate segment and boundary localization metrics at every threshold"),
+  "accuracy":  ("calculate_accuracy",      "Query thresholds, recall, precision, FPR and FNR targets of saved results"),
+  "combine":   ("combine_eer_results",     "Combine saved results into one"),
+  "plot":      ("draw_score_distribution", "Draw the score distribution of a saved result"),
+  "batch":     ("calculate_batch",         "Calculate every EER variant of many score files"),
+  "serve":     ("serve_eer",               "Serve EER of score files while keeping the labels in memory"),
+  "benchmark": ("benchmark",               "Benchmark every stage of the pipeline on synthetic data"),
+}
+
+
+def usage():
+  lines  = [f"usage: {PROG} <command> [options]", "", "commands:"]
+  lines += [f"  {name:<11}{help}" for name, (_, help) in COMMANDS.items()]
+  lines += [f"  {'run':<11}Run the commands listed one per line in a file, or stdin if -, in this process"]
+  return "\n".join(lines)
+
+def _exit_status(code):
+  if code is None or isinstance(code, int):
+    return code or 0
+  print(code, file=sys.stderr)
+  return 1
+
+def run_command(argv):
+  """Run a subcommand given as its argument list, returns its exit status"""
+  if len(argv) == 0 or argv[0] in ["-h", "--help"]:
+    print(usage())
+    return 0 if len(argv) > 0 else 2
+  name, argv = argv[0], argv[1:]
+  if name == "run":
+    return run_file(argv)
+  if name not in COMMANDS:
+    print(f"{PROG}: unknown command '{name}'\n{usage()}", file=sys.stderr)
+    return 2
+  module = importlib.import_module(f".{COMMANDS[name][0]}", __package__)
+  try:
+    module.main(argv, prog=f"{PROG} {name}")
+  except SystemExit as e:
+    return _exit_status(e.code)
+  return 0
+
+def run_file(argv):
+  """Run every line of a command file as a subcommand, a failing command is reported and the next one still runs
+
+  Lines may start with the program name, empty lines and # comments are skipped.
+  Returns 1 if any command failed.
+  """
+  assert len(argv) == 1, f"ERROR: usage: {PROG} run <file or ->"
+  f = sys.stdin if argv[0] == "-" else open(argv[0], "r")
+  failed = 0
+  try:
+    for lineno, line in enumerate(f, start=1):
+      args = shlex.split(line, comments=True)
+      args = args[1:] if len(args) > 0 and args[0] == PROG else args
+      if len(args) == 0:
+        continue
+      try:
+        status = run_command(args)
+      except Exception:
+        traceback.print_exc()
+        status = 1
+      if status != 0:
+        print(f"{PROG}: line {lineno} exited with status {status}: {line.strip()}", file=sys.stderr)
+        failed += 1
+      sys.stdout.flush()
+  finally:
+    if f is not sys.stdin:
+      f.close()
+  return 1 if failed > 0 else 0
+
+def main(argv=None):
+  sys.exit(run_command(sys.argv[1:] if argv is None else argv))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Combine multiple EER result directories"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import math
+import logging
+import warnings
+
+from .metrics.eer import _calculate_det_curve, _calculate_eer, _exact_counter_eer
+from .utils.result import result_info, save_result, load_info, load_thresholds, load_sparse_counter, expand_counter
+from .utils.cache import ResultCache
+from .utils.profile import Profiler
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+#warnings.filterwarnings("ignore")
+
+
+def merge_exact(counters, thresholds):
+  """Sum exact counters over the union of their thresholds"""
+  merged, inverse = np.unique(np.concatenate(thresholds), return_inverse=True)
+  counter = np.zeros((2,merged.shape[0]))
+  for labtype in [0,1]:
+    counter[labtype,:] = np.bincount(inverse, weights=np.concatenate([c[labtype] for c in counters]), minlength=merged.shape[0])
+  return counter, merged
+
+def _tree_reduce(items, merge):
+  """Merge items pairwise like a binary counter, holding at most log2(n) partial results"""
+  stack = []
+  for item in items:
+    level = 0
+    while len(stack) > 0 and stack[-1][0] == level:
+      item   = merge(stack.pop()[1], item)
+      level += 1
+    stack.append((level, item))
+  item = stack.pop()[1]
+  while len(stack) > 0:
+    item = merge(stack.pop()[1], item)
+  return item
+
+def _doublings(curmin, curmax, minval, maxval):
+  """Return how many times the range (curmin, curmax) doubles around its center to become (minval, maxval)"""
+  times = 0
+  while curmax-curmin < maxval-minval:
+    center, width = (curmin+curmax)/2, curmax-curmin
+    curmin, curmax, times = center-width, center+width, times+1
+  assert (curmin, curmax) == (minval, maxval), f"ERROR: the range ({curmin},{curmax}) can not be aligned with ({minval},{maxval})"
+  return times
+
+def _grow_columns(index, resolution, times):
+  """Map counter columns to the columns of the counter whose range doubled times as _double_counter"""
+  assert times == 0 or resolution % 4 == 0, "ERROR: the resolution must be divisible by 4 to grow the counter range"
+  for _ in range(times):
+    index = np.where(index < resolution, resolution//4 + index//2, resolution*3//4)
+  return index
+
+def sum_counters(loadpaths, ranges, resolution):
+  """Sum the counters of bucketed results one at a time on the widest of their ranges"""
+  minval, maxval = max(ranges, key=lambda r: r[1]-r[0])
+  counter = np.zeros((2,resolution+1))
+  for loadpath, (curmin, curmax) in zip(loadpaths, ranges):
+    index, values, ncols = load_sparse_counter(loadpath)
+    assert ncols == resolution+1, f"ERROR: the counter of {loadpath} does not match its resolution {resolution}"
+    np.add.at(counter, (slice(None), _grow_columns(index, resolution, _doublings(curmin, curmax, minval, maxval))), values)
+  return counter, minval, maxval
+
+def sum_exact(loadpaths):
+  """Sum exact counters over the union of their thresholds by pairwise tree reduction"""
+  shards = ((expand_counter(*load_sparse_counter(loadpath)), load_thresholds(loadpath)) for loadpath in loadpaths)
+  return _tree_reduce(shards, lambda a, b: merge_exact([a[0], b[0]], [a[1], b[1]]))
+
+def combine(loadpaths, savepath, profiler=None):
+  """Sum the counters of EER result directories, returns fpr, fnr, counter, thresholds and the result.txt fields
+
+  The inputs are read one at a time, dense counters are memory-mapped.
+  """
+  profiler = profiler or Profiler()
+  negative_class = None
+  resolution = None
+  minscore, maxscore = None, None
+  minval, maxval = None, None
+
+  exact, ranges = [], []
+  labpaths, scopaths = [], []
+  utterances = 0
+  scoreindex, unit, unit_cal = 0, 0, 0
+
+
+  with profiler.stage("metadata", unit="results", items=len(loadpaths)):
+    resinfos = [load_info(loadpath) for loadpath in loadpaths]
+  for loadpath, resinfo in zip(loadpaths, resinfos):
+    exact.append(load_thresholds(loadpath) is not None)
+    ranges.append((float(resinfo["minval"]), float(resinfo["maxval"])))
+
+    labpaths.append(resinfo["labpath"])
+    scopaths.append(resinfo["scopath"])
+    utterances = utterances + int(resinfo["utterances"])
+
+    if resolution is None:
+      resolution = int(resinfo["resolution"])
+      negative_class = True if resinfo["negative_class"] == "True" else False
+      minscore, maxscore = float(resinfo["minscore"]), float(resinfo["maxscore"])
+      minval, maxval = float(resinfo["minval"]), float(resinfo["maxval"])
+      scoreindex, unit, unit_cal = int(resinfo["scoreindex"]), float(resinfo["unit_input"]), float(resinfo["unit_cal"])
+      logger.info(f"INFO: Combining results with resolution={resolution}, minval={minval}, maxval={maxval}, negative_class={negative_class}, UNIT_INPUT={unit} and UNIT_CAL={unit_cal} (0 means utterance-based)")
+    else:
+      cur_resolution = int(resinfo["resolution"])
+      cur_negative_class = True if resinfo["negative_class"] == "True" else False
+      cur_minscore, cur_maxscore = float(resinfo["minscore"]), float(resinfo["maxscore"])
+      cur_minval, cur_maxval = float(resinfo["minval"]), float(resinfo["maxval"])
+      assert exact[0] == exact[-1], f"ERROR: the input {loadpath} can not be combined with previous inputs, exact and bucketed results can not be mixed"
+      assert exact[0] or resolution == cur_resolution, f"ERROR: the input {loadpath} has different resolution ({cur_resolution}) than previous inputs ({resolution})"
+      assert negative_class == cur_negative_class, f"ERROR: the input {loadpath} has different negative_class ({cur_negative_class}) than previous inputs ({negative_class})"
+      assert not exact[0] or minval == cur_minval, f"ERROR: the input {loadpath} has different minval ({cur_minval}) than previous inputs ({minval})"
+      assert not exact[0] or maxval == cur_maxval, f"ERROR: the input {loadpath} has different maxval ({cur_maxval}) than previous inputs ({maxval})"
+
+      minscore = cur_minscore if cur_minscore < minscore else minscore
+      maxscore = cur_maxscore if cur_maxscore > maxscore else maxscore
+
+    logger.info(f"Loading EER result from {loadpath}")
+  logger.info(f"INFO: Finish loading {len(loadpaths)} EER results")
+
+  with profiler.stage("sum", unit="results", items=len(loadpaths), hot=True):
+    if exact[0]:
+      counter, thresholds = sum_exact(loadpaths)
+    else:
+      thresholds = None
+      counter, minval, maxval = sum_counters(loadpaths, ranges, resolution)
+  with profiler.stage("det", unit="thresholds", items=counter.shape[1]):
+    if exact[0]:
+      eer, threshold, margin, fpr, fnr, counter = _exact_counter_eer(counter, thresholds)
+      resolution = counter.shape[1] - 1
+    else:
+      fpr, fnr = _calculate_det_curve(counter)
+      eer, threshold, margin = _calculate_eer(fpr,fnr)
+      threshold = threshold * (maxval-minval) + minval
+
+  return fpr, fnr, counter, thresholds, result_info(eer, threshold, margin, counter, {
+    "unit_input": unit, "unit_cal": unit_cal, "minscore": minscore, "maxscore": maxscore,
+    "minval": minval, "maxval": maxval, "negative_class": negative_class,
+    "resolution": resolution, "scoreindex": scoreindex, "labpath": labpaths,
+    "scopath": scopaths, "savepath": savepath, "utterances": utterances})
+
+def input_files(loadpaths):
+  """Return the files of the result directories that the combined result depends on"""
+  return [f"{loadpath}/{name}" for loadpath in loadpaths for name in ["result.txt", "counter.npy", "thresholds.npy", "result.npz"]
+          if os.path.exists(f"{loadpath}/{name}")]
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Combine multiple EER results directory into one")
+  parser.add_argument('savepath', type=str, help="Path to the directory to save the results")
+  parser.add_argument('loadpaths', type=str, nargs='+', help="Paths to all the inputs results")
+  parser.add_argument('--compact', action="store_true", help="Save only the non-zero counter columns and the result fields in result.npz.")
+  parser.add_argument('--profile', action="store_true", help="Print the wall time, CPU time, peak RSS and throughput of every stage.")
+  parser.add_argument('--cprofile', type=str, default=None, help="Path to dump a cProfile of the summing stage.")
+  parser.add_argument('--result_cache', type=str, default=None, help="Directory to cache the results keyed by the content of the inputs.")
+  parser.add_argument('--result_cache_size', type=float, default=1024, help="Size limit of the result cache in MB.")
+  args = parser.parse_args(argv)
+
+  start = time.time()
+  profiler = Profiler(cprofile=args.cprofile)
+
+  rcache = ResultCache(args.result_cache, int(args.result_cache_size*(1<<20))) if args.result_cache is not None else None
+  key    = rcache.key("combine", input_files(args.loadpaths), {"loadpaths": len(args.loadpaths)}) if rcache is not None else None
+  cached = rcache.get(key) if rcache is not None else None
+  if cached is not None:
+    arrays, meta = cached
+    fpr, fnr, counter, thresholds = arrays["fpr"], arrays["fnr"], arrays["counter"], arrays.get("thresholds")
+    info = dict(meta["info"], savepath=args.savepath)
+  else:
+    fpr, fnr, counter, thresholds, info = combine(args.loadpaths, args.savepath, profiler)
+    if rcache is not None:
+      arrays = {"fpr": fpr, "fnr": fnr, "counter": counter}
+      if thresholds is not None:
+        arrays["thresholds"] = thresholds
+      rcache.put(key, {"info": info}, seconds=time.time()-start, **arrays)
+
+  print(f"eer={float(info['eer'])*100:.2f}% margin={float(info['margin'])*100:.2f}% threshold={float(info['threshold']):.4f} negative={info['negative_class']} n_loadpaths={len(args.loadpaths)}")
+
+  end     = time.time()
+  elapsed = (end-start)/60
+  logger.info(f"INFO: Combine EER results took {elapsed:.2f} minutes")
+
+  if args.savepath is not None:
+    save_result(args.savepath, fpr, fnr, counter, info, thresholds=thresholds, compact=args.compact)
+    logger.info(f"INFO: Saved computed data to {args.savepath}")
+  if rcache is not None:
+    print(rcache.report())
+  if args.savepath is not None:
+    profiler.save(args.savepath, script="combine_eer_results", loadpaths=len(args.loadpaths), cached=cached is not None)
+  if args.profile:
+    print(profiler.report())
+  profiler.dump()
+
+if __name__ == "__main__":
+  main()
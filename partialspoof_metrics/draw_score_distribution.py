@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Draw score distribution figure
+
+The counter is rebinned to --resolution display buckets before drawing them as
+filled steps. Many result directories are drawn as overlays or as the pages of
+one PDF, optionally next to their DET curves, e.g.
+
+  python draw_score_distribution.py --loadpath results/* --savepath all.pdf --det
+  python draw_score_distribution.py --loadpath a b --overlay --savepath ab.png
+"""
+
+import sys
+import os.path
+import argparse
+import numpy as np
+import time
+import math
+import logging
+import warnings
+import statistics
+
+from .utils.result import load_info, load_counter, load_thresholds, load_det
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+
+DET_TICKS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.4, 0.6, 0.8]
+
+
+def column_scores(ncols, minval, maxval, thresholds=None):
+  """Return the score of every counter column"""
+  if thresholds is not None:
+    return np.asarray(thresholds, dtype=np.float64)
+  return np.arange(ncols) / (ncols-1) * (maxval-minval) + minval
+
+def rebin(counter, scores, xmin, xmax, bins=1000):
+  """Sum the counter columns whose score falls in each of bins buckets between xmin and xmax
+
+  Returns the bucket edges and the percentage of every class in each bucket.
+  """
+  edges = np.linspace(xmin, xmax, bins+1)
+  idxs  = np.floor((scores-xmin) / (xmax-xmin) * bins).astype(np.int64)
+  idxs[scores == xmax] = bins-1
+  keep  = (idxs >= 0) & (idxs < bins)
+  keys  = (np.arange(counter.shape[0])[:,None]*bins + idxs[None,keep]).ravel()
+  hist  = np.bincount(keys, weights=counter[:,keep].ravel(), minlength=counter.shape[0]*bins).reshape(counter.shape[0], bins)
+  with np.errstate(invalid='ignore', divide='ignore'):
+    return edges, 100.0 * hist / np.sum(counter, axis=1, keepdims=True)
+
+def load_distribution(loadpath):
+  """Return the counter, the score of its columns and the result.txt fields used for drawing of a result directory"""
+  info       = {key.lower(): value for key, value in load_info(loadpath).items()}
+  counter    = load_counter(loadpath)
+  thresholds = load_thresholds(loadpath)
+  minval, maxval = float(info.get("minval", -2.0)), float(info.get("maxval", 2.0))
+  if thresholds is None and "resolution" in info:
+    assert counter.shape[1] == int(info["resolution"]) + 1, f"ERROR: resolution does not equal with counter array length in {loadpath}"
+  return {"loadpath": loadpath, "counter": counter, "scores": column_scores(counter.shape[1], minval, maxval, thresholds),
+          "step": 0.0 if thresholds is not None else (maxval-minval) / (counter.shape[1]-1),
+          "threshold": float(info["threshold"]) if "threshold" in info else None,
+          "minscore": float(info.get("minscore", -1.0)), "maxscore": float(info.get("maxscore", 1.0))}
+
+def _probit(values):
+  """Return the standard normal deviate of probabilities, the axis scale of DET curves"""
+  normal = statistics.NormalDist()
+  return np.array([normal.inv_cdf(value) for value in np.clip(values, 1e-6, 1-1e-6)])
+
+def det_points(fpr, fnr, points=2000):
+  """Thin a DET curve to at most points points, keeping its first, last and EER points"""
+  valid = ~(np.isnan(fpr) | np.isnan(fnr))
+  fpr, fnr = fpr[valid], fnr[valid]
+  if fpr.shape[0] == 0:
+    return fpr, fnr
+  idxs = np.unique(np.concatenate([np.linspace(0, fpr.shape[0]-1, min(points, fpr.shape[0])).astype(np.int64),
+                                   [np.argmin(np.abs(fpr-fnr))]]))
+  return fpr[idxs], fnr[idxs]
+
+def draw_distribution(ax, dists, names, args):
+  """Draw the score distribution of every result on ax, filled for a single result and as lines for overlays"""
+  # the column of the lowest score starts up to one bucket below it
+  xmin = args.xmin if args.xmin is not None else min(dist["minscore"] - dist["step"] for dist in dists)
+  xmax = args.xmax if args.xmax is not None else max(dist["maxscore"] for dist in dists)
+  overlay = len(dists) > 1
+  for i, (dist, name) in enumerate(zip(dists, names)):
+    edges, probability = rebin(dist["counter"], dist["scores"], xmin, xmax, bins=args.resolution)
+    if overlay:
+      ax.stairs(probability[0], edges, color=f"C{i}", linestyle="--", linewidth=0.8)
+      ax.stairs(probability[1], edges, color=f"C{i}", linewidth=0.8, label=name)
+    else:
+      ax.stairs(probability[0], edges, fill=True, alpha=0.7, label="bonafide")
+      ax.stairs(probability[1], edges, fill=True, alpha=0.7, label="spoof")
+
+  ax.set_xlim(xmin, xmax)
+  if args.ymax:
+    ax.set_ylim(0, args.ymax)
+  xmin, xmax, ymin, ymax = ax.axis()
+  xunit = (xmax-xmin) / 100
+  yunit = (ymax-ymin) / 100
+
+  for thres in (args.threshold or []):
+    ax.axvline(x=thres, color='black', linestyle='-', linewidth=0.5)
+    ax.text(thres+xunit, yunit*75, f"{thres:.2f}", fontsize=10, color='black')
+  for i, dist in enumerate(dists):
+    if dist["threshold"] is not None:
+      color = f"C{i}" if overlay else "red"
+      ax.axvline(x=dist["threshold"], color=color, linestyle='-', linewidth=1)
+      ax.text(dist["threshold"]+xunit, yunit*(50-5*i), f"{dist['threshold']:.2f}", fontsize=10, color=color)
+
+  ax.tick_params(axis='both', which='major', labelsize=10)
+  ax.set_ylabel("Density (%)", fontsize=12)
+  ax.set_xlabel("Score", fontsize=12)
+  ax.legend(fontsize=8, loc="upper right")
+
+def draw_det(ax, dets, names):
+  """Draw the DET curves of every result on normal deviate axes"""
+  for i, ((fpr, fnr), name) in enumerate(zip(dets, names)):
+    fpr, fnr = det_points(fpr, fnr)
+    ax.plot(_probit(fpr), _probit(fnr), color=f"C{i}", linewidth=1, label=name)
+  ticks = _probit(np.array(DET_TICKS))
+  labels = [f"{tick*100:g}" for tick in DET_TICKS]
+  ax.set_xticks(ticks, labels)
+  ax.set_yticks(ticks, labels)
+  ax.set_xlim(ticks[0], ticks[-1])
+  ax.set_ylim(ticks[0], ticks[-1])
+  ax.plot([ticks[0], ticks[-1]], [ticks[0], ticks[-1]], color="gray", linestyle=":", linewidth=0.5)
+  ax.grid(linewidth=0.3)
+  ax.tick_params(axis='both', which='major', labelsize=8)
+  ax.set_xlabel("False Positive Rate (%)", fontsize=10)
+  ax.set_ylabel("False Negative Rate (%)", fontsize=10)
+  ax.legend(fontsize=8, loc="upper right")
+
+def draw_page(plt, loadpaths, names, args):
+  """Return a figure with the distribution of the results and their DET curves if --det"""
+  dists = [load_distribution(loadpath) for loadpath in loadpaths]
+  if not args.det:
+    fig, ax = plt.subplots(figsize=(8, 4), dpi=80)
+    fig.subplots_adjust(left=0.08, right=0.92, top=0.98 if len(loadpaths) > 1 else 0.92, bottom=0.12)
+    draw_distribution(ax, dists, names, args)
+  else:
+    fig, (ax, detax) = plt.subplots(1, 2, figsize=(12, 4), dpi=80, gridspec_kw={"width_ratios": [2, 1]})
+    fig.subplots_adjust(left=0.06, right=0.97, top=0.92, bottom=0.12, wspace=0.25)
+    draw_distribution(ax, dists, names, args)
+    draw_det(detax, [load_det(loadpath) for loadpath in loadpaths], names)
+  if len(loadpaths) == 1:
+    fig.suptitle(names[0], fontsize=10)
+  return fig
+
+def page_savepaths(savepath, npages):
+  """Return the file of every page, many pages go into one PDF or into numbered files of other formats"""
+  root, ext = os.path.splitext(savepath)
+  if npages == 1 or ext.lower() == ".pdf":
+    return [savepath] * npages
+  return [f"{root}_{i}{ext}" for i in range(npages)]
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Draw score distribution figure")
+  parser.add_argument('--loadpath', type=str, nargs='+', required=True, help="Paths to the EER result directories.")
+  parser.add_argument('--savepath', type=str, required=True, help="Path to the save figure, many pages are saved into one PDF or numbered files.")
+  parser.add_argument('--names', type=str, nargs='+', default=None, help="Legend name of every result, the loadpaths by default.")
+  parser.add_argument('--overlay', action="store_true", help="Draw every result on the same page.")
+  parser.add_argument('--det', action="store_true", help="Also draw the DET curves.")
+  parser.add_argument('--threshold', type=float, action='append', help="The threshold to calculate accuracy")
+  parser.add_argument('--xmin', type=float, default=None, help="Minimum x axis value")
+  parser.add_argument('--xmax', type=float, default=None, help="Maximum x axis value")
+  parser.add_argument('--ymax', type=float, default=None, help="Maximum y axis value")
+  parser.add_argument('--resolution', type=int, default=1000, help="Number of display buckets the counter is rebinned to")
+
+  args       = parser.parse_args(argv)
+  names      = args.names or args.loadpath
+  assert len(names) == len(args.loadpath), "ERROR: --names needs one name per --loadpath"
+  start      = time.time()
+  # slow to import and only needed once the arguments are valid
+  import matplotlib
+  matplotlib.use("Agg")
+  import matplotlib.pyplot as plt
+
+  pages = [(args.loadpath, names)] if args.overlay else [([loadpath], [name]) for loadpath, name in zip(args.loadpath, names)]
+  savepaths = page_savepaths(args.savepath, len(pages))
+  if savepaths[0].lower().endswith(".pdf") and len(pages) > 1:
+    from matplotlib.backends.backend_pdf import PdfPages
+    with PdfPages(args.savepath) as pdf:
+      for loadpaths, pagenames in pages:
+        fig = draw_page(plt, loadpaths, pagenames, args)
+        pdf.savefig(fig)
+        plt.close(fig)
+  else:
+    for (loadpaths, pagenames), savepath in zip(pages, savepaths):
+      fig = draw_page(plt, loadpaths, pagenames, args)
+      fig.savefig(savepath)
+      plt.close(fig)
+  logger.info(f"INFO: Drew {len(args.loadpath)} results on {len(pages)} pages in {time.time()-start:.2f} seconds")
+
+
+if __name__ == "__main__":
+  main()
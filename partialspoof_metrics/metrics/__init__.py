@@ -0,0 +1 @@
+"""Counters, EER and localization metrics"""
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Counters updated batch by batch, e.g. to evaluate EER inside a validation loop
+
+The accumulators hold the (2, resolution+1) counter of _count_samples, so the
+EER and operating points can be read at any time in O(resolution), the state
+of data-parallel workers can be summed, and the result can be saved as a
+regular result directory for calculate_accuracy.py or combine_eer_results.py.
+"""
+
+import numpy as np
+
+from .accuracy import operating_points
+from .eer import _bincount_samples, _counter_eer, _double_counter, _grow_counter
+from .mseer import _gather_segments
+from ..utils.label import SegmentTable
+from ..utils.score import ScoreTable
+from ..utils.table import lengths_to_offsets
+from ..utils.result import result_info, save_result
+
+
+def _flatten_batch(values, lengths=None):
+  """Flatten a batch of numpy arrays or CPU tensors, returns the values and the number of values of every utterance
+
+  values is a 1-D array of utterance scores or labels, a padded (utterances, frames)
+  array whose rows are cut to lengths, or a list of per utterance arrays.
+  """
+  if isinstance(values, (list, tuple)):
+    arrays = [np.asarray(value, dtype=np.float64).ravel() for value in values]
+    lens   = np.array([array.shape[0] for array in arrays], dtype=np.int64)
+    return (np.concatenate(arrays) if len(arrays) > 0 else np.zeros(0)), lens
+  values = np.asarray(values, dtype=np.float64)
+  if lengths is None:
+    return values.ravel(), np.full(values.shape[0], 1 if values.ndim == 1 else values.shape[1], dtype=np.int64)
+  assert values.ndim == 2, "ERROR: lengths needs a padded batch with shape (utterances, frames)"
+  lens = np.asarray(lengths, dtype=np.int64)
+  return values[np.arange(values.shape[1]) < lens[:,None]], lens
+
+def _widen(counter, minval, maxval, width):
+  """Double the range of a counter until it is width wide"""
+  while maxval - minval < width * (1 - 1e-9):
+    counter, minval, maxval = _double_counter(counter, minval, maxval)
+  return counter, minval, maxval
+
+
+class EERAccumulator:
+  """Counter of the labelled scores of utterances or frames added batch by batch
+
+  Parameters:
+  ----------
+  resolution: int, optional
+    Number of threshold buckets
+  minval, maxval: float, optional
+    Threshold range, scores outside of it raise an error unless adaptive
+  adaptive: bool, optional
+    Double the range around its center while scores fall outside of it as
+    compute_adaptive_eer, accumulators starting from the same range can still be merged
+  """
+  kind = "eer"
+
+  def __init__(self, resolution=8000, minval=-2.0, maxval=2.0, adaptive=False):
+    self.resolution = resolution
+    self.adaptive   = adaptive
+    self.minval, self.maxval = minval, maxval
+    self.reset()
+
+  def reset(self):
+    self.counter    = np.zeros((2, self.resolution+1))
+    self.minscore   = np.inf
+    self.maxscore   = -np.inf
+    self.utterances = 0
+
+  def _add(self, lab, sco, utterances, weight=None):
+    self.utterances += utterances
+    if sco.shape[0] == 0:
+      return self
+    minscore, maxscore = float(np.min(sco)), float(np.max(sco))
+    if self.adaptive:
+      self.counter, self.minval, self.maxval = _grow_counter(self.counter, self.minval, self.maxval, minscore, maxscore)
+    _bincount_samples(self.counter, lab, sco, weight=weight, resolution=self.resolution, minval=self.minval, maxval=self.maxval)
+    self.minscore, self.maxscore = min(self.minscore, minscore), max(self.maxscore, maxscore)
+    return self
+
+  def update(self, labels, scores, lengths=None):
+    """Add a batch of utterance scores, or of frame scores as a padded (utterances, frames) array with lengths or a list of arrays
+
+    labels are 0 (bonafide) and 1 (spoof) in the same layout as scores, the scores are of the spoof class.
+    """
+    lab, lablens = _flatten_batch(labels, lengths)
+    sco, scolens = _flatten_batch(scores, lengths)
+    assert np.array_equal(lablens, scolens), "ERROR: the labels and scores of the batch have different lengths"
+    return self._add(lab.astype(np.int64), sco, lablens.shape[0])
+
+  def result(self):
+    """Return the _counter_eer values of the current counter"""
+    return _counter_eer(self.counter, minval=self.minval, maxval=self.maxval)
+
+  def eer(self):
+    """Return the current EER and its threshold"""
+    eer, threshold = self.result()[:2]
+    return float(eer), float(threshold)
+
+  def operating_points(self, queries):
+    """Return the accuracy, precision, recall, F1, FPR and FNR at the (kind, value) queries of metrics.accuracy.operating_points"""
+    return operating_points(self.counter, queries, resolution=self.resolution, minval=self.minval, maxval=self.maxval)
+
+  def state_dict(self):
+    """Return the state as numpy arrays and numbers, which can be pickled, saved with np.savez or summed by merge()"""
+    return {"kind": self.kind, "counter": self.counter.copy(), "resolution": self.resolution, "minval": self.minval, "maxval": self.maxval,
+            "minscore": self.minscore, "maxscore": self.maxscore, "utterances": self.utterances}
+
+  def load_state_dict(self, state):
+    assert str(state["kind"]) == self.kind, f"ERROR: can not load a {state['kind']} state into a {self.kind} accumulator"
+    self.resolution = int(state["resolution"])
+    self.counter    = np.array(state["counter"], dtype=np.float64)
+    self.minval, self.maxval     = float(state["minval"]), float(state["maxval"])
+    self.minscore, self.maxscore = float(state["minscore"]), float(state["maxscore"])
+    self.utterances = int(state["utterances"])
+    return self
+
+  def merge(self, *others):
+    """Add the counters of other accumulators or of their state_dict(), e.g. gathered from data-parallel workers
+
+    Ranges that were grown by adaptive accumulators are widened to the widest one first.
+    """
+    for other in others:
+      state = other.state_dict() if hasattr(other, "state_dict") else other
+      assert str(state["kind"]) == self.kind, f"ERROR: can not merge a {state['kind']} state into a {self.kind} accumulator"
+      assert int(state["resolution"]) == self.resolution, f"ERROR: can not merge resolution {state['resolution']} into {self.resolution}"
+      counter, minval, maxval = np.asarray(state["counter"], dtype=np.float64), float(state["minval"]), float(state["maxval"])
+      width = max(self.maxval - self.minval, maxval - minval)
+      self.counter, self.minval, self.maxval = _widen(self.counter, self.minval, self.maxval, width)
+      counter, minval, maxval = _widen(counter, minval, maxval, width)
+      assert np.isclose(minval, self.minval) and np.isclose(maxval, self.maxval), \
+        f"ERROR: the ranges ({minval},{maxval}) and ({self.minval},{self.maxval}) do not share bucket edges"
+      self.counter    = self.counter + counter
+      self.minscore   = min(self.minscore, float(state["minscore"]))
+      self.maxscore   = max(self.maxscore, float(state["maxscore"]))
+      self.utterances = self.utterances + int(state["utterances"])
+    return self
+
+  def _fields(self, savepath):
+    return {"unit_input": 0.0, "unit_cal": 0.0, "minscore": self.minscore, "maxscore": self.maxscore,
+            "minval": self.minval, "maxval": self.maxval, "negative_class": False, "resolution": self.resolution,
+            "scoreindex": 0, "labpath": "", "scopath": "", "savepath": savepath, "utterances": self.utterances}
+
+  def save(self, savepath, compact=False, classfmt="", **fields):
+    """Save the current result as a result directory, fields override the result.txt fields"""
+    eer, threshold, margin, fpr, fnr, counter = self.result()
+    save_result(savepath, fpr, fnr, counter, result_info(eer, threshold, margin, counter, dict(self._fields(savepath), **fields), classfmt=classfmt),
+                compact=compact)
+
+
+class MSEERAccumulator(EERAccumulator):
+  """Counter of the seconds of bonafide and spoof speech above every threshold for millisecond EER, added batch by batch"""
+  kind = "mseer"
+
+  def update(self, segments, scores, unit, lengths=None):
+    """Add a batch of utterances given by their reference segments and frame scores
+
+    Parameters:
+    ----------
+    segments: list[np.ndarray]
+      [start, end, label] rows in seconds of every utterance, covering the whole utterance
+    scores: np.ndarray or list[np.ndarray]
+      Frame scores as a padded (utterances, frames) array with lengths or a list of arrays,
+      the scores are padded or truncated to the duration of the reference
+    unit: float
+      Frame duration in seconds
+    """
+    segs = [np.asarray(seg, dtype=np.float64).reshape(-1,3) for seg in segments]
+    sco, scolens = _flatten_batch(scores, lengths)
+    assert len(segs) == scolens.shape[0], f"ERROR: the batch has {len(segs)} references but {scolens.shape[0]} score rows"
+    names  = np.arange(len(segs)).astype(str)
+    items  = np.concatenate(segs) if len(segs) > 0 else np.zeros((0,3))
+    labs   = SegmentTable(names, lengths_to_offsets([seg.shape[0] for seg in segs]), items[:,0], items[:,1], items[:,2].astype(np.int8))
+    frames = np.arange(sco.shape[0]) - np.repeat(np.cumsum(scolens) - scolens, scolens)
+    scos   = ScoreTable(names, lengths_to_offsets(scolens), sco, frames, unit=unit)
+    lab, sco, dur = _gather_segments(labs, scos, names.tolist(), validate=False)
+    return self._add(lab, sco, len(segs), weight=dur)
+
+  def _fields(self, savepath):
+    return dict(super()._fields(savepath), unit_cal="millisecond")
+
+  def save(self, savepath, compact=False, classfmt=".04f", **fields):
+    super().save(savepath, compact=compact, classfmt=classfmt, **fields)
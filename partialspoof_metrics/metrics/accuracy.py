@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2024 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Accuracy, precision, recall, F1, FPR and FNR at thresholds and target rates of a counter"""
+
+import numpy as np
+
+
+QUERIES = ["threshold", "recall", "precision", "fpr", "fnr", "eer"]
+
+
+def _index_threshold(index, resolution, minval, maxval, thresholds):
+  if thresholds is not None:
+    return thresholds[index]
+  return index * 1.0 / resolution * (maxval-minval) + minval
+
+def _threshold_index(threshold, resolution, minval, maxval, thresholds):
+  """Return the counter column of a threshold, the scores of that column and below are classed negative"""
+  if thresholds is None:
+    return int((threshold-minval)/(maxval-minval)*resolution)
+  return max(int(np.searchsorted(thresholds, threshold, side='right')) - 1, 0)
+
+def _curves(counter):
+  """Return the accuracy, precision, recall, FPR and FNR of every counter column used as threshold"""
+  data = np.cumsum(counter, axis=1)
+  tn, fn = data[0,:], data[1,:]
+  tp, fp = data[1,-1] - data[1,:], data[0,-1] - data[0, :]
+  total  = data[0,-1]+data[1,-1]
+  accuracy  = (tn+tp)/total
+  # Prevent divide by 0 error
+  tpfp, tpfn = tp+fp, tp+fn
+  tpfp[tpfp==0] = 1
+  tpfn[tpfn==0] = 1
+  with np.errstate(invalid='ignore', divide='ignore'):
+    fpr, fnr = fp/data[0,-1], fn/data[1,-1]
+  return {"accuracy": accuracy, "precision": np.divide(tp, tpfp), "recall": np.divide(tp, tpfn), "fpr": fpr, "fnr": fnr}
+
+def _target_indices(curves, kind, targets):
+  """Return the column meeting every target of a kind, or -1 if none does
+
+  recall: the highest column with recall above the target
+  precision: the lowest column but the first with precision above the target
+  fpr: the lowest column with FPR at most the target
+  fnr: the highest column with FNR at most the target
+  """
+  targets = np.asarray(targets, dtype=np.float64)
+  n = curves["recall"].shape[0]
+  if kind == "recall":
+    # the suffix maximum is above the target exactly up to the last column above it
+    suffix = np.maximum.accumulate(curves["recall"][::-1])
+    return n - 1 - np.searchsorted(suffix, targets, side='right')
+  if kind == "precision":
+    prefix = np.maximum.accumulate(curves["precision"][1:])
+    index  = np.searchsorted(prefix, targets, side='right') + 1
+    return np.where(index < n, index, -1)
+  if kind == "fpr":
+    prefix = np.minimum.accumulate(np.nan_to_num(curves["fpr"], nan=np.inf))
+    index  = np.searchsorted(-prefix, -targets, side='left')
+    return np.where(index < n, index, -1)
+  if kind == "fnr":
+    suffix = np.minimum.accumulate(np.nan_to_num(curves["fnr"], nan=np.inf)[::-1])[::-1]
+    return np.searchsorted(suffix, targets, side='right') - 1
+  assert False, f"ERROR: unknown operating point {kind}, use one of {QUERIES}"
+
+def _f1(precision, recall):
+  with np.errstate(invalid='ignore'):
+    return np.where((precision == 0) & (recall == 0), 0.0, 2*precision*recall / (precision+recall))
+
+def operating_points(counter, queries, resolution=8000, minval=-2.0, maxval=2.0, thresholds=None):
+  """Compute accuracy, precision, recall, F1, FPR and FNR at many operating points of one counter
+
+  Parameters:
+  ----------
+  queries: list[(str, float)]
+    Pairs of a kind in QUERIES and its value, a threshold or a target rate,
+    the value of eer is ignored and the column with the smallest |FPR-FNR| is used
+
+  Returns a list with one dictionary per query, the fields of an unreachable
+  target are NaN and its index is -1.
+  """
+  assert counter.shape[1] == resolution + 1, "ERROR: resolution does not equal with counter array length"
+  curves = _curves(counter)
+  index  = np.full(len(queries), -1, dtype=np.int64)
+  kinds  = np.array([kind for kind, _ in queries], dtype=object)
+  values = np.array([value for _, value in queries], dtype=np.float64)
+  for kind in dict.fromkeys(kinds):
+    mask = kinds == kind
+    if kind == "threshold":
+      index[mask] = [min(max(_threshold_index(value, resolution, minval, maxval, thresholds), 0), resolution) for value in values[mask]]
+    elif kind == "eer":
+      index[mask] = np.argmin(np.abs(curves["fpr"] - curves["fnr"]))
+    else:
+      index[mask] = _target_indices(curves, kind, values[mask])
+
+  valid = index >= 0
+  rows  = {name: np.where(valid, curve[np.maximum(index, 0)], np.nan) for name, curve in curves.items()}
+  rows["f1"] = _f1(rows["precision"], rows["recall"])
+  scores = np.array([_index_threshold(i, resolution, minval, maxval, thresholds) for i in np.maximum(index, 0)], dtype=np.float64)
+  scores = np.where(kinds == "threshold", values, np.where(valid, scores, np.nan))
+  return [dict({"query": kinds[i], "target": values[i], "threshold": scores[i], "index": int(index[i])},
+               **{name: rows[name][i] for name in ["accuracy", "precision", "recall", "f1", "fpr", "fnr"]}) for i in range(len(queries))]
+
+def compute_accuracy(counter, threshold=0.5, resolution=8000, minval=-2.0, maxval=2.0, target_recall=0.0, target_precision=0.0, thresholds=None):
+  """Compute accuracy, precision, recall and F1 at a threshold or at a target recall or precision
+
+  thresholds holds the score of every counter column of an exact result, otherwise
+  the columns are resolution buckets between minval and maxval. An unreachable
+  target falls back to the threshold.
+  Returns the threshold, its bucket index, accuracy, precision, recall and f1
+  """
+  queries = [("threshold", threshold)]
+  if target_recall > 0:
+    queries.insert(0, ("recall", target_recall))
+  elif target_precision > 0:
+    queries.insert(0, ("precision", target_precision))
+  point = next(row for row in operating_points(counter, queries, resolution=resolution, minval=minval, maxval=maxval, thresholds=thresholds) if row["index"] >= 0)
+  return point["threshold"], point["index"], point["accuracy"], point["precision"], point["recall"], point["f1"]
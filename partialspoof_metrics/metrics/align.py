@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Validate that labels and scores cover the same utterances with the same lengths
+
+The utterances are checked as whole arrays and the problems of all of them are
+summarized in one report instead of one warning per utterance.
+"""
+
+import warnings
+import numpy as np
+
+
+def common_names(labs, scos, names=None):
+  """Return the names found in both labs and scos, the names without scores and the names without labels
+
+  names defaults to the keys of labs, every key of scos without a label is then also reported.
+  """
+  candidates = list(labs.keys()) if names is None else list(names)
+  if names is None:
+    inlabs = np.ones(len(candidates), dtype=bool)
+    missing_labels = [name for name in scos.keys() if name not in labs]
+  else:
+    inlabs = np.array([name in labs for name in candidates], dtype=bool)
+    missing_labels = [name for name, found in zip(candidates, inlabs) if not found]
+  inscos = np.array([name in scos for name in candidates], dtype=bool)
+  missing_scores = [name for name, found, ok in zip(candidates, inscos, inlabs) if ok and not found]
+  if len(missing_labels) == 0 and len(missing_scores) == 0:
+    return candidates, [], []
+  return [name for name, keep in zip(candidates, inlabs & inscos) if keep], missing_scores, missing_labels
+
+def alignment_report(names, expected, actual, missing_scores=(), missing_labels=(), measure="frames", unit=0.0, tolerance=0.0, top=5):
+  """Compare the label and score lengths of every utterance in names
+
+  Parameters:
+  ----------
+  expected, actual: np.ndarray
+    Length of the labels and of the scores of every utterance, in frames or seconds
+  measure: str
+    Name of the length unit, frames or seconds
+  unit: float, optional
+    Seconds per frame to report the padded duration, 0 if unknown
+  tolerance: float, optional
+    Length difference that is not reported, e.g. the rounding of float end times
+
+  Utterances without any score are counted as missing scores. Returns the
+  names that have scores and the report dictionary.
+  """
+  expected = np.asarray(expected, dtype=np.float64)
+  actual   = np.nan_to_num(np.asarray(actual, dtype=np.float64))
+  empty    = actual <= 0
+  if np.any(empty):
+    missing_scores = list(missing_scores) + [name for name, drop in zip(names, empty) if drop]
+    names, expected, actual = [name for name, drop in zip(names, empty) if not drop], expected[~empty], actual[~empty]
+  diff  = actual - expected
+  padded, truncated = diff < -tolerance, diff > tolerance
+  worst = np.flatnonzero(padded | truncated)
+  worst = worst[np.argsort(-np.abs(diff[worst]), kind="stable")[:top]]
+  return names, {"utterances": len(names), "missing_scores": list(missing_scores), "missing_labels": list(missing_labels),
+                 "padded": int(np.sum(padded)), "padded_total": float(-np.sum(diff[padded])),
+                 "truncated": int(np.sum(truncated)), "truncated_total": float(np.sum(diff[truncated])),
+                 "measure": measure, "unit": unit if measure == "frames" else 1.0,
+                 "worst": [(names[i], float(expected[i]), float(actual[i])) for i in worst]}
+
+def format_alignment(report, examples=3):
+  """Return the one-line summary of an alignment report, or None if the labels and scores are aligned"""
+  parts = []
+  for key, problem in [("missing_scores", "have no scores"), ("missing_labels", "have no labels")]:
+    if len(report[key]) > 0:
+      parts.append(f"{len(report[key])} utterances {problem} and are skipped, e.g. {', '.join(report[key][:examples])}")
+  for key in ["padded", "truncated"]:
+    if report[key] > 0:
+      total = f"{report[key + '_total']:g} {report['measure']}"
+      if report["measure"] == "frames" and report["unit"] > 0:
+        total += f" ({report[key + '_total']*report['unit']:.2f}s)"
+      parts.append(f"{report[key]} utterances are {key} by {total} in total")
+  if len(report["worst"]) > 0:
+    parts.append("worst label vs score lengths " + ", ".join(f"{name} {expected:g} vs {actual:g}" for name, expected, actual in report["worst"]))
+  if len(parts) == 0:
+    return None
+  return f"WARNING: {report['utterances']} utterances evaluated, " + "; ".join(parts)
+
+def warn_alignment(report):
+  """Emit the alignment report as a single warning if the labels and scores are not aligned"""
+  message = format_alignment(report)
+  if message is not None:
+    warnings.warn(message)
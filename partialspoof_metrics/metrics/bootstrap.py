@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Bootstrap confidence intervals of EER by resampling utterances
+
+The counter of every utterance is stored once as a sparse matrix, a resampled
+counter is then the product of multinomial utterance weights and that matrix.
+"""
+
+import numpy as np
+
+
+def _scipy_sparse():
+  """Return scipy.sparse or None if it is not installed, it is imported on first use because it is slow to import"""
+  try:
+    import scipy.sparse
+  except ImportError:
+    return None
+  return scipy.sparse
+
+def _contributions(lab, sco, uttid, weight=None, resolution=8000, minval=-2.0, maxval=2.0):
+  """Sum the samples of every utterance per counter column, returns the rows, columns and values of the sparse matrix"""
+  idxs = ((sco-minval)/(maxval-minval)*resolution).astype(np.int64)
+  if idxs.shape[0] > 0:
+    assert idxs.min() >= 0 and idxs.max() <= resolution, f"ERROR: score is outside calculating boundary ({minval},{maxval})"
+  ncols = 2*(resolution+1)
+  keys, inverse = np.unique(uttid.astype(np.int64)*ncols + lab.astype(np.int64)*(resolution+1) + idxs, return_inverse=True)
+  vals = np.bincount(inverse, weights=weight, minlength=keys.shape[0])
+  return keys // ncols, keys % ncols, vals
+
+def _resample(rows, cols, vals, weights, ncols):
+  """Return the counters of every row of utterance weights with shape (replicates, ncols)"""
+  sparse = _scipy_sparse()
+  if sparse is not None:
+    matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(weights.shape[1], ncols))
+    return np.asarray((matrix.T @ weights.T.astype(np.float64)).T)
+  nrep   = weights.shape[0]
+  scaled = weights[:, rows] * vals
+  flat   = (np.arange(nrep)[:,None]*ncols + cols).ravel()
+  return np.bincount(flat, weights=scaled.ravel(), minlength=nrep*ncols).reshape(nrep, ncols)
+
+def _batched_eer(counters, minval=-2.0, maxval=2.0):
+  """Return the EER and threshold of counters with shape (replicates, 2, resolution+1)"""
+  data = np.cumsum(counters, axis=2)
+  with np.errstate(invalid='ignore', divide='ignore'):
+    data = np.divide(data, data[:,:,-2:-1])
+  fpr, fnr = 1 - data[:,0,:], data[:,1,:]
+  margin = np.abs(fpr - fnr)
+  idxmin = np.argmin(np.where(np.isnan(margin), np.inf, margin), axis=1)
+  rows   = np.arange(counters.shape[0])
+  eer    = (fpr[rows,idxmin] + fnr[rows,idxmin]) / 2
+  return eer, idxmin / (counters.shape[2]-1) * (maxval-minval) + minval
+
+def bootstrap_eer(lab, sco, uttid, nutts, weight=None, nboot=1000, resolution=8000, minval=-2.0, maxval=2.0, seed=None):
+  """Compute the EER of nboot resamplings of the utterances with replacement
+
+  Parameters:
+  ----------
+  lab, sco, uttid: np.ndarray
+    Label, score and utterance index of every sample
+  nutts: int
+    Number of utterances
+  weight: np.ndarray, optional
+    Weight of every sample, e.g. the duration of millisecond EER
+
+  Returns the EER and the threshold of every replicate
+  """
+  rows, cols, vals = _contributions(lab, sco, uttid, weight=weight, resolution=resolution, minval=minval, maxval=maxval)
+  ncols = 2*(resolution+1)
+  chunk = max(1, (1<<24) // max(ncols, rows.shape[0] if _scipy_sparse() is None else 1))
+  rng   = np.random.default_rng(seed)
+  eers, thresholds = [], []
+  for start in range(0, nboot, chunk):
+    nrep    = min(chunk, nboot-start)
+    weights = rng.multinomial(nutts, np.full(nutts, 1.0/nutts), size=nrep) if nutts > 0 else np.zeros((nrep, 0))
+    counters = _resample(rows, cols, vals, weights, ncols).reshape(nrep, 2, resolution+1)
+    eer, threshold = _batched_eer(counters, minval=minval, maxval=maxval)
+    eers.append(eer)
+    thresholds.append(threshold)
+  return np.concatenate(eers), np.concatenate(thresholds)
+
+def paired_bootstrap_eer(samples, nutts, nboot=1000, resolution=8000, minval=-2.0, maxval=2.0, seed=None):
+  """Compute the EER of many systems on the same nboot resamplings of the utterances
+
+  samples holds the (lab, sco, uttid, weight) of every system, uttid indexing the
+  same nutts utterances. Returns the EERs with shape (systems, nboot), the EERs of
+  the systems in one replicate are paired.
+  """
+  contributions = [_contributions(lab, sco, uttid, weight=weight, resolution=resolution, minval=minval, maxval=maxval)
+                   for lab, sco, uttid, weight in samples]
+  ncols = 2*(resolution+1)
+  nnz   = max([rows.shape[0] for rows, _, _ in contributions] + [1])
+  chunk = max(1, (1<<24) // max(ncols, nnz if _scipy_sparse() is None else 1))
+  rng   = np.random.default_rng(seed)
+  eers  = np.zeros((len(samples), nboot))
+  for start in range(0, nboot, chunk):
+    nrep    = min(chunk, nboot-start)
+    weights = rng.multinomial(nutts, np.full(nutts, 1.0/nutts), size=nrep) if nutts > 0 else np.zeros((nrep, 0))
+    for i, (rows, cols, vals) in enumerate(contributions):
+      counters = _resample(rows, cols, vals, weights, ncols).reshape(nrep, 2, resolution+1)
+      eers[i, start:start+nrep] = _batched_eer(counters, minval=minval, maxval=maxval)[0]
+  return eers
+
+def paired_significance(eers, observed, confidence=0.95):
+  """Compare every pair of systems from their paired bootstrap EERs
+
+  Returns (i, j, difference, ci_low, ci_high, p_value) for every pair i < j,
+  difference is the observed EER of i minus the one of j and p_value is the
+  two-sided bootstrap probability that the difference has the other sign.
+  """
+  pairs = []
+  for i in range(eers.shape[0]):
+    for j in range(i+1, eers.shape[0]):
+      diff = eers[i] - eers[j]
+      low, high = confidence_interval(diff, confidence)
+      pvalue = min(1.0, 2*min(np.mean(diff <= 0), np.mean(diff >= 0)))
+      pairs.append((i, j, observed[i] - observed[j], float(low), float(high), float(pvalue)))
+  return pairs
+
+def confidence_interval(values, confidence=0.95):
+  """Return the percentile interval of bootstrap values"""
+  alpha = (1 - confidence) / 2
+  return np.quantile(values, alpha), np.quantile(values, 1 - alpha)
+
+def bootstrap_fields(eers, confidence=0.95):
+  """Return the result.txt fields of the bootstrap EERs"""
+  low, high = confidence_interval(eers, confidence)
+  return {"bootstrap": eers.shape[0], "confidence": confidence, "eer_ci_low": float(low), "eer_ci_high": float(high),
+          "bootstrap_eers": ",".join(f"{eer:.6f}" for eer in eers)}
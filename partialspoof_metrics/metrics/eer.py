@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2024 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Utility functions to calculate Equal Error Rate"""
+
+import numpy as np
+import warnings
+
+from .parallel import count_parallel
+from .bootstrap import bootstrap_eer
+from .align import common_names, alignment_report, warn_alignment
+from ..utils.counter import _calculate_det_curve, _calculate_eer, _counter_eer, _exact_counter_eer, grouped_counter_eers
+from ..utils.counter import _double_counter, _grow_counter
+
+def _flatten_items(items, names):
+  """Concatenate the arrays of names from a dictionary or a columnar table"""
+  if hasattr(items, "gather"):
+    return items.gather(names)
+  arrays = [np.asarray(items[name]) for name in names]
+  lens   = np.array([item.shape[0] for item in arrays], dtype=np.int64)
+  return np.concatenate(arrays), lens
+
+def _item_lengths(items, names):
+  """Return the number of items of every utterance in names"""
+  if hasattr(items, "lengths"):
+    return items.lengths[np.array([items.index[name] for name in names], dtype=np.int64)]
+  return np.array([len(items[name]) for name in names], dtype=np.int64)
+
+def validate_samples(labs, scos, names=None, unit=0.0):
+  """Find the utterances missing from the labels or the scores and the length mismatches of the others in one pass
+
+  Returns the names found in both and the report of metrics.align.alignment_report.
+  """
+  names, missing_scores, missing_labels = common_names(labs, scos, names)
+  return alignment_report(names, _item_lengths(labs, names), _item_lengths(scos, names),
+                          missing_scores=missing_scores, missing_labels=missing_labels, unit=unit)
+
+def _checked_names(labs, scos, names=None):
+  """Validate labs and scos, warn once about every problem and return the names found in both"""
+  names, report = validate_samples(labs, scos, names)
+  warn_alignment(report)
+  return names
+
+def _gather_samples(labs, scos, names=None, validate=True):
+  """Flatten the labels and scores of every utterance into two aligned arrays
+
+  Scores that are shorter than the labels are padded with their last value and
+  longer ones are truncated. Utterances missing from either side are skipped
+  unless validate is False, which means names were already validated.
+  """
+  if validate:
+    names = _checked_names(labs, scos, names)
+  names = list(labs.keys()) if names is None else names
+  if len(names) == 0:
+    return np.zeros(0, dtype=np.int64), np.zeros(0)
+  lab, lablens = _flatten_items(labs, names)
+  sco, scolens = _flatten_items(scos, names)
+  return lab, _pad_scores(sco, scolens, lablens)
+
+def _pad_scores(sco, scolens, lablens):
+  """Pad the flat scores of every utterance with their last value or truncate them to the label lengths"""
+  sco = sco.astype(np.float64, copy=False)
+  if not np.array_equal(lablens, scolens):
+    labstarts = np.cumsum(lablens) - lablens
+    scostarts = np.cumsum(scolens) - scolens
+    pos  = np.arange(np.sum(lablens)) - np.repeat(labstarts, lablens)
+    pos  = np.minimum(pos, np.repeat(scolens-1, lablens))
+    sco  = sco[np.repeat(scostarts, lablens) + pos]
+  return sco
+
+def _bucket_index(sco, resolution=8000, minval=-2.0, maxval=2.0):
+  """Return the threshold bucket of every score"""
+  sco  = (sco-minval)/(maxval-minval)
+  idxs = (sco*resolution).astype(np.int64)
+  if idxs.shape[0] > 0:
+    assert idxs.min() >= 0 and idxs.max() <= resolution, f"ERROR: score is outside calculating boundary ({minval},{maxval})"
+  return idxs
+
+def _bincount_samples(counter, lab, sco, weight=None, resolution=8000, minval=-2.0, maxval=2.0):
+  idxs = _bucket_index(sco, resolution=resolution, minval=minval, maxval=maxval)
+  for labtype in [0,1]:
+    mask = lab==labtype
+    counter[labtype,:] += np.bincount(idxs[mask], weights=None if weight is None else weight[mask], minlength=resolution+1)
+  return counter
+
+def _count_names(labs, scos, names, resolution=8000, minval=-2.0, maxval=2.0):
+  lab, sco = _gather_samples(labs, scos, names, validate=False)
+  return _bincount_samples(np.zeros((2,resolution+1)), lab, sco, resolution=resolution, minval=minval, maxval=maxval)
+
+def _count_samples(labs, scos, resolution=8000, counter=None, minval=-2.0, maxval=2.0, workers=1, names=None, validate=True):
+  if counter is None:
+    counter = np.zeros((2,resolution+1))
+  assert resolution+1 == counter.shape[1], "ERROR: the length of the preloaded counter and the resolution is not equal"
+  names = _checked_names(labs, scos, names) if validate else (list(labs.keys()) if names is None else names)
+  if workers > 1:
+    partial = count_parallel(_count_names, labs, scos, names, _item_lengths(labs, names), workers,
+                             resolution=resolution, minval=minval, maxval=maxval)
+    if partial is not None:
+      counter += partial
+    return counter
+  lab, sco = _gather_samples(labs, scos, names, validate=False)
+  return _bincount_samples(counter, lab, sco, resolution=resolution, minval=minval, maxval=maxval)
+
+def _score_range(scos):
+  if hasattr(scos, "minscore"):
+    return scos.minscore, scos.maxscore
+  values = [np.atleast_1d(scos[name]) for name in scos.keys()]
+  values = np.concatenate(values) if len(values) > 0 else np.zeros(0)
+  return (np.min(values), np.max(values)) if values.shape[0] > 0 else (np.inf, -np.inf)
+
+def _exact_counter(lab, sco, weight=None):
+  """Sum the weight of both classes at every unique score, which are returned as the thresholds"""
+  if weight is not None:
+    lab, sco, weight = lab[weight > 0], sco[weight > 0], weight[weight > 0]
+  thresholds, inverse = np.unique(sco, return_inverse=True)
+  counter = np.zeros((2,thresholds.shape[0]))
+  for labtype in [0,1]:
+    mask = lab==labtype
+    counter[labtype,:] = np.bincount(inverse[mask], weights=None if weight is None else weight[mask], minlength=thresholds.shape[0])
+  return counter, thresholds
+
+def compute_exact_eer(labs, scos):
+  """Compute EER at every unique score value without threshold buckets
+
+  Returns the same values as compute_eer and the sorted unique scores that
+  are the thresholds of the columns of the counter, fpr and fnr.
+  """
+  lab, sco = _gather_samples(labs, scos)
+  counter, thresholds = _exact_counter(lab, sco)
+  return _exact_counter_eer(counter, thresholds) + (thresholds,)
+
+def compute_eer(labs, scos, resolution=8000, counter=None, minval=-2.0, maxval=2.0, workers=1):
+  """Compute EER using an evenly spacing threshold
+
+  Parameters:
+  ----------
+  labs: dictionary[int] or dictionary[np.narray(int)]
+    Labels [0,1] for the testing utterances
+  scos: dictionary[float], dictionary[np.narray(float)] or ScoreTable
+    Scores (float) of the posstive (1) class
+  resolution: int, optional
+    Number of threshold bucket
+  counter: np.narray with shape (2,resolution), optional
+    Using a preloaded data, use for large evaluation set
+  workers: int, optional
+    Number of processes counting shards of the utterances
+  """
+  counter  = _count_samples(labs, scos, resolution=resolution, counter=counter, minval=minval, maxval=maxval, workers=workers)
+  return _counter_eer(counter, minval=minval, maxval=maxval)
+
+def compute_adaptive_eer(labs, scos, resolution=8000, counter=None, minval=-2.0, maxval=2.0, workers=1):
+  """Compute EER using an evenly spacing threshold whose range grows to cover every score
+
+  minval and maxval are the initial range, which doubles around its center
+  while scores fall outside of it. Returns the same values as compute_eer and
+  the final minval and maxval of the counter.
+  """
+  counter = np.zeros((2,resolution+1)) if counter is None else counter
+  counter, minval, maxval = _grow_counter(counter, minval, maxval, *_score_range(scos))
+  counter = _count_samples(labs, scos, resolution=resolution, counter=counter, minval=minval, maxval=maxval, workers=workers)
+  return _counter_eer(counter, minval=minval, maxval=maxval) + (minval, maxval)
+
+def _group_index(names, groups):
+  """Return the sorted group names and the group index of every utterance, utterances without a group are grouped as unknown"""
+  missing = [name for name in names if name not in groups]
+  if len(missing) > 0:
+    warnings.warn(f"WARNING: {len(missing)} utterances have no group and are grouped as unknown, e.g. {missing[0]}")
+  groupnames, index = np.unique(np.array([str(groups.get(name, "unknown")) for name in names]), return_inverse=True)
+  return list(groupnames), index.astype(np.int64)
+
+def _bincount_groups(counter, lab, sco, group, weight=None, minval=-2.0, maxval=2.0):
+  """Add the samples to a counter with shape (groups, 2, resolution+1) with a single bincount"""
+  resolution = counter.shape[-1] - 1
+  idxs = ((sco-minval)/(maxval-minval)*resolution).astype(np.int64)
+  if idxs.shape[0] > 0:
+    assert idxs.min() >= 0 and idxs.max() <= resolution, f"ERROR: score is outside calculating boundary ({minval},{maxval})"
+  keys = (group*2 + lab.astype(np.int64))*(resolution+1) + idxs
+  counter += np.bincount(keys, weights=weight, minlength=counter.size).reshape(counter.shape)
+  return counter
+
+def compute_grouped_eer(labs, scos, groups, resolution=8000, minval=-2.0, maxval=2.0, adaptive=False, names=None):
+  """Count the samples of every group of utterances in one pass
+
+  Parameters:
+  ----------
+  groups: dictionary[str]
+    Group (attack, subset, ...) of every utterance
+  adaptive: bool, optional
+    Grow the threshold range to cover every score as compute_adaptive_eer
+  names: list[str], optional
+    Utterances already checked by validate_samples, all valid utterances by default
+
+  Returns the group names, the counter with shape (groups, 2, resolution+1),
+  minval and maxval. Use grouped_counter_eers to get the EERs.
+  """
+  names = _checked_names(labs, scos) if names is None else names
+  groupnames, index = _group_index(names, groups)
+  counter = np.zeros((len(groupnames), 2, resolution+1))
+  if adaptive:
+    counter, minval, maxval = _grow_counter(counter, minval, maxval, *_score_range(scos))
+  lab, sco = _gather_samples(labs, scos, names, validate=False)
+  group = np.repeat(index, _item_lengths(labs, names))
+  return groupnames, _bincount_groups(counter, lab, sco, group, minval=minval, maxval=maxval), minval, maxval
+
+def compute_bootstrap_eer(labs, scos, nboot=1000, resolution=8000, minval=-2.0, maxval=2.0, seed=0):
+  """Compute the EER and threshold of nboot resamplings of the utterances with replacement"""
+  names = _checked_names(labs, scos)
+  lab, sco = _gather_samples(labs, scos, names, validate=False)
+  uttid = np.repeat(np.arange(len(names)), _item_lengths(labs, names))
+  return bootstrap_eer(lab, sco, uttid, len(names), nboot=nboot, resolution=resolution, minval=minval, maxval=maxval, seed=seed)
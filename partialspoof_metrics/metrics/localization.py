@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Segment and boundary level localization metrics at every threshold in one pass
+
+Frames whose score bucket is above threshold index i are predicted spoof, as
+for the EER counters. Lowering the threshold below a frame score makes a
+predicted run appear and lowering it below the smaller score of two adjacent
+frames merges their runs, so the number of runs at every threshold is the
+difference of two histograms. Every count below is such a sum of histograms
+over the score buckets: the counts of many shards can be summed and turned
+into curves over all thresholds with suffix sums.
+"""
+
+import numpy as np
+
+from .eer import _gather_samples, _item_lengths, _checked_names
+
+
+def _hist(values, weights=None, resolution=8000):
+  return np.bincount(values, weights=weights, minlength=resolution+1).astype(np.float64)
+
+def _above(hist):
+  """Return the total weight of the values above every threshold index from their histogram"""
+  return np.sum(hist) - np.cumsum(hist)
+
+def _run_bounds(mask, first, last):
+  """Return the first and last frame of every run of True in mask that does not cross an utterance boundary"""
+  prev = np.concatenate([[False], mask[:-1]]) & ~first
+  succ = np.concatenate([mask[1:], [False]]) & ~last
+  return np.flatnonzero(mask & ~prev), np.flatnonzero(mask & ~succ)
+
+def _window_extrema(x, centers, ustart, uend, lo, hi):
+  """Return the minimum and maximum of x over the frames centers+lo to centers+hi clipped to their utterance"""
+  wmin, wmax = x[centers].copy(), x[centers].copy()
+  for offset in range(lo, hi+1):
+    frames = np.clip(centers+offset, ustart[centers], uend[centers]-1)
+    wmin, wmax = np.minimum(wmin, x[frames]), np.maximum(wmax, x[frames])
+  return wmin, wmax
+
+def _iou_steps(x, lab, uttid, resolution):
+  """Histogram of the steps of the IoU of every utterance with spoof frames as the threshold goes down
+
+  The IoU of an utterance only changes at the scores of its frames, the step at
+  score v is added to every threshold below v.
+  """
+  nspoof = np.bincount(uttid, weights=lab, minlength=uttid[-1]+1 if uttid.shape[0] > 0 else 0)
+  keep   = nspoof[uttid] > 0
+  x, lab, uttid = x[keep], lab[keep], uttid[keep]
+  if x.shape[0] == 0:
+    return np.zeros(resolution+1), 0
+  order = np.lexsort((-x, uttid))
+  x, lab, uttid = x[order], lab[order], uttid[order]
+  start = np.flatnonzero(np.concatenate([[True], uttid[1:] != uttid[:-1]]))
+  lens  = np.diff(np.append(start, x.shape[0]))
+  spoof = np.cumsum(lab) - np.repeat(np.cumsum(lab)[start] - lab[start], lens)
+  bona  = np.cumsum(1-lab) - np.repeat(np.cumsum(1-lab)[start] - (1-lab)[start], lens)
+  final = np.flatnonzero(np.concatenate([(x[1:] != x[:-1]) | (uttid[1:] != uttid[:-1]), [True]]))
+  iou   = spoof[final] / (nspoof[uttid[final]] + bona[final])
+  newutt = np.concatenate([[True], uttid[final][1:] != uttid[final][:-1]])
+  steps = iou - np.where(newutt, 0.0, np.concatenate([[0.0], iou[:-1]]))
+  return _hist(x[final], weights=steps, resolution=resolution), start.shape[0]
+
+def count_events(lab, sco, lens, resolution=8000, minval=-2.0, maxval=2.0, tolerance=1):
+  """Count the segment, boundary and IoU statistics of flat frame labels and scores
+
+  Parameters:
+  ----------
+  lab, sco: np.ndarray
+    Label (0 bonafide, 1 spoof) and score of every frame, utterance after utterance
+  lens: np.ndarray
+    Number of frames of every utterance
+  tolerance: int, optional
+    Frames between a predicted and a reference boundary that still match
+
+  Returns a dictionary of histograms over the score buckets and totals, the
+  counts of several calls can be summed key by key before localization_curves.
+  """
+  x = ((sco-minval)/(maxval-minval)*resolution).astype(np.int64)
+  if x.shape[0] > 0:
+    assert x.min() >= 0 and x.max() <= resolution, f"ERROR: score is outside calculating boundary ({minval},{maxval})"
+  lab   = lab.astype(bool)
+  lens  = np.asarray(lens, dtype=np.int64)
+  ends  = np.cumsum(lens)
+  first = np.zeros(x.shape[0], dtype=bool)
+  last  = np.zeros(x.shape[0], dtype=bool)
+  first[(ends-lens)[lens > 0]] = True
+  last[ends[lens > 0]-1] = True
+  ustart, uend = np.repeat(ends-lens, lens), np.repeat(ends, lens)
+  same = ~first[1:]
+  pmin, pmax = np.minimum(x[:-1], x[1:]), np.maximum(x[:-1], x[1:])
+  hist = lambda values, weights=None: _hist(values, weights, resolution)
+
+  # Reference spoof segments are detected once the threshold is below their highest score
+  segfirst, _ = _run_bounds(lab, first, last)
+  spoofidx = np.flatnonzero(lab)
+  segmax = np.maximum.reduceat(x[spoofidx], np.searchsorted(spoofidx, segfirst)) if segfirst.shape[0] > 0 else np.zeros(0, dtype=np.int64)
+
+  # Predicted runs inside a bonafide region that do not reach a spoof frame on either side
+  bonfirst, bonlast = _run_bounds(~lab, first, last)
+  bonidx = np.flatnonzero(~lab)
+  bonmin = np.minimum.reduceat(x[bonidx], np.searchsorted(bonidx, bonfirst)) if bonfirst.shape[0] > 0 else np.zeros(0, dtype=np.int64)
+  left, right = ~first[bonfirst], ~last[bonlast]
+  xleft, xright = x[np.maximum(bonfirst-1, 0)], x[np.minimum(bonlast+1, x.shape[0]-1)]
+  pure = hist(x[~lab]) - hist(pmin[same & ~lab[:-1] & ~lab[1:]]) \
+         - hist(np.minimum(x[bonfirst], xleft)[left]) - hist(np.minimum(x[bonlast], xright)[right]) \
+         + hist(np.minimum(bonmin, np.minimum(xleft, xright))[left & right])
+
+  # A window of frames holds a predicted boundary when the threshold is between its lowest and highest score
+  refpairs = np.flatnonzero(same & (lab[:-1] != lab[1:]))
+  wmin, wmax = _window_extrema(x, refpairs, ustart, uend, -tolerance, tolerance+1)
+  near = np.zeros(same.shape[0], dtype=bool)
+  for offset in range(-tolerance, tolerance+1):
+    pairs = refpairs + offset
+    valid = (pairs >= ustart[refpairs]) & (pairs+1 < uend[refpairs])
+    near[pairs[valid]] = True
+
+  uttid = np.repeat(np.arange(lens.shape[0]), lens)
+  iousteps, iouutts = _iou_steps(x, lab.astype(np.int64), uttid, resolution)
+  return {"frames": hist(x), "pairs": hist(pmin[same]), "pure": pure,
+          "segments": float(segfirst.shape[0]), "detected": hist(segmax),
+          "boundaries": float(refpairs.shape[0]), "detected_boundaries": hist(wmax) - hist(wmin),
+          "predicted_boundaries": hist(pmax[same]) - hist(pmin[same]),
+          "near_boundaries": hist(pmax[same & near]) - hist(pmin[same & near]),
+          "spoof_frames": float(np.sum(lab)), "spoof": hist(x[lab]), "bonafide": hist(x[~lab]),
+          "iou_steps": iousteps, "iou_utterances": float(iouutts)}
+
+def compute_localization(labs, scos, resolution=8000, minval=-2.0, maxval=2.0, tolerance=1, names=None):
+  """Count the localization statistics of frame labels and scores, see count_events
+
+  names are the utterances already checked by validate_samples, every valid utterance by default.
+  """
+  names = _checked_names(labs, scos) if names is None else names
+  lab, sco = _gather_samples(labs, scos, names, validate=False)
+  return count_events(lab, sco, _item_lengths(labs, names), resolution=resolution, minval=minval, maxval=maxval, tolerance=tolerance)
+
+def merge_counts(*counts):
+  """Sum the count_events dictionaries of several shards"""
+  return {key: sum(count[key] for count in counts) for key in counts[0]}
+
+def _f1(precision, recall):
+  with np.errstate(invalid='ignore', divide='ignore'):
+    return 2 * precision * recall / (precision + recall)
+
+def localization_curves(counts, minval=-2.0, maxval=2.0):
+  """Return the threshold of every counter column and the localization curves over them
+
+  segment_precision is the share of predicted spoof runs that overlap a reference
+  spoof segment, segment_recall the share of reference segments overlapped by a
+  predicted run, boundary_precision and boundary_recall match boundaries within
+  the tolerance, iou pools the frames of all utterances and mean_iou averages
+  the IoU of the utterances with spoof frames.
+  """
+  resolution = counts["frames"].shape[0] - 1
+  predicted  = _above(counts["frames"]) - _above(counts["pairs"])
+  with np.errstate(invalid='ignore', divide='ignore'):
+    curves = {"threshold": np.arange(resolution+1) / resolution * (maxval-minval) + minval,
+              "predicted_segments": predicted,
+              "segment_precision": (predicted - _above(counts["pure"])) / predicted,
+              "segment_recall": _above(counts["detected"]) / counts["segments"],
+              "predicted_boundaries": _above(counts["predicted_boundaries"]),
+              "boundary_precision": _above(counts["near_boundaries"]) / _above(counts["predicted_boundaries"]),
+              "boundary_recall": _above(counts["detected_boundaries"]) / counts["boundaries"],
+              "iou": _above(counts["spoof"]) / (counts["spoof_frames"] + _above(counts["bonafide"])),
+              "mean_iou": _above(counts["iou_steps"]) / counts["iou_utterances"]}
+  curves["segment_f1"]  = _f1(curves["segment_precision"], curves["segment_recall"])
+  curves["boundary_f1"] = _f1(curves["boundary_precision"], curves["boundary_recall"])
+  return curves
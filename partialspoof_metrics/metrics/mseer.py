@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Utility functions to calculate Millisecond Equal Error Rate"""
+
+import numpy as np
+
+from .eer import _counter_eer, _bincount_samples, _item_lengths, _exact_counter, _exact_counter_eer, _grow_counter, _group_index, _bincount_groups
+from .parallel import count_parallel
+from .bootstrap import bootstrap_eer
+from .align import common_names, alignment_report, warn_alignment
+
+def _flatten_segments(segs, names):
+  """Concatenate the [start, end, value] items of every utterance into flat arrays"""
+  if hasattr(segs, "frames"): # frame-level ScoreTable
+    idx, lens = segs.select(names)
+    uttids    = np.repeat(np.arange(len(names)), lens)
+    return (segs.frames[idx]+1)*segs.unit, segs.scores[idx].astype(np.float64), uttids, lens
+  if hasattr(segs, "ends"): # SegmentTable
+    idx, lens = segs.select(names)
+    uttids    = np.repeat(np.arange(len(names)), lens)
+    return segs.ends[idx], segs.labels[idx].astype(np.float64), uttids, lens
+  items  = [np.asarray(segs[name], dtype=np.float64).reshape(-1,3) for name in names]
+  lens   = np.array([item.shape[0] for item in items], dtype=np.int64)
+  items  = np.concatenate(items) if len(items) > 0 else np.zeros((0,3))
+  uttids = np.repeat(np.arange(len(names)), lens)
+  return items[:,1], items[:,2], uttids, lens
+
+def _last_ends(segs, names):
+  """Return the end time of the last item of every utterance in names, nan if it has none"""
+  if hasattr(segs, "offsets"):
+    rows = np.array([segs.index[name] for name in names], dtype=np.int64)
+    last = segs.offsets[1:][rows] - 1
+    ends = np.full(len(names), np.nan)
+    has  = last >= segs.offsets[:-1][rows]
+    ends[has] = (segs.frames[last[has]]+1)*segs.unit if hasattr(segs, "frames") else segs.ends[last[has]]
+    return ends
+  items = [np.asarray(segs[name], dtype=np.float64).reshape(-1,3) for name in names]
+  return np.array([item[-1,1] if item.shape[0] > 0 else np.nan for item in items])
+
+def validate_segments(labs, scos, names=None, tolerance=1e-6):
+  """Find the utterances missing from the labels or the scores and the duration mismatches of the others in one pass
+
+  Returns the names found in both and the report of metrics.align.alignment_report,
+  durations closer than tolerance seconds are not reported.
+  """
+  names, missing_scores, missing_labels = common_names(labs, scos, names)
+  return alignment_report(names, np.nan_to_num(_last_ends(labs, names)), _last_ends(scos, names), missing_scores=missing_scores,
+                          missing_labels=missing_labels, measure="seconds", tolerance=tolerance)
+
+def _checked_names(labs, scos, names=None):
+  """Validate labs and scos, warn once about every problem and return the names found in both"""
+  names, report = validate_segments(labs, scos, names)
+  warn_alignment(report)
+  return names
+
+def _segment_layout(labs, names, hypend, hyputtids, hyplens):
+  """Split every utterance at the union of the reference and hypothesis boundaries without reading the scores
+
+  hypend, hyputtids and hyplens are the _flatten_segments values of the hypothesis.
+  Returns the label, the duration and the utterance index of each elementary
+  segment and the index of its hypothesis item in hypend, so the layout is shared
+  by every score file with the same hypothesis boundaries.
+  """
+  refend, reflab, refuttids, reflens = _flatten_segments(labs, names)
+  reflab = reflab.astype(np.int64)
+
+  dur = np.zeros(len(names))
+  dur[reflens > 0] = refend[np.cumsum(reflens)[reflens > 0] - 1]
+
+  # Truncate and stretch the hypothesis to the reference duration
+  keep   = hypend <= dur[hyputtids]
+  nkeep  = np.maximum(np.bincount(hyputtids[keep], minlength=len(names)), np.minimum(hyplens, 1))
+  starts = np.cumsum(hyplens) - hyplens
+  pos    = np.arange(hypend.shape[0]) - np.repeat(starts, hyplens)
+  hypend = hypend.copy()
+  hypend[(starts + nkeep - 1)[nkeep > 0]] = dur[nkeep > 0]
+  keep   = pos < nkeep[hyputtids]
+  hyporig = np.flatnonzero(keep)
+  hypend, hyputtids = hypend[keep], hyputtids[keep]
+
+  # Merge boundaries sorted by utterance then time, the segment ending at a
+  # boundary belongs to the first reference and hypothesis items ending at or after it
+  times  = np.concatenate([refend, hypend])
+  uttids = np.concatenate([refuttids, hyputtids])
+  isref  = np.concatenate([np.ones(refend.shape[0], dtype=np.int64), np.zeros(hypend.shape[0], dtype=np.int64)])
+  order  = np.lexsort((times, uttids))
+  times, uttids, isref = times[order], uttids[order], isref[order]
+  if times.shape[0] == 0:
+    return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+  first  = np.ones(times.shape[0], dtype=bool)
+  first[1:] = (times[1:] != times[:-1]) | (uttids[1:] != uttids[:-1])
+  refidx = (np.cumsum(isref) - isref)[first]
+  hypidx = (np.cumsum(1-isref) - (1-isref))[first]
+  times, uttids = times[first], uttids[first]
+
+  prev   = np.zeros(times.shape[0])
+  prev[1:] = np.where(uttids[1:] == uttids[:-1], times[:-1], 0.0)
+  valid  = (refidx < refend.shape[0]) & (hypidx < hypend.shape[0])
+  valid[valid] &= (refuttids[refidx[valid]] == uttids[valid]) & (hyputtids[hypidx[valid]] == uttids[valid])
+  return reflab[refidx[valid]], (times-prev)[valid], uttids[valid], hyporig[hypidx[valid]]
+
+def _gather_segments(labs, scos, names=None, return_uttids=False, validate=True):
+  """Split every utterance at the union of the reference and hypothesis boundaries
+
+  Returns the label, the score and the duration of each elementary segment, and
+  the index of its utterance in names if return_uttids.
+  Both the reference and the hypothesis are described by the end times of their
+  segments, a segment starting where the previous one ends. Utterances missing
+  from either side are skipped unless validate is False, which means names were
+  already validated.
+  """
+  if validate:
+    names = _checked_names(labs, scos, names)
+  names = list(labs.keys()) if names is None else names
+  hypend, hypsco, hyputtids, hyplens = _flatten_segments(scos, names)
+  lab, dur, uttids, index = _segment_layout(labs, names, hypend, hyputtids, hyplens)
+  if return_uttids:
+    return lab, hypsco[index], dur, uttids
+  return lab, hypsco[index], dur
+
+def _count_names(labs, scos, names, resolution=8000, minval=-2.0, maxval=2.0):
+  lab, sco, dur = _gather_segments(labs, scos, names, validate=False)
+  return _bincount_samples(np.zeros((2,resolution+1)), lab, sco, weight=dur, resolution=resolution, minval=minval, maxval=maxval)
+
+def _count_samples(labs, scos, resolution=8000, counter=None, minval=-2.0, maxval=2.0, workers=1, names=None, validate=True):
+  if counter is None:
+    counter = np.zeros((2,resolution+1))
+  assert resolution+1 == counter.shape[1], "ERROR: the length of the preloaded counter and the resolution is not equal"
+  names = _checked_names(labs, scos, names) if validate else (list(labs.keys()) if names is None else names)
+  if workers > 1:
+    partial = count_parallel(_count_names, labs, scos, names, _item_lengths(scos, names), workers,
+                             resolution=resolution, minval=minval, maxval=maxval)
+    if partial is not None:
+      counter += partial
+    return counter
+  lab, sco, dur = _gather_segments(labs, scos, names, validate=False)
+  return _bincount_samples(counter, lab, sco, weight=dur, resolution=resolution, minval=minval, maxval=maxval)
+
+def compute_mseer(labs, scos, resolution=8000, counter=None, minval=-2.0, maxval=2.0, workers=1):
+  counter  = _count_samples(labs, scos, resolution=resolution, counter=counter, minval=minval, maxval=maxval, workers=workers)
+  return _counter_eer(counter, minval=minval, maxval=maxval)
+
+
+def _segment_range(scos):
+  if hasattr(scos, "minscore"):
+    return scos.minscore, scos.maxscore
+  values = [np.asarray(scos[name])[:,2] for name in scos.keys() if len(scos[name]) > 0]
+  values = np.concatenate(values) if len(values) > 0 else np.zeros(0)
+  return (np.min(values), np.max(values)) if values.shape[0] > 0 else (np.inf, -np.inf)
+
+def compute_adaptive_mseer(labs, scos, resolution=8000, counter=None, minval=-2.0, maxval=2.0, workers=1):
+  """Compute millisecond EER with a threshold range that grows to cover every score, also returns the final range"""
+  counter = np.zeros((2,resolution+1)) if counter is None else counter
+  counter, minval, maxval = _grow_counter(counter, minval, maxval, *_segment_range(scos))
+  counter = _count_samples(labs, scos, resolution=resolution, counter=counter, minval=minval, maxval=maxval, workers=workers)
+  return _counter_eer(counter, minval=minval, maxval=maxval) + (minval, maxval)
+
+def compute_exact_mseer(labs, scos):
+  """Compute millisecond EER at every unique score value weighted by duration without threshold buckets"""
+  lab, sco, dur = _gather_segments(labs, scos)
+  counter, thresholds = _exact_counter(lab, sco, weight=dur)
+  return _exact_counter_eer(counter, thresholds) + (thresholds,)
+
+def compute_bootstrap_mseer(labs, scos, nboot=1000, resolution=8000, minval=-2.0, maxval=2.0, seed=0):
+  """Compute the millisecond EER and threshold of nboot resamplings of the utterances with replacement"""
+  names = _checked_names(labs, scos)
+  lab, sco, dur, uttid = _gather_segments(labs, scos, names, return_uttids=True, validate=False)
+  return bootstrap_eer(lab, sco, uttid, len(names), weight=dur, nboot=nboot, resolution=resolution, minval=minval, maxval=maxval, seed=seed)
+
+def compute_grouped_mseer(labs, scos, groups, resolution=8000, minval=-2.0, maxval=2.0, adaptive=False, names=None):
+  """Count the segments of every group of utterances weighted by duration in one pass, see compute_grouped_eer"""
+  names = _checked_names(labs, scos) if names is None else names
+  groupnames, index = _group_index(names, groups)
+  counter = np.zeros((len(groupnames), 2, resolution+1))
+  if adaptive:
+    counter, minval, maxval = _grow_counter(counter, minval, maxval, *_segment_range(scos))
+  lab, sco, dur, uttid = _gather_segments(labs, scos, names, return_uttids=True, validate=False)
+  return groupnames, _bincount_groups(counter, lab, sco, index[uttid], weight=dur, minval=minval, maxval=maxval), minval, maxval
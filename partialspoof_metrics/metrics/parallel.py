@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Utility functions to count samples of many utterances with a process pool"""
+
+import numpy as np
+
+_shared = None
+
+
+def _init_worker(shared):
+  global _shared
+  _shared = shared
+
+def _count_shard(shard):
+  count_fn, labs, scos, names, kwargs = _shared
+  return count_fn(labs, scos, names[shard[0]:shard[1]], **kwargs)
+
+def split_shards(weights, nshards):
+  """Split utterances into contiguous (start, end) ranges of about equal total weight"""
+  if weights.shape[0] == 0:
+    return []
+  bounds = np.searchsorted(np.cumsum(weights), np.linspace(0, np.sum(weights), nshards+1)[1:-1], side='right')
+  bounds = np.unique(np.concatenate([[0], bounds, [weights.shape[0]]]))
+  return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+def count_parallel(count_fn, labs, scos, names, weights, workers, **kwargs):
+  """Sum the counters that count_fn(labs, scos, names, **kwargs) returns for shards of names
+
+  The labels and scores are inherited by forked workers, or sent once to each
+  worker on platforms without fork, instead of being sent with every shard.
+  """
+  import multiprocessing # only imported when counting with several workers
+  shards  = split_shards(np.asarray(weights, dtype=np.float64), workers*4)
+  methods = multiprocessing.get_all_start_methods()
+  context = multiprocessing.get_context("fork" if "fork" in methods else None)
+  counter = None
+  with context.Pool(workers, initializer=_init_worker, initargs=((count_fn, labs, scos, names, kwargs),)) as pool:
+    for partial in pool.imap(_count_shard, shards):
+      counter = partial if counter is None else counter + partial
+  return counter
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Evaluate many systems or checkpoints against the same labels in one pass
+
+The labels, or for millisecond EER the merged boundary layout, are flattened
+once and the scores of every system are counted into one counter with shape
+(systems, 2, resolution+1). The samples keep their utterance index so the
+systems can be compared by paired bootstrap resampling of the utterances.
+"""
+
+import warnings
+import numpy as np
+
+from . import eer, mseer
+from .eer import _flatten_items, _pad_scores, _bucket_index, _grow_counter, _counter_eer
+from .mseer import _flatten_segments, _segment_layout
+from .align import format_alignment
+
+
+def shared_names(labs, systems, sysnames, segments=False, unit=0.0):
+  """Validate every system against the labels, warn once per system and return the utterances found in all of them"""
+  validate = mseer.validate_segments if segments else (lambda labs, scos: eer.validate_samples(labs, scos, unit=unit))
+  shared, scored = None, set()
+  for scos, sysname in zip(systems, sysnames):
+    names, report = validate(labs, scos)
+    message = format_alignment(report)
+    if message is not None:
+      warnings.warn(f"{message} ({sysname})")
+    found  = set(names)
+    shared = names if shared is None else [name for name in shared if name in found]
+    scored |= found
+  shared = shared or []
+  if len(scored) > len(shared):
+    warnings.warn(f"WARNING: {len(scored)-len(shared)} utterances are not scored by every system and are skipped for all of them")
+  return shared
+
+def system_samples(labs, systems, names):
+  """Return the (lab, sco, uttid, weight) of every system, the labels are flattened once and shared"""
+  lab, lablens = _flatten_items(labs, names)
+  uttid = np.repeat(np.arange(len(names)), lablens)
+  samples = []
+  for scos in systems:
+    sco, scolens = _flatten_items(scos, names)
+    samples.append((lab, _pad_scores(sco, scolens, lablens), uttid, None))
+  return samples
+
+def system_segments(labs, systems, names):
+  """Return the (lab, sco, uttid, weight) elementary segments of every system for millisecond EER
+
+  The merged boundary layout only depends on the frame boundaries, it is computed
+  once and shared by the systems whose scores have the same frames. Also returns
+  the number of layouts that were computed.
+  """
+  layouts, samples = [], []
+  for scos in systems:
+    hypend, hypsco, hyputtids, hyplens = _flatten_segments(scos, names)
+    for ends, lens, layout in layouts:
+      if np.array_equal(lens, hyplens) and np.array_equal(ends, hypend):
+        break
+    else:
+      layout = _segment_layout(labs, names, hypend, hyputtids, hyplens)
+      layouts.append((hypend, hyplens, layout))
+    lab, dur, uttid, index = layout
+    samples.append((lab, hypsco[index], uttid, dur))
+  return samples, len(layouts)
+
+def count_systems(samples, resolution=8000, minval=-2.0, maxval=2.0, adaptive=False):
+  """Count the samples of every system into a counter with shape (systems, 2, resolution+1)
+
+  Every sample is offset to the flat column of its system and label so the
+  whole counter is filled by a single bincount. With adaptive, the range grows
+  to cover the scores of every system so all systems share the same threshold
+  buckets. Returns the counter, minval and maxval.
+  """
+  shape = (len(samples), 2, resolution+1)
+  if adaptive:
+    scores = [sco for _, sco, _, _ in samples if sco.shape[0] > 0]
+    if len(scores) > 0:
+      _, minval, maxval = _grow_counter(np.zeros(shape), minval, maxval, min(np.min(sco) for sco in scores), max(np.max(sco) for sco in scores))
+  idxs = [_bucket_index(sco, resolution=resolution, minval=minval, maxval=maxval) + (2*i + lab.astype(np.int64)) * shape[2]
+          for i, (lab, sco, _, _) in enumerate(samples)]
+  weights = None
+  if any(weight is not None for _, _, _, weight in samples):
+    weights = np.concatenate([np.ones(sco.shape[0]) if weight is None else weight for _, sco, _, weight in samples])
+  counter = np.bincount(np.concatenate(idxs), weights=weights, minlength=np.prod(shape)).astype(np.float64).reshape(shape)
+  return counter, minval, maxval
+
+def system_eers(counter, minval=-2.0, maxval=2.0):
+  """Return the _counter_eer values of every system counter"""
+  with np.errstate(invalid='ignore', divide='ignore'):
+    return [_counter_eer(system, minval=minval, maxval=maxval) for system in counter]
+
+def rank_systems(results):
+  """Return the system indices sorted by EER, the lowest first"""
+  return sorted(range(len(results)), key=lambda i: (np.nan_to_num(results[i][0], nan=np.inf), i))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Serve EER and Millisecond EER of score files keeping the LlamaPartialSpoof labels in memory
+
+Send a POST request with a JSON body to /eer or /mseer over localhost HTTP or
+a Unix socket, e.g.
+
+  curl -s localhost:8000/eer -d '{"scopath": "scores.txt", "unit": 0.02, "scoreindex": 3}'
+
+The body holds the score file path (scopath) or its content (scores) and the
+options of calculate_eer.py or calculate_mseer.py. GET /status lists the loaded labels.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import logging
+import tempfile
+import threading
+import socketserver
+import concurrent.futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import calculate_eer
+from . import calculate_mseer
+from .utils.label import load_partialspoof_labels, load_partialspoof_timestamp
+from .utils.score import load_score_table, zoom_scores
+
+logger = logging.getLogger(__name__)
+#logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+
+DEFAULTS = {"eer":   {"resolution": 10000, "scoreindex": 1, "unit": 0.0, "zoom": 1, "pooling": "max", "sensitivity": 0.0},
+            "mseer": {"resolution": 100000, "scoreindex": 1, "unit": 0.0}}
+COMMON   = {"scopath": None, "savepath": None, "negative_class": False, "minval": -2.0, "maxval": 2.0,
+            "exact": False, "adaptive": False, "compact": False, "workers": 1, "bootstrap": 0, "confidence": 0.95, "seed": 0}
+
+
+def option_types(default):
+  """Return the JSON types accepted for an option from its default value"""
+  if default is None or isinstance(default, str):
+    return (str,)
+  if isinstance(default, bool):
+    return (bool,)
+  return (int,) if isinstance(default, int) else (int, float)
+
+def check_options(request, options):
+  """Assert that every option of a request has the type of its default, so a bad request is answered with 400"""
+  for key, value in request.items():
+    types = (str,) if key == "scores" else option_types(options[key])
+    valid = isinstance(value, types) and (bool in types or not isinstance(value, bool))
+    assert valid or (value is None and key == "savepath"), f"ERROR: option {key} must be {' or '.join(t.__name__ for t in types)}, got {json.dumps(value)}"
+  assert request.get("resolution", 1) > 0 and request.get("workers", 1) > 0, "ERROR: resolution and workers must be positive"
+  assert request.get("bootstrap", 0) >= 0 and 0 < request.get("confidence", 0.5) < 1, "ERROR: bootstrap must not be negative and confidence must be in (0, 1)"
+  assert request.get("unit", 0) >= 0 and request.get("minval", -2.0) < request.get("maxval", 2.0), "ERROR: unit must not be negative and minval must be lower than maxval"
+
+
+class Evaluator:
+  """Labels of one label file rasterized once per unit and shared by every request"""
+  def __init__(self, labpath, sensitivity=0.0, cachedir=None):
+    self.labpath     = labpath
+    self.sensitivity = sensitivity
+    self.cachedir    = cachedir
+    self.labels      = {}
+    self.timestamps  = None
+    self.lock        = threading.Lock()
+
+  def frame_labels(self, unit):
+    with self.lock:
+      if unit not in self.labels:
+        self.labels[unit] = load_partialspoof_labels(self.labpath, unit=unit, sensitivity=self.sensitivity, cachedir=self.cachedir)
+        logger.info(f"INFO: Loaded {len(self.labels[unit])} labels with UNIT={unit}")
+      return self.labels[unit]
+
+  def segments(self):
+    with self.lock:
+      if self.timestamps is None:
+        self.timestamps = load_partialspoof_timestamp(self.labpath, cachedir=self.cachedir)
+      return self.timestamps
+
+  def status(self):
+    with self.lock:
+      return {"labpath": self.labpath, "units": sorted(self.labels), "timestamps": self.timestamps is not None}
+
+  def evaluate(self, kind, request):
+    assert kind in DEFAULTS, f"ERROR: unknown metric {kind}, use eer or mseer"
+    unknown = set(request) - set(DEFAULTS[kind]) - set(COMMON) - {"scores"}
+    assert len(unknown) == 0, f"ERROR: unknown options {sorted(unknown)}"
+    assert ("scopath" in request) != ("scores" in request), "ERROR: send either scopath or scores"
+    options = dict(COMMON, **DEFAULTS[kind])
+    check_options(request, options)
+    options.update({key: value for key, value in request.items() if key != "scores"})
+    args = argparse.Namespace(labpath=self.labpath, **options)
+    assert not (args.exact and args.adaptive), "ERROR: exact and adaptive can not be used together"
+    assert not (args.exact and args.bootstrap > 0), "ERROR: bootstrap can not be used with exact"
+    if kind == "eer":
+      assert args.sensitivity == self.sensitivity, f"ERROR: the labels were loaded with sensitivity {self.sensitivity}"
+
+    scos = self.load_scores(kind, args, request.get("scores"))
+    assert args.exact or args.adaptive or (scos.minscore > args.minval and scos.maxscore < args.maxval), f"ERROR: score ({scos.minscore},{scos.maxscore}) is outside calculating boundary ({args.minval},{args.maxval})"
+    if kind == "eer":
+      unit   = calculate_eer.zoom_unit(args.unit, args.zoom)
+      labs   = self.frame_labels(unit)
+      zoomed = zoom_scores(scos, args.zoom, args.pooling)
+      names  = calculate_eer.validate(labs, zoomed, unit)
+      result = calculate_eer.evaluate(labs, zoomed, args, names=names)
+      extra  = calculate_eer.bootstrap(labs, zoomed, result, args)
+      if args.savepath is not None:
+        calculate_eer.save(args.savepath, result, len(names), args, args.zoom, scos.minscore, scos.maxscore, extra)
+    else:
+      labs   = self.segments()
+      names  = calculate_mseer.validate(labs, scos)
+      result = calculate_mseer.evaluate(labs, scos, args, names=names)
+      extra  = calculate_mseer.bootstrap(labs, scos, result, args)
+      if args.savepath is not None:
+        calculate_mseer.save(args.savepath, result, len(names), args, scos.minscore, scos.maxscore, extra)
+    # the labels are resident for every request, report the utterances this request actually scored
+    eer, threshold, margin = result[:3]
+    reply = {"eer": float(eer), "threshold": float(threshold), "margin": float(margin),
+             "minscore": float(scos.minscore), "maxscore": float(scos.maxscore), "utterances": len(names), "savepath": args.savepath}
+    reply.update({key: value for key, value in extra.items() if key != "bootstrap_eers"})
+    # an undefined EER, e.g. when only one class is scored, is sent as null to keep the reply valid JSON
+    return {key: (None if isinstance(value, float) and not math.isfinite(value) else value) for key, value in reply.items()}
+
+  def load_scores(self, kind, args, payload):
+    """Load the scores of scopath or of the payload, a missing or malformed score file is a bad request"""
+    frameindex = 1 if kind == "mseer" else None
+    if payload is None:
+      assert os.path.isfile(args.scopath), f"ERROR: score file {args.scopath} does not exist"
+      return self.parse_scores(args.scopath, args, frameindex)
+    with tempfile.NamedTemporaryFile("w", suffix=".score") as f:
+      f.write(payload)
+      f.flush()
+      args.scopath = "<payload>"
+      return self.parse_scores(f.name, args, frameindex)
+
+  def parse_scores(self, path, args, frameindex):
+    try:
+      return load_score_table(path, scoreindex=args.scoreindex, frameindex=frameindex, unit=args.unit, negative_class=args.negative_class)
+    except (IndexError, ValueError, UnicodeDecodeError) as e:
+      raise AssertionError(f"ERROR: can not parse the scores of {args.scopath}: {e}") from e
+
+
+class Handler(BaseHTTPRequestHandler):
+  def do_GET(self):
+    if self.path.rstrip("/") != "/status":
+      return self.reply(404, {"error": f"ERROR: unknown path {self.path}"})
+    self.reply(200, self.server.evaluator.status())
+
+  def do_POST(self):
+    kind = self.path.strip("/")
+    try:
+      request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+      assert isinstance(request, dict), "ERROR: the request body must be a JSON object"
+    except (AssertionError, ValueError) as e:
+      return self.reply(400, {"error": f"ERROR: invalid request body: {e}" if isinstance(e, ValueError) else str(e)})
+    try:
+      start  = time.time()
+      result = self.server.pool.submit(self.server.evaluator.evaluate, kind, request).result()
+      logger.info(f"INFO: {kind} of {request.get('scopath', '<payload>')} took {time.time()-start:.2f} seconds")
+    except AssertionError as e:
+      # the request is validated with assertions, anything else is a fault of the server
+      return self.reply(400, {"error": str(e)})
+    except Exception as e:
+      # any other failure of the evaluation still gets a JSON answer instead of a dropped connection
+      logger.exception(f"ERROR: {kind} request failed")
+      return self.reply(500, {"error": f"ERROR: {type(e).__name__}: {e}"})
+    self.reply(200, result)
+
+  def reply(self, code, body):
+    data = json.dumps(body, allow_nan=False).encode()
+    self.send_response(code)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+
+  def address_string(self):
+    return str(self.client_address[0]) if self.client_address else "unix"
+
+  def log_message(self, format, *args):
+    logger.debug(format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+  daemon_threads = True
+
+  def get_request(self):
+    request, _ = super().get_request()
+    return request, ("unix", 0)
+
+
+def main(argv=None, prog=None):
+  parser = argparse.ArgumentParser(prog=prog, description="Serve EER and Millisecond EER keeping the labels in memory")
+  parser.add_argument('--labpath', type=str, required=True, help="Path to Llama Partial Spoof label file.")
+  parser.add_argument('--units', type=float, nargs='*', default=[0.0], help="Units to rasterize the labels at on start up, others are loaded on demand.")
+  parser.add_argument('--mseer', action="store_true", help="Load the timestamps for Millisecond EER on start up.")
+  parser.add_argument('--sensitivity', type=float, default=0.0, help="Sensitivity to extract real/fake label.")
+  parser.add_argument('--cachedir', type=str, default=None, help="Directory to cache the parsed labels.")
+  parser.add_argument('--host', type=str, default="127.0.0.1", help="Address to listen on.")
+  parser.add_argument('--port', type=int, default=8000, help="Port to listen on.")
+  parser.add_argument('--socket', type=str, default=None, help="Path to a Unix socket to listen on instead of HTTP.")
+  parser.add_argument('--pool', type=int, default=4, help="Number of requests evaluated concurrently.")
+  args = parser.parse_args(argv)
+
+  evaluator = Evaluator(args.labpath, sensitivity=args.sensitivity, cachedir=args.cachedir)
+  for unit in args.units:
+    evaluator.frame_labels(unit)
+  if args.mseer:
+    evaluator.segments()
+
+  if args.socket is not None:
+    if os.path.exists(args.socket):
+      os.remove(args.socket)
+    server = UnixHTTPServer(args.socket, Handler)
+  else:
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+  server.evaluator = evaluator
+  server.pool      = concurrent.futures.ThreadPoolExecutor(args.pool)
+  logger.info(f"INFO: Serving {args.labpath} on {args.socket or f'{args.host}:{args.port}'}")
+  print(f"Serving on {args.socket or f'http://{args.host}:{args.port}'}")
+  sys.stdout.flush()
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    server.pool.shutdown()
+
+if __name__ == "__main__":
+  main()
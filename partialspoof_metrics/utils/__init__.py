@@ -0,0 +1 @@
+"""Label, score, cache and result files"""
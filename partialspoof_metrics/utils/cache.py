@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""On-disk cache of preprocessed arrays and computed results"""
+
+import os
+import glob
+import json
+import struct
+import hashlib
+import warnings
+import numpy as np
+
+CACHE_VERSION = 1
+
+
+def file_digest(filepath, blocksize=1<<20):
+  """Return the sha1 hex digest of the content of a file"""
+  h = hashlib.sha1()
+  with open(filepath, 'rb') as f:
+    for block in iter(lambda: f.read(blocksize), b''):
+      h.update(block)
+  return h.hexdigest()
+
+def cache_key(*parts):
+  """Return a hex key for the cache version and the repr of every part"""
+  h = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+  for part in parts:
+    h.update(b"\0" + repr(part).encode())
+  return h.hexdigest()
+
+def save_npz(filepath, **arrays):
+  """Save arrays into an uncompressed npz file, atomically replacing filepath"""
+  try:
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    tmppath = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmppath, 'wb') as f:
+      np.savez(f, **arrays)
+    os.replace(tmppath, filepath)
+  except OSError as e:
+    warnings.warn(f"WARNING: failed to write cache {filepath}: {e}")
+
+def _read_member(f, info):
+  f.seek(info.header_offset)
+  header = f.read(30)
+  namelen, extralen = struct.unpack('<HH', header[26:30])
+  f.seek(info.header_offset + 30 + namelen + extralen)
+  version = np.lib.format.read_magic(f)
+  if version == (1, 0):
+    shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+  elif version == (2, 0):
+    shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+  else:
+    return None
+  return shape, fortran, dtype, f.tell()
+
+def load_npz(filepath, mmap=True):
+  """Load all arrays of an npz file, memory-mapping the uncompressed members
+
+  Returns None if the file does not exist or cannot be read.
+  """
+  if not os.path.isfile(filepath):
+    return None
+  import zipfile # imported on first use to keep the start up of the command line tools short
+  try:
+    if not mmap:
+      with np.load(filepath, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+    arrays = {}
+    with zipfile.ZipFile(filepath) as zf, open(filepath, 'rb') as f:
+      for info in zf.infolist():
+        header = _read_member(f, info) if info.compress_type == zipfile.ZIP_STORED else None
+        if header is None or header[2].hasobject:
+          return load_npz(filepath, mmap=False)
+        shape, fortran, dtype, offset = header
+        key = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+        if int(np.prod(shape)) == 0:
+          arrays[key] = np.empty(shape, dtype=dtype)
+        else:
+          arrays[key] = np.memmap(filepath, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran else 'C')
+    return arrays
+  except (OSError, ValueError, zipfile.BadZipFile) as e:
+    warnings.warn(f"WARNING: failed to read cache {filepath}: {e}")
+    return None
+
+
+class ResultCache:
+  """Size-bounded LRU store of computed results keyed by the content of their inputs
+
+  Every entry is an npz file of arrays and a JSON meta field, reading an entry
+  refreshes its modification time and the least recently used entries are
+  removed when the total size exceeds maxsize bytes. The number of hits, misses
+  and the computing time saved are kept in stats.json.
+  """
+  def __init__(self, cachedir, maxsize=1<<30):
+    self.cachedir = cachedir
+    self.maxsize  = maxsize
+    self.session  = {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+
+  def key(self, kind, filepaths, params):
+    """Return the key of a result computed from the content of filepaths with params"""
+    return cache_key(kind, [file_digest(filepath) for filepath in filepaths], sorted(params.items()))
+
+  def get(self, key):
+    """Return the arrays and meta of an entry or None"""
+    entrypath = os.path.join(self.cachedir, f"{key}.npz")
+    arrays = load_npz(entrypath, mmap=False)
+    if arrays is None:
+      self._record(hit=False)
+      return None
+    meta = json.loads(str(arrays.pop("meta")))
+    try:
+      os.utime(entrypath)
+    except OSError:
+      pass
+    self._record(hit=True, seconds=meta.get("seconds", 0.0))
+    return arrays, meta
+
+  def put(self, key, meta, seconds=0.0, **arrays):
+    """Store arrays and a JSON serializable meta, seconds is the time it took to compute them"""
+    save_npz(os.path.join(self.cachedir, f"{key}.npz"), meta=np.array(json.dumps(dict(meta, seconds=seconds))), **arrays)
+    self._evict()
+
+  def _evict(self):
+    entries = []
+    for entrypath in glob.glob(os.path.join(self.cachedir, "*.npz")):
+      try:
+        stat = os.stat(entrypath)
+      except OSError:
+        continue
+      entries.append((stat.st_mtime, stat.st_size, entrypath))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for _, size, entrypath in entries[:-1]:
+      if total <= self.maxsize:
+        break
+      try:
+        os.remove(entrypath)
+        total = total - size
+      except OSError:
+        pass
+
+  def _record(self, hit, seconds=0.0):
+    self.session["hits" if hit else "misses"] += 1
+    self.session["saved_seconds"] += seconds
+    stats = self.stats()
+    stats["hits" if hit else "misses"] += 1
+    stats["saved_seconds"] += seconds
+    try:
+      os.makedirs(self.cachedir, exist_ok=True)
+      tmppath = os.path.join(self.cachedir, f"stats.json.{os.getpid()}.tmp")
+      with open(tmppath, "w") as f:
+        json.dump(stats, f)
+      os.replace(tmppath, os.path.join(self.cachedir, "stats.json"))
+    except OSError as e:
+      warnings.warn(f"WARNING: failed to write cache statistics: {e}")
+
+  def stats(self):
+    """Return the hits, misses and saved seconds of every run sharing the cache directory"""
+    try:
+      with open(os.path.join(self.cachedir, "stats.json"), "r") as f:
+        return json.load(f)
+    except (OSError, ValueError):
+      return {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+
+  def report(self):
+    stats = self.stats()
+    return (f"result_cache hits={self.session['hits']} misses={self.session['misses']} saved={self.session['saved_seconds']:.2f}s "
+            f"total_hits={stats['hits']} total_misses={stats['misses']} total_saved={stats['saved_seconds']:.2f}s")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Counter helpers shared by the metrics and by the streaming and result I/O"""
+
+import numpy as np
+
+
+def _calculate_det_curve(counter):
+  data = np.cumsum(counter, axis=1)
+  data = np.divide(data, data[:,-2:-1])
+  fpr = 1 - data[0,:]
+  fnr = data[1,:]
+  return fpr, fnr
+
+def _calculate_eer(fpr, fnr):
+  margin = np.abs(fpr - fnr)
+  idxmin = np.argmin(margin)
+  eer       = (fpr[idxmin]+fnr[idxmin])/2
+  threshold = idxmin / (margin.shape[0]-1)
+  return eer, threshold, margin[idxmin]
+
+def _counter_eer(counter, minval=-2.0, maxval=2.0):
+  fpr, fnr = _calculate_det_curve(counter)
+  eer, threshold, margin = _calculate_eer(fpr,fnr)
+  threshold = threshold * (maxval-minval) + minval
+  return eer, threshold, margin, fpr, fnr, counter
+
+def _double_counter(counter, minval, maxval):
+  """Double the range of a counter around its center by merging every pair of buckets along its last axis"""
+  resolution = counter.shape[-1] - 1
+  assert resolution % 4 == 0, "ERROR: the resolution must be divisible by 4 to grow the counter range"
+  center, width = (minval+maxval)/2, maxval-minval
+  grown = np.zeros_like(counter)
+  grown[...,resolution//4:resolution*3//4] = counter[...,:resolution].reshape(counter.shape[:-1] + (resolution//2, 2)).sum(axis=-1)
+  grown[...,resolution*3//4] += counter[...,resolution]
+  return grown, center-width, center+width
+
+def _grow_counter(counter, minval, maxval, minscore, maxscore):
+  """Double the range of a counter until it covers the scores between minscore and maxscore
+
+  The buckets keep their edges when the range grows, so counters that started
+  from the same range can always be aligned and summed.
+  """
+  if minscore > maxscore:
+    return counter, minval, maxval
+  assert np.isfinite(minscore) and np.isfinite(maxscore), f"ERROR: score ({minscore},{maxscore}) is not finite"
+  while minscore <= minval or maxscore >= maxval:
+    counter, minval, maxval = _double_counter(counter, minval, maxval)
+  return counter, minval, maxval
+
+def _exact_counter_eer(counter, thresholds):
+  """EER of a counter over sorted thresholds where scores equal to a threshold are negative"""
+  data = np.cumsum(counter, axis=1)
+  data = np.divide(data, data[:,-1:])
+  fpr, fnr = 1 - data[0,:], data[1,:]
+  margin = np.abs(fpr - fnr)
+  idxmin = np.argmin(margin)
+  eer    = (fpr[idxmin]+fnr[idxmin])/2
+  return eer, thresholds[idxmin], margin[idxmin], fpr, fnr, counter
+
+def grouped_counter_eers(counters, minval=-2.0, maxval=2.0, exclude=False):
+  """Compute the EER of every group counter with shape (groups, 2, resolution+1)
+
+  Returns a list with the EER, threshold and margin of every group, the
+  _counter_eer values of the pooled counter and, if exclude, the EER,
+  threshold and margin of the pooled counter without each group.
+  """
+  pooled = np.sum(counters, axis=0)
+  with np.errstate(invalid='ignore', divide='ignore'):
+    groups   = [_counter_eer(counter, minval=minval, maxval=maxval)[:3] for counter in counters]
+    excluded = [_counter_eer(pooled-counter, minval=minval, maxval=maxval)[:3] for counter in counters] if exclude else None
+  return groups, _counter_eer(pooled, minval=minval, maxval=maxval), excluded
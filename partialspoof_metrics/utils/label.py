@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+import os
+import functools
+import numpy as np
+
+from .table import FlatTable, lengths_to_offsets
+from .cache import cache_key, file_digest, load_npz, save_npz
+
+def intersect(a, b):
+  return max(0, min(a[1], b[1]) - max(a[0], b[0]))
+
+def items_to_segs(items, tag_filter=None, labdict=None):
+  segs = []
+  for item in items:
+    args = item.split('-')
+    assert args[2] in ["spoof","bonafide"], f"ERROR: Unknown label type {args[2]}"
+    if args[2] == tag_filter or tag_filter is None:
+      start, end = float(args[0]), float(args[1])
+      label = labdict[args[2]] if labdict else args[2]
+      segs.append([ start, end, label])
+  return segs
+
+class LabelTable(FlatTable):
+  """Frame labels of many utterances stored as one flat int8 array"""
+  @property
+  def labels(self):
+    return self.values
+
+
+class SegmentTable(FlatTable):
+  """Timestamp segments of many utterances stored as flat start, end and label arrays"""
+  def __init__(self, names, offsets, starts, ends, labels):
+    super().__init__(names, offsets, labels)
+    self.starts = starts
+    self.ends   = ends
+
+  @property
+  def labels(self):
+    return self.values
+
+  def __getitem__(self, name):
+    i, j = self.offsets[self.index[name]], self.offsets[self.index[name]+1]
+    return np.stack([self.starts[i:j], self.ends[i:j], self.labels[i:j]], axis=1)
+
+
+def _grouped_searchsorted(a, v, side='left', agroups=None, vgroups=None):
+  """np.searchsorted of v into a where both are sorted by (group, value) and the
+  result is the global index of the match inside the same group"""
+  if agroups is None:
+    return np.searchsorted(a, v, side=side)
+  # Queries sort before equal items of a for side='left' and after them for side='right'
+  tie    = np.concatenate([np.full(a.shape[0], side == 'left'), np.full(v.shape[0], side != 'left')])
+  isa    = np.concatenate([np.ones(a.shape[0], dtype=np.int64), np.zeros(v.shape[0], dtype=np.int64)])
+  order  = np.lexsort((tie, np.concatenate([a, v]), np.concatenate([agroups, vgroups])))
+  before = np.cumsum(isa[order]) - isa[order]
+  result = np.empty(v.shape[0], dtype=np.int64)
+  result[order[isa[order] == 0] - a.shape[0]] = before[isa[order] == 0]
+  return result
+
+def _rasterize(segstarts, segends, nframes, unit=0.02, sensitivity=0.0, seguttids=None):
+  """Label frames of one or many utterances as spoof (1) if the proportion of their
+  duration covered by the spoof segments is higher than sensitivity"""
+  nframes = np.atleast_1d(nframes)
+  total   = int(np.sum(nframes))
+  edges   = np.cumsum(np.full(int(np.max(nframes, initial=0)), unit))
+  uttids  = np.repeat(np.arange(nframes.shape[0]), nframes)
+  pos     = np.arange(total) - np.repeat(np.cumsum(nframes) - nframes, nframes)
+  ends    = edges[pos]
+  starts  = np.where(pos > 0, edges[np.maximum(pos-1, 0)], 0.0)
+
+  # Every frame overlaps the segments ending after its start and starting before its end
+  groups = None if seguttids is None else uttids
+  lo     = _grouped_searchsorted(segends, starts, 'right', seguttids, groups)
+  hi     = _grouped_searchsorted(segstarts, ends, 'left', seguttids, groups)
+  npairs = np.maximum(hi - lo, 0)
+  frames = np.repeat(np.arange(total), npairs)
+  segs   = np.arange(frames.shape[0]) - np.repeat(np.cumsum(npairs) - npairs, npairs) + lo[frames]
+  area   = np.minimum(ends[frames], segends[segs]) - np.maximum(starts[frames], segstarts[segs])
+  area   = np.bincount(frames, weights=area, minlength=total)
+  return (area/unit > sensitivity).astype(np.int8)
+
+def segs_to_lab(fakesegs, dur, unit=0.02, sensitivity=0.0):
+  n = int(dur / unit + 0.5)
+  segstarts = np.array([seg[0] for seg in fakesegs], dtype=np.float64)
+  segends   = np.array([seg[1] for seg in fakesegs], dtype=np.float64)
+  return _rasterize(segstarts, segends, n, unit=unit, sensitivity=sensitivity)
+
+def _parse_partialspoof(filepath):
+  """Parse a PartialSpoof label file into flat utterance and segment arrays
+
+  The parsed arrays are shared by later calls in the same process until the file changes.
+  """
+  stat = os.stat(filepath)
+  return _parse_partialspoof_file(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=4)
+def _parse_partialspoof_file(filepath, mtime, size):
+  names, durs, tags, items, nsegs = [], [], [], [], []
+  with open(filepath, 'r') as f:
+    for line in f:
+      args = line.strip().split()
+      names.append(args[0])
+      durs.append(float(args[1]))
+      tags.append(args[2])
+      items.extend(args[3:])
+      nsegs.append(len(args)-3)
+  tokens = " ".join(items).replace("-", " ").split()
+  segtags = np.array(tokens[2::3], dtype=str)
+  unknown = set(tags).union(segtags.tolist()) - {"spoof", "bonafide"}
+  assert len(unknown) == 0, f"ERROR: Unknown label type {unknown}"
+  return {"names":     np.array(names, dtype=str),
+          "durs":      np.array(durs, dtype=np.float64),
+          "labels":    (np.array(tags, dtype=str) == "spoof").astype(np.int8),
+          "offsets":   lengths_to_offsets(nsegs),
+          "segstarts": np.array(tokens[0::3], dtype=np.float64),
+          "segends":   np.array(tokens[1::3], dtype=np.float64),
+          "seglabels": (segtags == "spoof").astype(np.int8)}
+
+def _load_cached(filepath, cachedir, kind, build, *params):
+  """Load arrays from the cache in cachedir or build and store them"""
+  if cachedir is None:
+    return build()
+  cachepath = os.path.join(cachedir, f"{kind}_{cache_key(file_digest(filepath), kind, *params)}.npz")
+  arrays = load_npz(cachepath)
+  if arrays is None:
+    arrays = build()
+    save_npz(cachepath, **arrays)
+  return arrays
+
+def load_partialspoof_labels(filepath, unit=0.0, sensitivity=0.0, cachedir=None):
+  """Load utterance (unit=0.0) or frame labels from a PartialSpoof label file into a LabelTable
+
+  If cachedir is given the labels are stored there as an npz file keyed by the
+  content of the label file, unit and sensitivity and later calls memory-map it.
+  """
+  def build():
+    data = _parse_partialspoof(filepath)
+    if unit == 0.0: # utterance-based
+      return {"names": data["names"], "offsets": np.arange(data["names"].shape[0]+1), "labels": data["labels"]}
+    # segment-based
+    spoof   = data["seglabels"] == 1
+    uttids  = np.repeat(np.arange(data["names"].shape[0]), np.diff(data["offsets"]))
+    nframes = (data["durs"] / unit + 0.5).astype(np.int64)
+    labels  = _rasterize(data["segstarts"][spoof], data["segends"][spoof], nframes,
+                         unit=unit, sensitivity=sensitivity, seguttids=uttids[spoof])
+    return {"names": data["names"], "offsets": lengths_to_offsets(nframes), "labels": labels}
+  arrays = _load_cached(filepath, cachedir, "labels", build, float(unit), float(sensitivity))
+  return LabelTable(arrays["names"], arrays["offsets"], arrays["labels"])
+
+def load_partialspoof_timestamp(filepath, cachedir=None):
+  """Load the bonafide (0) and spoof (1) segments from a PartialSpoof label file into a SegmentTable"""
+  def build():
+    data = _parse_partialspoof(filepath)
+    return {"names": data["names"], "offsets": data["offsets"],
+            "starts": data["segstarts"], "ends": data["segends"], "labels": data["seglabels"]}
+  arrays = _load_cached(filepath, cachedir, "timestamp", build)
+  return SegmentTable(arrays["names"], arrays["offsets"], arrays["starts"], arrays["ends"], arrays["labels"])
+
+def load_groups(filepath, index=1):
+  """Load the group of every utterance from column index of a metadata or label file whose first column is the utterance name"""
+  groups = {}
+  with open(filepath, 'r') as f:
+    for line in f:
+      args = line.strip().split()
+      if len(args) == 0:
+        continue
+      assert len(args) > index, f"ERROR: {args[0]} has no column {index} in {filepath}"
+      groups[args[0]] = args[index]
+  return groups
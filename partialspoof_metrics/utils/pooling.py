@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Segmented pooling of flat score arrays of many utterances"""
+
+import numpy as np
+
+from .table import lengths_to_offsets
+
+POOLINGS = "max, min, mean, top<k> (mean of the k highest scores) or p<q> (q-th percentile)"
+
+
+def parse_pooling(pooling):
+  """Split a pooling name into its mode and parameter"""
+  if pooling in ["max", "min", "mean"]:
+    return pooling, None
+  if pooling.startswith("top") and pooling[3:].isdigit() and int(pooling[3:]) > 0:
+    return "top", int(pooling[3:])
+  if pooling.startswith("p"):
+    try:
+      q = float(pooling[1:])
+    except ValueError:
+      q = -1.0
+    if 0.0 <= q <= 100.0:
+      return "p", q
+  assert False, f"ERROR: unknown pooling {pooling}, use {POOLINGS}"
+
+def _windows(offsets, zoom):
+  """Return the start, end and size of the windows of -zoom scores, or one window per utterance if zoom=0"""
+  lens   = np.diff(offsets)
+  size   = np.maximum(lens, 1) if zoom == 0 else np.full_like(lens, -zoom)
+  ngroup = -(-lens // size)
+  size   = np.repeat(size, ngroup)
+  pos    = np.arange(np.sum(ngroup)) - np.repeat(np.cumsum(ngroup) - ngroup, ngroup)
+  starts = np.repeat(offsets[:-1], ngroup) + pos * size
+  ends   = np.minimum(starts + size, np.repeat(offsets[1:], ngroup))
+  return starts, ends, size, ngroup
+
+def _padded(scores, starts, ends, size):
+  """Gather every window padded to its size with its last score, returns the scores and their window ids"""
+  wins = np.repeat(np.arange(starts.shape[0]), size)
+  pos  = np.arange(wins.shape[0]) - np.repeat(np.cumsum(size) - size, size)
+  return scores[starts[wins] + np.minimum(pos, (ends-starts-1)[wins])], wins, pos
+
+def pool_scores(scores, offsets, zoom, poolings=("max",)):
+  """Zoom the flat scores of utterances, utterance i has scores[offsets[i]:offsets[i+1]]
+
+  Parameters:
+  ----------
+  zoom: int
+    Repeat each score zoom times if zoom>1, pool every -zoom scores if zoom<-1
+    or the whole utterance if zoom=0, the last partial window is padded with its last score
+  poolings: list[str]
+    Pooling of every window, see POOLINGS
+
+  Returns the pooled scores of every pooling and their offsets
+  """
+  if zoom > 1:
+    return [np.repeat(scores, zoom)]*len(poolings), offsets*zoom
+  if zoom in [-1, 1]:
+    return [scores]*len(poolings), offsets
+  starts, ends, size, ngroup = _windows(offsets, zoom)
+  if starts.shape[0] == 0:
+    return [scores[:0]]*len(poolings), lengths_to_offsets(ngroup)
+
+  padded, ordered, results = None, None, []
+  for pooling in poolings:
+    mode, param = parse_pooling(pooling)
+    if mode == "max":
+      results.append(np.maximum.reduceat(scores, starts))
+      continue
+    if mode == "min":
+      results.append(np.minimum.reduceat(scores, starts))
+      continue
+    if padded is None:
+      padded, wins, pos = _padded(scores, starts, ends, size)
+    if mode == "mean":
+      results.append(np.add.reduceat(padded, np.cumsum(size) - size) / size)
+      continue
+    if ordered is None:
+      ordered = padded[np.lexsort((padded, wins))]
+    if mode == "top":
+      keep = pos >= size[wins] - param
+      results.append(np.bincount(wins[keep], weights=ordered[keep], minlength=starts.shape[0]) / np.minimum(size, param))
+    else:
+      rank = param / 100 * (size - 1)
+      lo   = np.floor(rank).astype(np.int64)
+      hi   = np.minimum(lo + 1, size - 1)
+      base = np.cumsum(size) - size
+      results.append(ordered[base+lo] + (ordered[base+hi] - ordered[base+lo]) * (rank - lo))
+  return results, lengths_to_offsets(ngroup)
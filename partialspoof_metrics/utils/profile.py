@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Wall time, CPU time, peak RSS and item counts of the stages of a run"""
+
+import sys
+import json
+import time
+import cProfile
+import contextlib
+
+try:
+  import resource
+except ImportError: # not available on Windows
+  resource = None
+
+
+def peak_rss():
+  """Return the peak resident set size of the process in MB or None if unknown"""
+  if resource is None:
+    return None
+  maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return maxrss / (1<<20) if sys.platform == "darwin" else maxrss / (1<<10)
+
+
+class Profiler:
+  """Records every stage as a dictionary of its wall and CPU seconds, the peak RSS
+  after it and its item count and throughput
+
+  If cprofile is a path, the stages marked hot are run under one cProfile whose
+  stats are dumped there by dump().
+  """
+  def __init__(self, cprofile=None):
+    self.stages   = []
+    self.cprofile = cprofile
+    self.hot      = cProfile.Profile() if cprofile is not None else None
+
+  @contextlib.contextmanager
+  def stage(self, name, items=None, unit="items", hot=False, **tags):
+    """Time the body of a with statement, the yielded record can be given the items once they are known"""
+    record = dict({"stage": name}, **tags)
+    record.update({"items": items, "unit": unit})
+    if hot and self.hot is not None:
+      self.hot.enable()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+      yield record
+    finally:
+      record["wall"] = time.perf_counter() - wall
+      record["cpu"]  = time.process_time() - cpu
+      if hot and self.hot is not None:
+        self.hot.disable()
+      record["peak_rss_mb"] = peak_rss()
+      if record["items"] is not None:
+        record["items"] = float(record["items"])
+        record["throughput"] = record["items"] / record["wall"] if record["wall"] > 0 else None
+      self.stages.append(record)
+
+  def report(self):
+    lines = []
+    for record in self.stages:
+      tags  = " ".join(f"{key}={value}" for key, value in record.items() if key not in ["stage", "items", "unit", "wall", "cpu", "peak_rss_mb", "throughput"])
+      line  = f"profile stage={record['stage']}{' ' + tags if tags else ''} wall={record['wall']:.4f}s cpu={record['cpu']:.4f}s"
+      line += "" if record["peak_rss_mb"] is None else f" peak_rss={record['peak_rss_mb']:.1f}MB"
+      line += "" if record["items"] is None else f" {record['unit']}={record['items']:g}"
+      line += "" if record.get("throughput") is None else f" {record['unit']}/s={record['throughput']:.1f}"
+      lines.append(line)
+    return "\n".join(lines)
+
+  def save(self, savepath, **fields):
+    """Write profile.json into savepath with the stages and the totals"""
+    with open(f"{savepath}/profile.json", "w") as f:
+      json.dump(dict(fields, stages=self.stages, wall=sum(record["wall"] for record in self.stages),
+                     cpu=sum(record["cpu"] for record in self.stages), peak_rss_mb=peak_rss()), f, indent=1)
+
+  def dump(self):
+    """Dump the cProfile stats of the hot stages, they can be read with pstats or snakeviz"""
+    if self.hot is not None:
+      self.hot.dump_stats(self.cprofile)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Reading and writing EER result directories"""
+
+import os
+import json
+import numpy as np
+
+from .counter import grouped_counter_eers, _calculate_det_curve, _exact_counter_eer
+
+
+def result_info(eer, threshold, margin, counter, fields, classfmt=""):
+  """Return the result.txt fields: eer, threshold and margin, then fields and the class totals"""
+  countersum = np.sum(counter, axis=1)
+  info = {"eer": eer, "threshold": threshold, "margin": margin}
+  info.update(fields)
+  info["class_0"]     = format(countersum[0], classfmt)
+  info["class_1"]     = format(countersum[1], classfmt)
+  info["class_total"] = format(sum(countersum), classfmt)
+  return info
+
+DENSE_FILES = ["fpr.npy", "fnr.npy", "counter.npy", "thresholds.npy", "result.txt"]
+
+
+def compress_counter(counter):
+  """Return the columns of a counter with a non-zero class and their values, integer counts use the smallest unsigned dtype"""
+  index  = np.flatnonzero(np.any(counter != 0, axis=0))
+  values = counter[:,index]
+  if values.size > 0 and np.min(values) >= 0 and np.all(values == np.floor(values)):
+    values = values.astype(np.min_scalar_type(int(np.max(values))))
+  return index.astype(np.min_scalar_type(counter.shape[1])), values
+
+def expand_counter(index, values, ncols):
+  counter = np.zeros((values.shape[0], ncols))
+  counter[:,index] = values
+  return counter
+
+def save_result(savepath, fpr, fnr, counter, info, thresholds=None, compact=False):
+  """Save the DET curve, the counter and result.txt into savepath
+
+  thresholds holds the score of every counter column when they are not evenly spaced.
+  If compact, only result.npz is saved with the non-zero counter columns and the
+  result.txt fields, the DET curve is recomputed from the counter when needed.
+  """
+  os.makedirs(savepath, exist_ok=True)
+  for name in (DENSE_FILES if compact else ["result.npz", "thresholds.npy"]):
+    if os.path.exists(f"{savepath}/{name}"):
+      os.remove(f"{savepath}/{name}")
+  if compact:
+    index, values = compress_counter(counter)
+    arrays = {} if thresholds is None else {"thresholds": thresholds}
+    np.savez_compressed(f"{savepath}/result.npz", index=index, values=values, ncols=counter.shape[1],
+                        info=json.dumps({key: str(value) for key, value in info.items()}), **arrays)
+    return
+  np.save(f"{savepath}/fpr.npy", fpr)
+  np.save(f"{savepath}/fnr.npy", fnr)
+  np.save(f"{savepath}/counter.npy", counter)
+  if thresholds is not None:
+    np.save(f"{savepath}/thresholds.npy", thresholds)
+  with open(f"{savepath}/result.txt", "w") as f:
+    for key, value in info.items():
+      f.write(f"{key}={value}\n")
+
+def save_groups(savepath, groupnames, counters, minval=-2.0, maxval=2.0, exclude=False, classfmt=""):
+  """Save the counter of every group and groups.txt with one line of key=value fields per group"""
+  groups, _, excluded = grouped_counter_eers(counters, minval=minval, maxval=maxval, exclude=exclude)
+  os.makedirs(savepath, exist_ok=True)
+  np.savez(f"{savepath}/groups.npz", names=np.array(groupnames, dtype=str), counter=counters, minval=minval, maxval=maxval)
+  countersums = np.sum(counters, axis=2)
+  with open(f"{savepath}/groups.txt", "w") as f:
+    for i, name in enumerate(groupnames):
+      eer, threshold, margin = groups[i]
+      fields = {"group": name, "eer": eer, "threshold": threshold, "margin": margin}
+      if excluded is not None:
+        fields.update({"eer_excluded": excluded[i][0], "threshold_excluded": excluded[i][1]})
+      fields.update({"class_0": format(countersums[i,0], classfmt), "class_1": format(countersums[i,1], classfmt)})
+      f.write(" ".join(f"{key}={value}" for key, value in fields.items()) + "\n")
+
+def save_localization(savepath, counts, curves, fields):
+  """Save the localization counts and curves into localization.npz and the fields into localization.txt"""
+  os.makedirs(savepath, exist_ok=True)
+  np.savez(f"{savepath}/localization.npz", **{f"count_{key}": value for key, value in counts.items()}, **curves)
+  with open(f"{savepath}/localization.txt", "w") as f:
+    for key, value in fields.items():
+      f.write(f"{key}={value}\n")
+
+def load_groups_result(loadpath):
+  """Return the group names and the counter with shape (groups, 2, resolution+1) saved by save_groups"""
+  data = np.load(f"{loadpath}/groups.npz")
+  return list(data["names"]), data["counter"]
+
+def load_result_info(infile):
+  res = {}
+  with open(infile, "r") as f:
+      for line in f:
+          args = line.strip().split("=", 1)
+          res[args[0]] = args[1]
+  return res
+
+def load_info(loadpath):
+  """Return the result.txt fields of a dense or compact result directory"""
+  if os.path.exists(f"{loadpath}/result.npz"):
+    with np.load(f"{loadpath}/result.npz") as data:
+      return json.loads(str(data["info"]))
+  return load_result_info(f"{loadpath}/result.txt")
+
+def load_thresholds(loadpath):
+  """Return the thresholds of the counter columns of a result directory or None if evenly spaced"""
+  if os.path.exists(f"{loadpath}/result.npz"):
+    with np.load(f"{loadpath}/result.npz") as data:
+      return data["thresholds"] if "thresholds" in data else None
+  if os.path.exists(f"{loadpath}/thresholds.npy"):
+    return np.load(f"{loadpath}/thresholds.npy")
+  return None
+
+def load_sparse_counter(loadpath):
+  """Return the non-zero columns, their values and the number of columns of the counter of a result directory
+
+  Dense counters are memory-mapped so only their non-zero columns are copied.
+  """
+  if os.path.exists(f"{loadpath}/result.npz"):
+    with np.load(f"{loadpath}/result.npz") as data:
+      return data["index"].astype(np.int64), data["values"], int(data["ncols"])
+  counter = np.load(f"{loadpath}/counter.npy", mmap_mode="r")
+  index   = np.flatnonzero(np.any(counter != 0, axis=0))
+  return index, np.asarray(counter[:,index]), counter.shape[1]
+
+def load_counter(loadpath):
+  """Return the dense counter of a dense or compact result directory"""
+  if os.path.exists(f"{loadpath}/result.npz"):
+    return expand_counter(*load_sparse_counter(loadpath))
+  return np.load(f"{loadpath}/counter.npy")
+
+def load_det(loadpath):
+  """Return the fpr and fnr of a result directory, compact results recompute them from the counter"""
+  if os.path.exists(f"{loadpath}/fpr.npy") and os.path.exists(f"{loadpath}/fnr.npy"):
+    return np.load(f"{loadpath}/fpr.npy"), np.load(f"{loadpath}/fnr.npy")
+  counter, thresholds = load_counter(loadpath), load_thresholds(loadpath)
+  if thresholds is not None:
+    return _exact_counter_eer(counter, thresholds)[3:5]
+  with np.errstate(invalid='ignore', divide='ignore'):
+    return _calculate_det_curve(counter)
+
+def cache_result(rcache, key, result, seconds, groups=None, **fields):
+  """Store an evaluate() result, the group names and counter of a grouped evaluation and extra JSON fields in a ResultCache"""
+  eer, threshold, margin, fpr, fnr, counter, thresholds, minval, maxval, resolution = result
+  arrays = {"fpr": fpr, "fnr": fnr, "counter": counter}
+  if thresholds is not None:
+    arrays["thresholds"] = thresholds
+  if groups is not None:
+    fields["groupnames"], arrays["group_counter"] = list(groups[0]), groups[1]
+  meta = dict(fields, eer=float(eer), threshold=float(threshold), margin=float(margin),
+              minval=float(minval), maxval=float(maxval), resolution=int(resolution))
+  rcache.put(key, meta, seconds=seconds, **arrays)
+
+def cached_result(rcache, key):
+  """Return an evaluate() result and the extra fields from a ResultCache or None, groups holds the grouped evaluation"""
+  entry = rcache.get(key)
+  if entry is None:
+    return None
+  arrays, meta = entry
+  meta["groups"] = (meta["groupnames"], arrays["group_counter"]) if "group_counter" in arrays else None
+  return (meta["eer"], meta["threshold"], meta["margin"], arrays["fpr"], arrays["fnr"], arrays["counter"],
+          arrays.get("thresholds"), meta["minval"], meta["maxval"], meta["resolution"]), meta
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Columnar storage and bulk parsing of score files"""
+
+import math
+import numpy as np
+
+from .table import FlatTable, lengths_to_offsets
+from .pooling import pool_scores, parse_pooling
+
+
+class ScoreTable(FlatTable):
+  """Scores of many utterances stored as flat arrays
+
+  The scores of names[i] are scores[offsets[i]:offsets[i+1]] and the optional
+  frames array holds the frame index column of frame-level score files.
+  """
+  def __init__(self, names, offsets, scores, frames=None, unit=0.0, minscore=math.inf, maxscore=-math.inf):
+    super().__init__(names, offsets, scores)
+    self.frames   = frames
+    self.unit     = unit
+    self.minscore = minscore
+    self.maxscore = maxscore
+
+  @property
+  def scores(self):
+    return self.values
+
+
+def _line_widths(text):
+  """Return the number of whitespace separated tokens on every line of a text ending with a newline"""
+  data   = np.frombuffer(text.encode(), dtype=np.uint8)
+  space  = (data == 32) | ((data >= 9) & (data <= 13)) | ((data >= 28) & (data <= 31)) # the ASCII whitespace of str.split
+  starts = np.flatnonzero(~space & np.concatenate([[True], space[:-1]]))
+  return np.diff(np.searchsorted(starts, np.flatnonzero(data == 10)), prepend=0)
+
+def _parse_block(text, ncols, scoreindex, frameindex):
+  tokens = text.split()
+  # the strided path is only safe when every line has ncols tokens, otherwise the columns of later lines shift
+  columns = 0 <= scoreindex < ncols and (frameindex is None or 0 <= frameindex < ncols)
+  if columns and len(tokens) == ncols * text.count('\n') and np.all(_line_widths(text) == ncols):
+    names  = tokens[0::ncols]
+    scores = tokens[scoreindex::ncols]
+    frames = tokens[frameindex::ncols] if frameindex is not None else None
+  else: # ragged or empty lines, fall back to splitting each line
+    lines  = [line.split() for line in text.splitlines() if line.strip()]
+    names  = [args[0] for args in lines]
+    scores = [args[scoreindex] for args in lines]
+    frames = [args[frameindex] for args in lines] if frameindex is not None else None
+  names  = np.array(names)
+  scores = np.array(scores, dtype=np.float64)
+  frames = np.array(frames, dtype=np.int64) if frames is not None else None
+  return names, scores, frames
+
+def _group_runs(names):
+  """Run-length encode consecutive identical names"""
+  if names.shape[0] == 0:
+    return names, np.zeros(0, dtype=np.int64)
+  starts = np.flatnonzero(np.concatenate([[True], names[1:] != names[:-1]]))
+  return names[starts], np.diff(np.append(starts, names.shape[0]))
+
+def load_score_table(filepath, scoreindex=1, frameindex=None, unit=0.0, negative_class=False, dtype=np.float64, blocksize=1<<24):
+  """Parse a score file in large blocks into a ScoreTable
+
+  Parameters:
+  ----------
+  filepath: str
+    Path to a score file with one utterance or frame per line
+  scoreindex: int, optional
+    Index of the score column
+  frameindex: int, optional
+    Index of the frame index column for frame-level scores
+  unit: float, optional
+    Frame duration in seconds of frame-level scores
+  negative_class: bool, optional
+    Convert the scores of the negative class to the positive class
+  dtype: np.dtype, optional
+    Storage type of the scores, np.float32 halves the memory but may move
+    scores lying on a threshold bucket edge to the neighbouring bucket
+  """
+  runnames, runlens, scores, frames = [], [], [], []
+  minscore, maxscore = math.inf, -math.inf
+  ncols, rest = None, ""
+  with open(filepath, 'r') as f:
+    while True:
+      block = f.read(blocksize)
+      text  = rest + block
+      if block:
+        cut = text.rfind('\n') + 1
+        text, rest = text[:cut], text[cut:]
+      elif text and not text.endswith('\n'):
+        text = text + '\n'
+      if text.strip():
+        if ncols is None:
+          ncols = len(text.lstrip().split('\n', 1)[0].split())
+        names, sco, fra = _parse_block(text, ncols, scoreindex, frameindex)
+        sco = sco if not negative_class else 1 - sco
+        if sco.shape[0] > 0:
+          minscore, maxscore = min(minscore, float(sco.min())), max(maxscore, float(sco.max()))
+        names, lens = _group_runs(names)
+        runnames.append(names)
+        runlens.append(lens)
+        scores.append(sco.astype(dtype))
+        frames.append(fra)
+      if not block:
+        break
+
+  if len(runnames) == 0:
+    return ScoreTable(np.zeros(0, dtype=str), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=dtype),
+                      np.zeros(0, dtype=np.int64) if frameindex is not None else None, unit=unit)
+  scores = np.concatenate(scores)
+  frames = np.concatenate(frames) if frameindex is not None else None
+
+  # Merge runs split across blocks
+  names, lens = np.concatenate(runnames), np.concatenate(runlens)
+  starts = np.flatnonzero(np.concatenate([[True], names[1:] != names[:-1]]))
+  names, lens = names[starts], np.add.reduceat(lens, starts)
+
+  # Utterances appearing in several places are gathered in order of first appearance
+  unique, first, inverse = np.unique(names, return_index=True, return_inverse=True)
+  if unique.shape[0] < names.shape[0]:
+    rank  = np.empty(unique.shape[0], dtype=np.int64)
+    rank[np.argsort(first, kind='stable')] = np.arange(unique.shape[0])
+    order = np.argsort(np.repeat(rank[inverse], lens), kind='stable')
+    scores = scores[order]
+    frames = frames[order] if frames is not None else None
+    lens   = np.bincount(rank[inverse], weights=lens).astype(np.int64)
+    names  = unique[np.argsort(rank)]
+
+  return ScoreTable(names, lengths_to_offsets(lens), scores, frames, unit=unit, minscore=minscore, maxscore=maxscore)
+
+def load_scores(filepath, scoreindex=1, frameindex=None, unit=0.0, negative_class=False):
+  """Load a score file with load_score_table, returns the ScoreTable and its minimum and maximum score"""
+  scos = load_score_table(filepath, scoreindex=scoreindex, frameindex=frameindex, unit=unit, negative_class=negative_class)
+  return scos, scos.minscore, scos.maxscore
+
+def _trailing_run_start(data, end, nlines):
+  """Return the byte position in data of the first of the last nlines non-empty lines before end"""
+  pos = end
+  while nlines > 0:
+    start = data.rfind(b'\n', 0, pos-1) + 1
+    if data[start:pos].strip():
+      nlines = nlines - 1
+    pos = start
+  return pos
+
+def iter_score_tables(filepath, scoreindex=1, frameindex=None, unit=0.0, negative_class=False, dtype=np.float64, chunksize=1<<26, start=0):
+  """Parse a score file grouped by utterance in chunks of about chunksize bytes
+
+  Yields a ScoreTable with the complete utterances of every chunk and the byte
+  offset where the next chunk starts, which can be passed back as start to resume.
+  """
+  seen, ncols = set(), None
+  base, data  = start, b""
+  chunksize   = max(int(chunksize), 1)
+  with open(filepath, 'rb') as f:
+    f.seek(start)
+    while True:
+      block = f.read(chunksize)
+      data  = data + block
+      if not block and data and not data.endswith(b'\n'):
+        data = data + b'\n'
+      cut  = data.rfind(b'\n') + 1
+      text = data[:cut].decode()
+      if text.strip():
+        if ncols is None:
+          ncols = len(text.lstrip().split('\n', 1)[0].split())
+        names, sco, fra = _parse_block(text, ncols, scoreindex, frameindex)
+        names, lens = _group_runs(names)
+        if block: # the last utterance may continue in the next chunk
+          cut   = _trailing_run_start(data, cut, lens[-1])
+          count = int(np.sum(lens[:-1]))
+          names, lens, sco = names[:-1], lens[:-1], sco[:count]
+          fra   = fra[:count] if fra is not None else None
+        for name in names.tolist():
+          assert name not in seen, f"ERROR: {name} appears in several places but streaming requires the score file to be grouped by utterance"
+          seen.add(name)
+        if names.shape[0] > 0:
+          sco = sco if not negative_class else 1 - sco
+          yield ScoreTable(names, lengths_to_offsets(lens), sco.astype(dtype), fra, unit=unit,
+                           minscore=float(sco.min()), maxscore=float(sco.max())), base+cut
+      data, base = data[cut:], base+cut
+      if not block:
+        break
+
+def zoom_scores(scos, zoom, pooling="max"):
+  """Repeat each score zoom times if zoom>1, pool every -zoom scores if zoom<-1
+  or the whole utterance if zoom=0, see utils.pooling for the poolings"""
+  if zoom in [-1, 1]:
+    return scos
+  return next(sweep_scores(scos, [zoom], [pooling]))[2]
+
+def sweep_scores(scos, zooms, poolings=("max",)):
+  """Yield (zoom, pooling, ScoreTable) of every zoom and pooling sharing the windows of each zoom
+
+  Poolings only apply to zoom<-1 and zoom=0, other zooms are yielded once with pooling None.
+  """
+  for pooling in poolings:
+    parse_pooling(pooling)
+  for zoom in zooms:
+    pools  = zoom < -1 or zoom == 0
+    pooled = poolings if pools else poolings[:1]
+    scores, offsets = pool_scores(scos.scores, scos.offsets, zoom, pooled)
+    for pooling, values in zip(pooled, scores):
+      yield zoom, pooling if pools else None, ScoreTable(scos.names, offsets, values, minscore=scos.minscore, maxscore=scos.maxscore)
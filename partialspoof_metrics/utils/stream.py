@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Accumulate counters over score files in bounded-memory chunks"""
+
+import json
+import math
+import time
+import warnings
+import numpy as np
+
+from .cache import load_npz, save_npz
+from .counter import _grow_counter
+
+
+def load_checkpoint(checkpoint, params):
+  """Return the state saved in checkpoint or None, the parameters must be the same"""
+  state = load_npz(checkpoint, mmap=False) if checkpoint is not None else None
+  if state is None:
+    return None
+  saved = json.loads(str(state["params"]))
+  assert saved == params, f"ERROR: the checkpoint {checkpoint} was made with different parameters {saved}"
+  return {"counter": np.array(state["counter"]), "offset": int(state["offset"]), "done": bool(state["done"]),
+          "minscore": float(state["minscore"]), "maxscore": float(state["maxscore"]),
+          "minval": float(state["minval"]), "maxval": float(state["maxval"]),
+          "seen": set(state["seen"].tolist()) if "seen" in state else None}
+
+def save_checkpoint(checkpoint, params, counter, offset, done, minscore, maxscore, minval, maxval, seen=None):
+  """Save the streaming state, seen is the set of scored label utterances, None if a resumed checkpoint did not record it"""
+  arrays = {} if seen is None else {"seen": np.array(sorted(seen), dtype=str)}
+  save_npz(checkpoint, params=np.array(json.dumps(params)), counter=counter, offset=np.array(offset),
+           done=np.array(done), minscore=np.array(minscore), maxscore=np.array(maxscore),
+           minval=np.array(minval), maxval=np.array(maxval), **arrays)
+
+def warn_unscored(labs, seen, examples=3):
+  """Warn once about the label utterances that no chunk had scores for, as the alignment report of the in-memory path"""
+  if seen is None:
+    warnings.warn("WARNING: the checkpoint does not record the scored utterances, label utterances without scores can not be reported")
+    return
+  missing = [name for name in labs.keys() if name not in seen]
+  if len(missing) > 0:
+    warnings.warn(f"WARNING: {len(labs)-len(missing)} utterances evaluated, {len(missing)} utterances have no scores and are skipped, e.g. {', '.join(missing[:examples])}")
+
+def count_stream(count_fn, labs, chunks, resolution=8000, minval=-2.0, maxval=2.0, transform=None,
+                 checkpoint=None, interval=60.0, params=None, adaptive=False, **kwargs):
+  """Accumulate count_fn over chunks of complete utterances
+
+  Parameters:
+  ----------
+  count_fn: function
+    _count_samples of metrics.eer or metrics.mseer
+  chunks: function
+    chunks(start) returns an iterator of (ScoreTable, offset) starting at byte offset start
+  transform: function, optional
+    Applied to every ScoreTable before counting, e.g. zoom_scores
+  checkpoint: str, optional
+    Path to an npz file to save the counter to every interval seconds and to resume from
+  params: dict, optional
+    Parameters that the checkpoint must have been made with to be resumed
+  adaptive: bool, optional
+    Grow the range of the counter when a chunk has scores outside of it
+
+  Returns the counter, the score range and the final minval and maxval of the counter
+  """
+  params = dict(params or {}, resolution=resolution, minval=minval, maxval=maxval, adaptive=adaptive)
+  state  = load_checkpoint(checkpoint, params)
+  if state is None:
+    state = {"counter": np.zeros((2,resolution+1)), "offset": 0, "done": False, "minscore": math.inf, "maxscore": -math.inf,
+             "minval": minval, "maxval": maxval, "seen": set()}
+  counter, minscore, maxscore = state["counter"], state["minscore"], state["maxscore"]
+  minval, maxval, seen = state["minval"], state["maxval"], state["seen"]
+  if state["done"]:
+    warn_unscored(labs, seen)
+    return counter, minscore, maxscore, minval, maxval
+
+  saved = time.time()
+  for scos, offset in chunks(state["offset"]):
+    if adaptive:
+      counter, minval, maxval = _grow_counter(counter, minval, maxval, scos.minscore, scos.maxscore)
+    assert scos.minscore > minval and scos.maxscore < maxval, f"ERROR: score ({scos.minscore},{scos.maxscore}) is outside calculating boundary ({minval},{maxval})"
+    minscore, maxscore = min(minscore, scos.minscore), max(maxscore, scos.maxscore)
+    scos    = transform(scos) if transform is not None else scos
+    counter = count_fn(labs, scos, resolution=resolution, counter=counter, minval=minval, maxval=maxval, names=scos.keys(), **kwargs)
+    if seen is not None:
+      seen.update(name for name in scos.keys() if name in labs)
+    if checkpoint is not None and time.time() - saved >= interval:
+      save_checkpoint(checkpoint, params, counter, offset, False, minscore, maxscore, minval, maxval, seen)
+      saved = time.time()
+  if checkpoint is not None:
+    save_checkpoint(checkpoint, params, counter, 0, True, minscore, maxscore, minval, maxval, seen)
+  warn_unscored(labs, seen)
+  return counter, minscore, maxscore, minval, maxval
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# Copyright (c) 2025 Hieu-Thi Luong (contact@hieuthi.com)
+# MIT License
+
+"""Per-utterance arrays stored in compressed sparse row layout"""
+
+import numpy as np
+
+
+class FlatTable:
+  """Variable-length arrays of many utterances concatenated into one flat array
+
+  The items of names[i] are values[offsets[i]:offsets[i+1]].
+  The table can be indexed by utterance name like the dictionary it replaces.
+  """
+  def __init__(self, names, offsets, values):
+    self.names   = names
+    self.offsets = offsets
+    self.values  = values
+    self._index  = None
+
+  def __len__(self):
+    return self.names.shape[0]
+
+  def __contains__(self, name):
+    return name in self.index
+
+  def __getitem__(self, name):
+    i = self.index[name]
+    return self.values[self.offsets[i]:self.offsets[i+1]]
+
+  def __iter__(self):
+    return iter(self.keys())
+
+  def keys(self):
+    return self.names.tolist()
+
+  @property
+  def index(self):
+    if self._index is None:
+      self._index = {name: i for i, name in enumerate(self.names.tolist())}
+    return self._index
+
+  @property
+  def lengths(self):
+    return np.diff(self.offsets)
+
+  def select(self, names):
+    """Return the positions of the items of names in the flat arrays and their lengths"""
+    rows   = np.array([self.index[name] for name in names], dtype=np.int64)
+    starts = self.offsets[:-1][rows]
+    lens   = self.offsets[1:][rows] - starts
+    if np.array_equal(rows, np.arange(len(self))):
+      return np.arange(self.offsets[-1]), lens
+    pos = np.arange(np.sum(lens)) - np.repeat(np.cumsum(lens) - lens, lens)
+    return np.repeat(starts, lens) + pos, lens
+
+  def gather(self, names):
+    """Return the concatenated values of names and their lengths"""
+    idx, lens = self.select(names)
+    return self.values[idx], lens
+
+
+def lengths_to_offsets(lens):
+  return np.concatenate([[0], np.cumsum(lens)]).astype(np.int64)